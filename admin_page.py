@@ -1,13 +1,51 @@
 # admin_page.py
 import streamlit as st
 import pandas as pd
+from perf_metrics import latency_summary, reset as reset_latency
+from user_repository import ConcurrentEditError, SheetWriteError
 
-def render_admin_page(conn, load_user_data_func):
+def _editor_diff(df, editor_state):
+    """
+    data_editor 의 변경 기록(edited_rows/added_rows/deleted_rows)을 불러온 표 기준 사용자 단위 변경분으로 변환
+    (표 전체를 비교하지 않고 편집된 행만 확인)
+    """
+    usernames = df['username'].tolist()
+    deleted = [usernames[int(i)] for i in editor_state.get('deleted_rows', [])]
+    deleted_set = set(deleted)
+    updated = {}
+    for i, changes in editor_state.get('edited_rows', {}).items():
+        username = usernames[int(i)]
+        if username in deleted_set:
+            continue
+        # 값을 바꿨다가 되돌린 칸은 제외 (비운 칸은 None 으로 오므로 빈 문자열로 바꾼 뒤 비교)
+        changes = {col: ("" if value is None else value) for col, value in changes.items()}
+        changed = {col: value for col, value in changes.items() if value != df.at[int(i), col]}
+        if 'username' in changed:
+            raise ValueError(f"기존 사용자의 아이디는 수정할 수 없습니다: {username}")
+        if changed:
+            updated[username] = changed
+    added, added_names = [], set()
+    existing = set(usernames) - deleted_set
+    for row in editor_state.get('added_rows', []):
+        username = str(row.get('username') or "").strip()
+        if not username:
+            raise ValueError("추가한 행에 아이디(username)를 입력해주세요.")
+        if username in existing or username in added_names:
+            raise ValueError(f"이미 존재하는 아이디입니다: {username}")
+        added_names.add(username)
+        values = {col: ("" if value is None else value) for col, value in row.items()}
+        added.append(dict(values, role=values.get('role') or 'user', username=username))
+    return {'updated': updated, 'added': added, 'deleted': deleted}
+
+def render_admin_page(user_repo):
     st.title("🛠️ 시스템 관리자 패널")
     st.markdown("---")
 
-    # 최신 데이터 불러오기
-    df = load_user_data_func()
+    # 편집 기준이 되는 표와 버전은 저장/새로 불러오기 전까지 세션에 고정 (편집 중 행 위치가 바뀌지 않도록)
+    if 'admin_users_snapshot' not in st.session_state:
+        st.session_state['admin_users_snapshot'] = user_repo.snapshot()
+        st.session_state.pop("admin_editor", None)
+    df, base_version = st.session_state['admin_users_snapshot']
 
     # 1. 요약 통계 (Metric)
     col1, col2, col3 = st.columns(3)
@@ -20,14 +58,41 @@ def render_admin_page(conn, load_user_data_func):
         # 최근 24시간 내 가입자 등 추가 통계 가능
         st.metric("활성 세션(추정)", len(df[df['session_token'] != ""]))
 
+    # 2. 구간별 응답 시간 (이 서버 프로세스의 최근 측정값)
+    st.markdown("### ⏱️ 구간별 응답 시간")
+    latency_df = latency_summary()
+    if latency_df.empty:
+        st.info("아직 측정된 구간이 없습니다. 뉴스 대시보드를 사용하면 기록됩니다.")
+    else:
+        stages = sorted(latency_df['stage'].unique())
+        col_a, col_b = st.columns([3, 1])
+        with col_a:
+            selected_stages = st.multiselect("구간", stages, default=stages, key="latency_stages")
+        with col_b:
+            by_source = st.toggle("언론사별로 보기", value=True, key="latency_by_source")
+        if not by_source:
+            # 언론사 구분 없이 구간별 측정값을 모두 모아 백분위 계산
+            latency_df = latency_summary(by_source=False)
+        view = latency_df[latency_df['stage'].isin(selected_stages)]
+        st.dataframe(view.sort_values('p95_ms', ascending=False), use_container_width=True, hide_index=True)
+        if st.button("측정값 초기화", key="reset_latency"):
+            reset_latency()
+            st.rerun()
+
     st.markdown("### 📋 사용자 데이터베이스 관리")
-    st.info("💡 테이블 내의 값을 직접 수정하고 하단의 '변경사항 저장' 버튼을 누르면 구글 시트에 즉시 반영됩니다.")
+    st.info("💡 테이블 내의 값을 직접 수정하고 하단의 '변경사항 저장' 버튼을 누르면 바뀐 행만 구글 시트에 즉시 반영됩니다.")
+    if st.button("🔄 새로 불러오기", key="reload_admin_users"):
+        # 시트에서 직접 고친 내용까지 보이도록 캐시를 비우고 다시 읽음
+        user_repo.reload()
+        st.session_state.pop('admin_users_snapshot', None)
+        st.rerun()
 
     # 2. 데이터 에디터 (st.data_editor 활용)
     # 보안을 위해 비밀번호 해시는 수정 불가능하게 설정하거나 숨길 수 있습니다.
-    edited_df = st.data_editor(
+    st.data_editor(
         df,
         column_config={
+            "username": st.column_config.TextColumn("아이디", help="기존 사용자의 아이디는 수정할 수 없습니다."),
             "hashed_password": st.column_config.TextColumn("비밀번호 해시", disabled=True),
             "created_at": st.column_config.DatetimeColumn("가입 일시", disabled=True),
             "role": st.column_config.SelectboxColumn(
@@ -42,14 +107,24 @@ def render_admin_page(conn, load_user_data_func):
         key="admin_editor"
     )
 
-    # 3. 저장 버튼
+    # 3. 저장 버튼 (바뀐 칸/추가/삭제된 행만 기록하고 사용자 저장소 캐시만 갱신)
     if st.button("💾 변경사항 저장", key="save_admin_changes"):
         try:
-            with st.spinner("구글 시트 업데이트 중..."):
-                conn.update(worksheet="Users", data=edited_df)
-                st.cache_data.clear() # 캐시 초기화하여 즉시 반영
-                st.success("✅ 데이터가 성공적으로 저장되었습니다!")
+            diff = _editor_diff(df, st.session_state.get("admin_editor", {}))
+            if not any(diff.values()):
+                st.info("변경된 내용이 없습니다.")
+            else:
+                with st.spinner("구글 시트 업데이트 중..."):
+                    user_repo.apply_diff(diff, base_version)
+                st.session_state.pop('admin_users_snapshot', None)
+                st.toast(f"✅ 저장 완료 (수정 {len(diff['updated'])}명, 추가 {len(diff['added'])}명, 삭제 {len(diff['deleted'])}명)")
                 st.rerun()
+        except ConcurrentEditError as e:
+            st.error(f"❌ {e}. '새로 불러오기' 후 다시 수정해주세요.")
+        except SheetWriteError as e:
+            # 변경은 앱에 반영되었으므로 다음 실행에서 새로 불러온 표를 보여줌
+            st.session_state.pop('admin_users_snapshot', None)
+            st.error(f"❌ {e}. 앱에는 반영되었지만 구글 시트 저장에 실패했습니다. 일시적인 오류는 자동으로 다시 시도합니다.")
         except Exception as e:
             st.error(f"❌ 저장 중 오류 발생: {e}")
 
@@ -0,0 +1,221 @@
+# ai_analyzer.py
+# Gemini 기사 분석 (결과는 analysis_cache 로 모든 사용자가 공유)
+import os
+import re
+import time
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+from perf_metrics import timed, record, lazy_import
+from analysis_cache import make_cache_key, get_cached_analysis, put_cached_analysis
+
+GEMINI_MODEL = "gemini-3-flash-preview"
+ANALYSIS_PROMPT = "투자 전문가로서 뉴스 분석: {title}\n내용: {summary}. 핵심요약, 시장영향, 투자포인트 작성."
+
+# 여러 기사를 한 번에 보내는 배치 프롬프트 - 응답은 기사 번호가 붙은 JSON 배열로 받는다
+BATCH_PROMPT = (
+    "투자 전문가로서 아래 뉴스 {count}건을 각각 분석하세요. "
+    "기사마다 핵심요약, 시장영향, 투자포인트를 작성하고, "
+    '설명 없이 JSON 배열로만 답하세요: [{{"id": 기사번호, "analysis": "분석 내용"}}, ...]\n\n'
+    "{articles}"
+)
+BATCH_ARTICLE = "[{id}] 제목: {title}\n내용: {summary}"
+MAX_BATCH_SIZE = 10
+ANALYSIS_FAILED = "⚠️ 분석 실패"   # 실패 결과 문자열의 머리말 (캐시/세션에 저장하지 않음)
+
+
+def is_failed_analysis(text):
+    return not text or str(text).lstrip().startswith(ANALYSIS_FAILED)
+
+
+class StubModel:
+    """
+    오프라인/테스트용 가짜 모델. genai.Client().models 와 같은 generate_content 인터페이스를 흉내냅니다.
+    AI_STUB_MODEL=1 환경변수를 주면 앱 전체가 이 모델을 사용합니다.
+    """
+
+    def __init__(self, responder=None):
+        self.responder = responder or self._default_responder
+        self.calls = []
+
+    @staticmethod
+    def _default_responder(prompt):
+        ids = re.findall(r'^\[(\d+)\] 제목: (.*)$', prompt, flags=re.MULTILINE)
+        if ids:
+            return json.dumps([{"id": int(i), "analysis": f"[stub] {title} 분석"} for i, title in ids],
+                              ensure_ascii=False)
+        return f"[stub] {prompt.splitlines()[0][:50]} 분석"
+
+    def generate_content(self, model, contents):
+        self.calls.append(contents)
+        return SimpleNamespace(text=self.responder(contents))
+
+    def generate_content_stream(self, model, contents):
+        self.calls.append(contents)
+        for word in re.findall(r'\S+\s*', self.responder(contents)):
+            yield SimpleNamespace(text=word)
+
+
+# API 키별 클라이언트를 프로세스 안에서 재사용 (재실행마다 새로 만들지 않음)
+MAX_POOLED_CLIENTS = 256
+_client_pool = OrderedDict()
+_client_pool_lock = threading.Lock()
+
+def get_model_client(api_key):
+    """generate_content 를 가진 모델 객체 반환 (AI_STUB_MODEL 설정 시 스텁)"""
+    if os.environ.get("AI_STUB_MODEL"):
+        return StubModel()
+
+    api_key = api_key.strip()
+    # 풀의 키로 원문 API 키 대신 해시를 사용
+    pool_key = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+    with _client_pool_lock:
+        client = _client_pool.get(pool_key)
+        if client is not None:
+            _client_pool.move_to_end(pool_key)
+            return client.models
+
+        # google.genai 는 실제 모델을 처음 쓸 때 불러옴 (스텁/캐시 적중만 있는 경우 불러오지 않음)
+        client = lazy_import("google.genai").Client(api_key=api_key)
+        _client_pool[pool_key] = client
+        if len(_client_pool) > MAX_POOLED_CLIENTS:
+            _client_pool.popitem(last=False)
+        return client.models
+
+# --- Gemini 요약 함수 ---
+def analyze_news_gemini(api_key, title, summary, link=None, client=None):
+    cache_key = make_cache_key(link, title, summary, ANALYSIS_PROMPT, GEMINI_MODEL)
+    cached = get_cached_analysis(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        models = client or get_model_client(api_key)
+        prompt = ANALYSIS_PROMPT.format(title=title, summary=summary)
+        with timed("gemini_generate"):
+            response = models.generate_content(model=GEMINI_MODEL, contents=prompt)
+        result = response.text
+    except Exception as e:
+        return f"{ANALYSIS_FAILED}: {str(e)}"
+
+    # 실패 메시지는 저장하지 않고, 정상 결과만 공유 캐시에 보관
+    if result:
+        put_cached_analysis(cache_key, result, link=link, model=GEMINI_MODEL)
+    return result
+
+# --- 스트리밍 요약 함수 ---
+def analyze_news_gemini_stream(api_key, title, summary, link=None, client=None):
+    """
+    분석 결과를 생성되는 대로 조각(str) 단위로 yield 합니다.
+    캐시에 있으면 저장된 결과를 한 번에 돌려주고, 끝까지 받은 결과는 캐시에 저장합니다.
+    도중에 실패하면 예외를 그대로 올립니다 (받던 작업이 '완료'가 아닌 '실패'로 끝나도록, 일부 결과는 캐시하지 않음).
+    """
+    cache_key = make_cache_key(link, title, summary, ANALYSIS_PROMPT, GEMINI_MODEL)
+    cached = get_cached_analysis(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    models = client or get_model_client(api_key)
+    prompt = ANALYSIS_PROMPT.format(title=title, summary=summary)
+    started = time.perf_counter()
+    for chunk in models.generate_content_stream(model=GEMINI_MODEL, contents=prompt):
+        if chunk.text:
+            if not parts:
+                # 사용자가 체감하는 지연: 첫 글자가 나오기까지의 시간
+                record("gemini_first_token", time.perf_counter() - started)
+            parts.append(chunk.text)
+            yield chunk.text
+    record("gemini_stream", time.perf_counter() - started)
+
+    if parts:
+        put_cached_analysis(cache_key, "".join(parts), link=link, model=GEMINI_MODEL)
+
+# --- 배치 요약 함수 ---
+_FENCED_JSON_RE = re.compile(r'```(?:json)?\s*(.*?)```', flags=re.DOTALL)
+
+def _first_json_array(text):
+    """text 안에서 처음으로 완결된 객체 JSON 배열 (앞뒤 설명 속 '[1]' 같은 대괄호는 건너뜀)"""
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r'\[', text):
+        try:
+            value, _ = decoder.raw_decode(text, match.start())
+        except ValueError:
+            continue
+        if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+            return value
+    raise ValueError("응답에서 JSON 배열을 찾을 수 없습니다.")
+
+def _parse_batch_response(text):
+    """모델 응답(```json 블록 우선)에서 JSON 배열을 꺼내 {id: analysis} 로 변환"""
+    text = text or ""
+    fenced = _FENCED_JSON_RE.search(text)
+    items = _first_json_array(fenced.group(1) if fenced else text)
+    return {int(item['id']): str(item['analysis']) for item in items
+            if isinstance(item, dict) and 'id' in item and 'analysis' in item}
+
+def get_cached_single_analysis(title, summary, link=None):
+    """
+    단건 분석(ANALYSIS_PROMPT)으로 캐시된 결과 조회.
+    프롬프트가 다른 결과를 재사용하는 경로이므로, 호출하는 쪽에서 명시적으로 선택할 때만 사용합니다.
+    """
+    return get_cached_analysis(make_cache_key(link, title, summary, ANALYSIS_PROMPT, GEMINI_MODEL))
+
+def analyze_news_batch(api_key, articles, client=None, batch_size=MAX_BATCH_SIZE, reuse_single=False):
+    """
+    여러 기사를 batch_size 건씩 묶어 한 번의 요청으로 분석합니다.
+    articles: title, summary, link 를 가진 dict 리스트 (또는 DataFrame 행)
+    반환: 입력 순서와 같은 분석 결과 문자열 리스트 (실패한 기사는 ANALYSIS_FAILED 로 시작)
+    결과는 BATCH_PROMPT 기준 캐시 키로 저장합니다 (단건 분석 캐시와 섞이지 않음).
+    reuse_single=True 면 이미 단건 분석한 기사는 그 결과(get_cached_single_analysis)를 쓰고 요청에서 뺍니다.
+    """
+    articles = [dict(a) for a in articles]
+    results = [None] * len(articles)
+    keys = [make_cache_key(a.get('link'), a.get('title'), a.get('summary'), BATCH_PROMPT, GEMINI_MODEL)
+            for a in articles]
+
+    # 캐시에 있는 기사는 요청에서 제외
+    pending = []
+    for i, key in enumerate(keys):
+        results[i] = get_cached_analysis(key)
+        if results[i] is None and reuse_single:
+            a = articles[i]
+            results[i] = get_cached_single_analysis(a.get('title'), a.get('summary'), link=a.get('link'))
+        if results[i] is None:
+            pending.append(i)
+    if not pending:
+        return results
+
+    try:
+        models = client or get_model_client(api_key)
+    except Exception as e:
+        for i in pending:
+            results[i] = f"{ANALYSIS_FAILED}: {str(e)}"
+        return results
+
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        body = "\n\n".join(
+            BATCH_ARTICLE.format(id=n, title=articles[i].get('title'), summary=articles[i].get('summary'))
+            for n, i in enumerate(chunk, start=1)
+        )
+        try:
+            with timed("gemini_batch", source=f"{len(chunk)}건"):
+                response = models.generate_content(model=GEMINI_MODEL,
+                                                   contents=BATCH_PROMPT.format(count=len(chunk), articles=body))
+            parsed = _parse_batch_response(response.text)
+        except Exception as e:
+            for i in chunk:
+                results[i] = f"{ANALYSIS_FAILED}: {str(e)}"
+            continue
+
+        for n, i in enumerate(chunk, start=1):
+            if parsed.get(n):
+                results[i] = parsed[n]
+                put_cached_analysis(keys[i], parsed[n], link=articles[i].get('link'), model=GEMINI_MODEL)
+            else:
+                results[i] = f"{ANALYSIS_FAILED}: 응답에 이 기사의 결과가 없습니다."
+    return results
@@ -0,0 +1,178 @@
+# ai_jobs.py
+# AI 분석 작업 큐 (화면 스크립트가 모델 응답을 기다리며 멈추지 않도록)
+# - 화면은 작업을 넣고(submit) 작업 id 로 진행 상황/결과를 주기적으로 확인
+# - 워커 스레드가 큐에서 꺼내 분석하고, 스트리밍 응답은 받는 대로 작업에 이어 붙임
+# - API 키별 토큰 버킷으로 요청 속도를 제한 (한도를 넘으면 모델을 호출하지 않고 바로 거절)
+# - 같은 기사에 대해 진행 중인 작업이 있으면 새로 만들지 않고 그 작업을 함께 사용
+# - 큐가 가득 차면 기다리지 않고 바로 거절
+import time
+import uuid
+import queue
+import hashlib
+import threading
+from ai_analyzer import ANALYSIS_PROMPT, GEMINI_MODEL, analyze_news_gemini_stream
+from analysis_cache import make_cache_key, get_cached_analysis
+
+AI_JOB_WORKERS = 4            # 동시에 모델을 호출하는 워커 수
+AI_JOB_QUEUE_MAX = 32         # 대기 중인 작업 최대 수 (넘으면 바로 거절)
+AI_JOB_RESULT_TTL = 600       # 끝난 작업을 보관하는 시간(초)
+AI_RATE_PER_MINUTE = 10       # API 키별 분당 요청 수
+AI_RATE_BURST = 3             # API 키별로 한 번에 몰아서 보낼 수 있는 요청 수
+
+
+class JobRejected(Exception):
+    """작업을 받지 않음 (큐가 가득 찼거나 요청 한도 초과)"""
+
+class QueueFullError(JobRejected):
+    pass
+
+class RateLimitError(JobRejected):
+    def __init__(self, retry_after):
+        super().__init__(f"요청이 너무 많습니다. {retry_after:.0f}초 후 다시 시도하세요.")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """rate(초당 토큰)로 채워지고 최대 capacity 개까지 모이는 토큰 버킷"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def try_acquire(self):
+        """토큰 1개를 쓰면 0, 모자라면 다음 토큰까지 남은 시간(초)을 반환"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AnalysisJob:
+    def __init__(self, key, func, args):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.func = func
+        self.args = args
+        self.status = "queued"      # queued -> running -> done / error
+        self.parts = []
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+
+    @property
+    def text(self):
+        return "".join(self.parts)
+
+    @property
+    def finished(self):
+        return self.status in ("done", "error")
+
+
+class AIJobQueue:
+    def __init__(self, workers=AI_JOB_WORKERS, max_queue=AI_JOB_QUEUE_MAX,
+                 rate_per_minute=AI_RATE_PER_MINUTE, burst=AI_RATE_BURST):
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs = {}             # job id -> 작업
+        self._in_flight = {}        # 작업 키 -> 진행 중인 작업 (같은 기사 요청을 합침)
+        self._buckets = {}          # API 키 해시 -> 토큰 버킷
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._worker, name=f"ai-job-{i}", daemon=True)
+                         for i in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    # --- 작업 등록 ---
+    def submit(self, api_key, key, func, *args):
+        """
+        func(*args) 를 실행할 작업을 등록하고 반환합니다. func 가 생성기면 조각을 받는 대로 작업 결과에 이어 붙입니다.
+        key 가 같은 작업이 진행 중이면 그 작업을 그대로 반환하고, 한도 초과/큐 포화 시 JobRejected 를 발생시킵니다.
+        """
+        with self._lock:
+            self._prune()
+            job = self._in_flight.get(key)
+            if job is not None:
+                return job
+            if self._queue.full():
+                raise QueueFullError("분석 요청이 밀려 있습니다. 잠시 후 다시 시도하세요.")
+            bucket_key = hashlib.sha256((api_key or "").strip().encode('utf-8')).hexdigest()
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                bucket = self._buckets[bucket_key] = TokenBucket(self.rate, self.burst)
+            retry_after = bucket.try_acquire()
+            if retry_after:
+                raise RateLimitError(retry_after)
+
+            job = AnalysisJob(key, func, args)
+            self._queue.put_nowait(job)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+            return job
+
+    def submit_analysis(self, api_key, title, summary, link=None):
+        """기사 1건 분석 작업. 이미 분석된 기사는 한도를 쓰지 않고 끝난 작업으로 바로 반환"""
+        key = make_cache_key(link, title, summary, ANALYSIS_PROMPT, GEMINI_MODEL)
+        cached = get_cached_analysis(key)
+        if cached is not None:
+            job = AnalysisJob(key, None, ())
+            job.parts, job.status, job.finished_at = [cached], "done", time.time()
+            with self._lock:
+                self._jobs[job.id] = job
+            return job
+        return self.submit(api_key, key, analyze_news_gemini_stream, api_key, title, summary, link)
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        """보관 시간이 지난 끝난 작업 정리 (lock 안에서 호출)"""
+        expired_at = time.time() - AI_JOB_RESULT_TTL
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < expired_at]:
+            del self._jobs[job_id]
+
+    # --- 워커 ---
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            job.status = "running"
+            try:
+                result = job.func(*job.args)
+                if isinstance(result, str):
+                    job.parts.append(result)
+                else:
+                    for part in result:
+                        job.parts.append(part)
+                job.status = "done"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "error"
+            finally:
+                job.finished_at = time.time()
+                with self._lock:
+                    if self._in_flight.get(job.key) is job:
+                        del self._in_flight[job.key]
+                self._queue.task_done()
+
+    def stats(self):
+        with self._lock:
+            return {'queued': self._queue.qsize(), 'in_flight': len(self._in_flight), 'jobs': len(self._jobs)}
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue():
+    """프로세스당 하나의 분석 작업 큐를 만들어 반환"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = AIJobQueue()
+        return _job_queue
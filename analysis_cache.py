@@ -0,0 +1,83 @@
+# analysis_cache.py
+# AI 분석 결과를 세션/사용자와 무관하게 디스크에 공유 저장하는 캐시
+# - 키: 기사 링크 + 본문 해시 + 프롬프트 + 모델 (어느 하나라도 바뀌면 새로 분석)
+# - TTL 이 지난 항목은 무시, 전체 용량을 넘으면 가장 오래 안 쓰인 항목부터 삭제(LRU)
+import time
+import hashlib
+from database_manager import get_connection
+import database_manager
+
+ANALYSIS_CACHE_TTL = 60 * 60 * 24 * 3        # 3일
+ANALYSIS_CACHE_MAX_BYTES = 50 * 1024 * 1024  # 50MB
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_cache (
+    cache_key   TEXT PRIMARY KEY,
+    link        TEXT,
+    model       TEXT,
+    result      TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    created_at  REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_access ON analysis_cache(last_access);
+"""
+
+_schema_ready = set()
+
+def _conn():
+    conn = get_connection()
+    if database_manager.DB_PATH not in _schema_ready:
+        conn.executescript(_SCHEMA)
+        _schema_ready.add(database_manager.DB_PATH)
+    return conn
+
+def make_cache_key(link, title, summary, prompt, model):
+    """기사(링크+본문 해시)와 프롬프트/모델 버전을 합친 캐시 키"""
+    content_hash = hashlib.sha256(f"{title}\n{summary}".encode('utf-8')).hexdigest()
+    prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    raw = "|".join([link or "", content_hash, prompt_hash, model])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def get_cached_analysis(cache_key, ttl=ANALYSIS_CACHE_TTL):
+    conn = _conn()
+    row = conn.execute("SELECT result, created_at FROM analysis_cache WHERE cache_key = ?", (cache_key,)).fetchone()
+    if row is None:
+        return None
+    now = time.time()
+    if now - row['created_at'] > ttl:
+        with conn:
+            conn.execute("DELETE FROM analysis_cache WHERE cache_key = ?", (cache_key,))
+        return None
+    with conn:
+        conn.execute("UPDATE analysis_cache SET last_access = ? WHERE cache_key = ?", (now, cache_key))
+    return row['result']
+
+def put_cached_analysis(cache_key, result, link=None, model=None, max_bytes=ANALYSIS_CACHE_MAX_BYTES):
+    conn = _conn()
+    now = time.time()
+    size = len(result.encode('utf-8'))
+    with conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO analysis_cache (cache_key, link, model, result, size, created_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (cache_key, link, model, result, size, now, now))
+        _evict(conn, max_bytes)
+
+def _evict(conn, max_bytes):
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM analysis_cache").fetchone()[0]
+    if total <= max_bytes:
+        return
+    # 오래 안 쓰인 순으로 용량 한도 아래가 될 때까지 삭제
+    to_free, keys = total - max_bytes, []
+    for row in conn.execute("SELECT cache_key, size FROM analysis_cache ORDER BY last_access"):
+        keys.append((row['cache_key'],))
+        to_free -= row['size']
+        if to_free <= 0:
+            break
+    conn.executemany("DELETE FROM analysis_cache WHERE cache_key = ?", keys)
+
+def purge_expired(ttl=ANALYSIS_CACHE_TTL):
+    conn = _conn()
+    with conn:
+        return conn.execute("DELETE FROM analysis_cache WHERE created_at < ?", (time.time() - ttl,)).rowcount
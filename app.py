@@ -1,18 +1,31 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta
+import os
 import time
 import secrets  # 보안 토큰 생성용
-from streamlit_gsheets import GSheetsConnection
-import bcrypt
+
+# .env 는 다른 모듈을 불러오기 전에 읽음 (NEWS_DB_PATH, FEED_CACHE_DIR, NAVER_API_URL, FAST_FEED_PARSER 등은
+# 모듈을 불러오는 시점에 환경변수를 읽으므로)
 from dotenv import load_dotenv
-from admin_page import render_admin_page
-from qna_page import render_qna_page
-from mypage import render_mypage
-from notice_page import render_notice_manager
+load_dotenv()
+
+from perf_metrics import import_timer, lazy_import, boot_report
+
+# bcrypt/streamlit_gsheets/google.genai 는 처음 쓰는 시점에 불러옴 (비로그인 방문자는 불러오지 않음)
+DEFERRED_IMPORTS = ["bcrypt", "streamlit_gsheets", "google.genai"]
+
+with import_timer("app_pages"):
+    from admin_page import render_admin_page
+    from qna_page import render_qna_page
+    from mypage import render_mypage
+    from notice_page import render_notice_manager
+    from sheets_backend import get_sheets_backend
+    from user_repository import UserRepository
+    from board_repository import BoardRepository, QNA_COLUMNS, NOTICE_COLUMNS
 
 # [중요] 방금 만든 파일에서 함수 불러오기
-from news_dashboard import render_news_section
+with import_timer("news_dashboard"):
+    from news_dashboard import render_news_section, start_background_collector, prewarm_feed_cache
 
 def local_css(file_name):
     with open(file_name, encoding="utf-8") as f:
@@ -22,20 +35,35 @@ def local_css(file_name):
 st.set_page_config(page_title="증시 핵심 요약", layout="wide")
 local_css("style_global.css")
 
-load_dotenv()
+# --- 서버 시작 시 한 번 --- #
+# 수집기를 시작하고, 이미 수집된 언론사 캐시를 뒤에서 미리 채움 (첫 방문자가 읽기를 기다리지 않도록)
+@st.cache_resource(show_spinner=False)
+def boot():
+    start_background_collector()
+    prewarm_feed_cache()
+
+boot()
 
 # --- 데이터 연결 --- #
-conn = st.connection("gsheets", type=GSheetsConnection)
+# 시트 연결은 사용자/게시판 저장소를 처음 쓸 때 만듦 (SHEETS_BACKEND=local 이면 만들지 않음)
+def get_gsheets_connection():
+    if os.environ.get("SHEETS_BACKEND") == "local":
+        return None
+    return st.connection("gsheets", type=lazy_import("streamlit_gsheets").GSheetsConnection)
+
+# 사용자 표는 프로세스 전체에서 하나의 저장소(캐시 + 행 단위 write-behind)로 공유
+@st.cache_resource
+def get_user_repository():
+    return UserRepository(get_sheets_backend(get_gsheets_connection()))
+
+# 게시판(QnA/Notice)도 프로세스 전체에서 공유 (짧은 TTL 읽기 캐시 + 행 단위 쓰기)
+@st.cache_resource
+def get_board_repository(worksheet):
+    columns = QNA_COLUMNS if worksheet == "QnA" else NOTICE_COLUMNS
+    return BoardRepository(get_sheets_backend(get_gsheets_connection()), worksheet, columns)
 
-@st.cache_data(ttl=2)
 def load_user_data():
-    try:
-        return conn.read(worksheet="Users", ttl=0)
-        if 'role' not in df.columns:
-            df['role'] = 'user'
-        return df
-    except:
-        return pd.DataFrame(columns=['username', 'hashed_password', 'openai_api_key', 'gemini_api_key', 'session_token', 'created_at'])
+    return get_user_repository().all()
 
 # --- 세션 초기화 --- #
 if 'logged_in' not in st.session_state:
@@ -54,12 +82,10 @@ query_params = st.query_params
 url_token = query_params.get("token")
 
 if url_token and not st.session_state.logged_in:
-    df = load_user_data()
-    # 시트에서 해당 토큰을 가진 유저 검색
-    user_match = df[df['session_token'] == url_token]
+    # 메모리의 토큰 인덱스로 바로 조회 (시트 전체를 읽고 훑지 않음)
+    user = get_user_repository().find_by_token(url_token)
 
-    if not user_match.empty:
-        user = user_match.iloc[0]
+    if user is not None:
         st.session_state.update({
             'logged_in': True,
             'username': user['username'],
@@ -78,17 +104,17 @@ with st.sidebar:
                 uid = st.text_input("아이디")
                 upw = st.text_input("비밀번호", type="password")
                 if st.form_submit_button("로그인"):
-                    df = load_user_data()
-                    if uid in df['username'].values:
-                        user = df[df['username'] == uid].iloc[0]
+                    users = get_user_repository()
+                    user = users.get(uid)
+                    if user is not None:
+                        bcrypt = lazy_import("bcrypt")
                         if bcrypt.checkpw(upw.encode('utf-8'), str(user['hashed_password']).encode('utf-8')):
                             # 1. 고유 세션 토큰 생성 (보안 강화)
                             new_token = secrets.token_urlsafe(32)
 
-                            # 2. [DB 업데이트] 토큰과 마지막 로그인 시간 저장
-                            df.loc[df['username'] == uid, 'session_token'] = new_token
-                            df.loc[df['username'] == uid, 'last_login'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            conn.update(worksheet="Users", data=df)
+                            # 2. [DB 업데이트] 토큰과 마지막 로그인 시간 저장 (해당 행만)
+                            users.update(uid, session_token=new_token,
+                                         last_login=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
                             # 3. 세션 업데이트
                             st.session_state.update({
@@ -111,11 +137,12 @@ with st.sidebar:
                 nge = st.text_input("Gemini API Key")
                 noa = st.text_input("GPT API Key (선택)")
                 if st.form_submit_button("가입하기"):
-                    df = load_user_data()
-                    if nid in df['username'].values: st.error("중복 아이디 입니다.")
+                    users = get_user_repository()
+                    if users.exists(nid): st.error("중복 아이디 입니다.")
                     else:
+                        bcrypt = lazy_import("bcrypt")
                         hashed = bcrypt.hashpw(npw.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-                        new_row = pd.DataFrame([{
+                        users.create({
                             "username": nid,
                             "hashed_password": hashed,
                             "gemini_api_key": nge,
@@ -123,8 +150,7 @@ with st.sidebar:
                             "session_token": "", # 초기 토큰은 비어있음
                             "created_at": datetime.now().isoformat(),
                             "role": "user"
-                        }])
-                        conn.update(worksheet="Users", data=pd.concat([df, new_row], ignore_index=True))
+                        })
                         st.success("가입 완료!")
     else:
         st.success(f"반가워요, {st.session_state.username}님!")
@@ -138,9 +164,7 @@ with st.sidebar:
 
         if st.button("로그아웃"):
             # 로그아웃 시 시트의 토큰 무효화 (보안)
-            df = load_user_data()
-            df.loc[df['username'] == st.session_state.username, 'session_token'] = ""
-            conn.update(worksheet="Users", data=df)
+            get_user_repository().update(st.session_state.username, session_token="")
 
             # 세션 및 URL 파라미터 초기화
             st.session_state.update({'logged_in': False, 'username': None, 'user_keys': {'GEMINI': None, 'OPENAI': None}})
@@ -152,13 +176,18 @@ if st.session_state.logged_in:
     if selected_page == "뉴스 대시보드":
         render_news_section()
     elif selected_page == "1:1 질문":
-        render_qna_page(conn) # QnA 페이지 호출
+        render_qna_page(get_board_repository("QnA"), get_board_repository("Notice")) # QnA 페이지 호출
     elif selected_page == "마이페이지":
-        render_mypage(conn)
+        render_mypage(get_user_repository())
     elif selected_page == "📢 공지사항 관리": # 새로 만든 페이지 연결
-        render_notice_manager(conn)
+        render_notice_manager(get_board_repository("Notice"))
     elif selected_page == "🛠️ 어드민 설정":
-        render_admin_page(conn, load_user_data)
+        render_admin_page(get_user_repository())
 else:
     # 비로그인 시 기본 화면
-    render_news_section()
\ No newline at end of file
+    render_news_section()
+
+# 첫 화면을 그린 뒤 프로세스당 한 번 import 시간 보고
+report = boot_report(DEFERRED_IMPORTS)
+if report:
+    print(report)
@@ -0,0 +1,2 @@
+# benchmarks
+# 수집/렌더링 파이프라인 오프라인 벤치마크 (저장소 루트에서 python -m benchmarks.run_benchmarks)
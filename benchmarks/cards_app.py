@@ -0,0 +1,27 @@
+# benchmarks/cards_app.py
+# display_news_cards 렌더링 벤치마크용 스크립트 (AppTest 로 실행)
+# BENCH_CARDS_SIZE 건의 기사를 BENCH_PAGE_SIZE 단위로 표시
+import os
+import streamlit as st
+from perf_metrics import timed
+from rss_collector import SOURCES, _parse_feed_articles, _build_articles_df
+from benchmarks.fixtures import build_feed
+from news_dashboard import display_news_cards, NEWS_PAGE_SIZE
+
+
+@st.cache_resource
+def bench_articles(size):
+    # 대시보드가 받는 것과 같은 모양의 DataFrame (피드 파싱 -> DataFrame 변환 경로를 그대로 사용)
+    name = next(iter(SOURCES["KOREA"]))
+    articles = [dict(a, source=name) for a in _parse_feed_articles(build_feed("KOREA", name, size))]
+    return _build_articles_df(articles)
+
+
+st.session_state.setdefault('logged_in', False)
+st.session_state.setdefault('user_keys', {'GEMINI': None, 'OPENAI': None})
+
+size = int(os.environ.get("BENCH_CARDS_SIZE", "10"))
+page_size = int(os.environ.get("BENCH_PAGE_SIZE", str(NEWS_PAGE_SIZE)))
+df = bench_articles(size)
+with timed("display_news_cards", source=f"{size}/{page_size}"):
+    display_news_cards(df, "BENCH", page_size=page_size)
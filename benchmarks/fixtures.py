@@ -0,0 +1,286 @@
+# benchmarks/fixtures.py
+# 벤치마크용 피드/네이버 응답 픽스처
+# - benchmarks/fixtures/ 에 녹화본이 있으면 그 기사들을 원하는 개수만큼 복제해서 사용
+# - 녹화본이 없으면 언론사별 형식(날짜 포맷, 요약 길이, HTML 포함 여부)을 흉내 낸 합성 피드를 생성
+# - 저장소에는 합성 피드를 고정 시드로 한 번 만들어 둔 픽스처 세트가 들어 있어 어느 환경에서나 같은 입력으로 측정
+#   (결과 파일에 fixture_digest() 를 남겨 두고 --compare 에서 입력이 달라졌는지 확인)
+# 녹화: python -m benchmarks.fixtures --record   (실제 피드/네이버 API 를 한 번 받아 저장)
+# 고정: python -m benchmarks.fixtures --freeze   (합성 피드로 픽스처 세트를 다시 만듦)
+import os
+import sys
+import json
+import random
+import hashlib
+import argparse
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+NAVER_FIXTURE = "naver_news.json"
+FROZEN_ITEMS = 30          # --freeze 로 만드는 언론사별 기사 수 (벤치마크는 이 기사들을 복제해 규모를 맞춤)
+FROZEN_NAVER_ITEMS = 100
+
+# 언론사별 피드 모양 (실제 피드에서 관찰되는 날짜 형식/요약 길이 기준)
+FEED_STYLES = {
+    "한국경제": {'date': 'rfc822_kst', 'summary_len': 180, 'html': False, 'lang': 'ko'},
+    "매일경제": {'date': 'rfc822_kst', 'summary_len': 120, 'html': False, 'lang': 'ko'},
+    "연합뉴스": {'date': 'rfc822_kst', 'summary_len': 160, 'html': False, 'lang': 'ko'},
+    "이데일리": {'date': 'rfc822_kst', 'summary_len': 220, 'html': True, 'lang': 'ko'},
+    "뉴스핌": {'date': 'iso_space_kst', 'summary_len': 200, 'html': True, 'lang': 'ko'},
+    "인포맥스": {'date': 'iso_space_kst', 'summary_len': 150, 'html': False, 'lang': 'ko'},
+    "CNBC(속보)": {'date': 'rfc822_gmt', 'summary_len': 240, 'html': False, 'lang': 'en'},
+    "Yahoo(시장)": {'date': 'iso_z', 'summary_len': 0, 'html': False, 'lang': 'en'},
+    "Investing": {'date': 'iso_space_utc', 'summary_len': 0, 'html': False, 'lang': 'en'},
+    "한경국제": {'date': 'rfc822_kst', 'summary_len': 180, 'html': False, 'lang': 'ko'},
+    "매경글로벌": {'date': 'rfc822_kst', 'summary_len': 120, 'html': False, 'lang': 'ko'},
+}
+DEFAULT_STYLE = {'date': 'rfc822_kst', 'summary_len': 150, 'html': False, 'lang': 'ko'}
+
+KST = timezone(timedelta(hours=9))
+BASE_TIME = datetime(2026, 10, 16, 15, 30, tzinfo=KST)   # 결과가 실행 시각에 따라 달라지지 않도록 고정
+
+_KO_WORDS = ["코스피", "코스닥", "외국인", "기관", "순매수", "반도체", "2차전지", "금리", "환율", "실적",
+             "발표", "상승", "하락", "마감", "전망", "공시", "배당", "증권가", "목표주가", "상향"]
+_EN_WORDS = ["stocks", "Fed", "rates", "Nasdaq", "S&P", "earnings", "guidance", "rally", "slide", "Treasury",
+             "yields", "oil", "tech", "chipmakers", "inflation", "jobs", "report", "futures", "dollar", "close"]
+
+
+def _slug(market, source_name):
+    from rss_collector import SOURCES
+    return f"{market.lower()}_{list(SOURCES[market]).index(source_name)}"
+
+
+def _slug_safe(source_name):
+    return source_name.encode('utf-8').hex()[:16]
+
+
+def _format_date(dt, kind):
+    if kind == 'rfc822_kst':
+        return format_datetime(dt.astimezone(KST))
+    if kind == 'rfc822_gmt':
+        return dt.astimezone(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S GMT')
+    if kind == 'iso_z':
+        return dt.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    if kind == 'iso_space_utc':
+        return dt.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    return dt.astimezone(KST).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _sentence(rng, words, length):
+    out, size = [], 0
+    while size < length:
+        word = rng.choice(words)
+        out.append(word)
+        size += len(word) + 1
+    return " ".join(out)
+
+
+def _synthetic_items(source_name, n, seed):
+    style = FEED_STYLES.get(source_name, DEFAULT_STYLE)
+    rng = random.Random(f"{source_name}:{seed}")
+    words = _KO_WORDS if style['lang'] == 'ko' else _EN_WORDS
+    items = []
+    for i in range(n):
+        published = BASE_TIME - timedelta(minutes=3 * i + rng.randint(0, 2))
+        summary = _sentence(rng, words, style['summary_len']) if style['summary_len'] else ""
+        if style['html'] and summary:
+            summary = f'<p><img src="https://img.example.com/{i}.jpg" /> {summary}</p>'
+        items.append({
+            'title': f"[{source_name}] {_sentence(rng, words, 40)} #{i}",
+            'link': f"https://news.example.com/{_slug_safe(source_name)}/{seed}/{i}",
+            'published': _format_date(published, style['date']),
+            'summary': summary,
+        })
+    return items
+
+
+def _rss_document(title, items):
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<rss version="2.0"><channel>',
+             f'<title>{escape(title)}</title><link>https://news.example.com/</link>']
+    for item in items:
+        parts.append(
+            '<item>'
+            f'<title>{escape(item["title"])}</title>'
+            f'<link>{escape(item["link"])}</link>'
+            f'<guid isPermaLink="true">{escape(item["link"])}</guid>'
+            f'<pubDate>{escape(item["published"])}</pubDate>'
+            f'<description><![CDATA[{item["summary"]}]]></description>'
+            '</item>'
+        )
+    parts.append('</channel></rss>')
+    return "".join(parts).encode('utf-8')
+
+
+def _atom_document(title, items):
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<feed xmlns="http://www.w3.org/2005/Atom">',
+             f'<title>{escape(title)}</title>']
+    for item in items:
+        parts.append(
+            '<entry>'
+            f'<title>{escape(item["title"])}</title>'
+            f'<link href="{escape(item["link"])}" />'
+            f'<id>{escape(item["link"])}</id>'
+            f'<published>{escape(item["published"])}</published>'
+            f'<summary type="html">{escape(item["summary"])}</summary>'
+            '</entry>'
+        )
+    parts.append('</feed>')
+    return "".join(parts).encode('utf-8')
+
+
+def _recorded_feed(market, source_name, n):
+    """녹화본의 item 을 n 개가 될 때까지 복제 (링크/guid 는 중복되지 않게 번호를 붙임)"""
+    path = os.path.join(FIXTURES_DIR, f"{_slug(market, source_name)}.xml")
+    if not os.path.exists(path):
+        return None
+    try:
+        root = ET.parse(path).getroot()
+    except ET.ParseError:
+        return None
+    channel = root.find('channel')
+    if channel is None:
+        return None
+    items = channel.findall('item')
+    if not items:
+        return None
+    for item in items:
+        channel.remove(item)
+    for i in range(n):
+        clone = ET.fromstring(ET.tostring(items[i % len(items)]))
+        for tag in ('link', 'guid'):
+            el = clone.find(tag)
+            if el is not None and el.text:
+                el.text = f"{el.text.strip()}#bench{i}"
+        channel.append(clone)
+    return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+
+def build_feed(market, source_name, n, seed=0, fmt="rss"):
+    """언론사 1곳의 피드 본문(bytes). 녹화본이 있으면 녹화본 기준, 없으면 합성"""
+    if fmt == "rss":
+        recorded = _recorded_feed(market, source_name, n)
+        if recorded is not None:
+            return recorded
+    items = _synthetic_items(source_name, n, seed)
+    return (_atom_document if fmt == "atom" else _rss_document)(source_name, items)
+
+
+def build_naver_response(n, query="증시", seed=0):
+    """네이버 뉴스 검색 API 응답(bytes). 녹화본이 있으면 그 items 를 복제"""
+    path = os.path.join(FIXTURES_DIR, NAVER_FIXTURE)
+    recorded = []
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            recorded = json.load(f).get('items', [])
+    rng = random.Random(f"naver:{seed}")
+    items = []
+    for i in range(n):
+        if recorded:
+            item = dict(recorded[i % len(recorded)])
+            item['link'] = f"{item['link']}#bench{i}"
+        else:
+            published = BASE_TIME - timedelta(minutes=2 * i)
+            item = {
+                'title': f"<b>{query}</b> {_sentence(rng, _KO_WORDS, 40)} #{i}",
+                'originallink': f"https://press.example.com/naver/{seed}/{i}",
+                'link': f"https://n.news.naver.com/mnews/article/{seed}/{i:010d}",
+                'description': f"{_sentence(rng, _KO_WORDS, 60)} <b>{query}</b> {_sentence(rng, _KO_WORDS, 60)}",
+                'pubDate': format_datetime(published),
+            }
+        items.append(item)
+    return json.dumps({
+        'lastBuildDate': format_datetime(BASE_TIME),
+        'total': max(n, 1000),
+        'start': 1,
+        'display': n,
+        'items': items,
+    }, ensure_ascii=False).encode('utf-8')
+
+
+def freeze_fixtures(n=FROZEN_ITEMS, naver_n=FROZEN_NAVER_ITEMS):
+    """합성 피드/네이버 응답을 고정 시드로 만들어 fixtures/ 에 저장 (네트워크 없이 재현 가능한 픽스처 세트)"""
+    from rss_collector import SOURCES
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for market, sources in SOURCES.items():
+        for name in sources:
+            with open(os.path.join(FIXTURES_DIR, f"{_slug(market, name)}.xml"), "wb") as f:
+                f.write(_rss_document(name, _synthetic_items(name, n, seed=0)))
+    # 녹화본을 지운 상태에서 만들어야 합성 응답이 저장됨
+    naver_path = os.path.join(FIXTURES_DIR, NAVER_FIXTURE)
+    if os.path.exists(naver_path):
+        os.remove(naver_path)
+    body = build_naver_response(naver_n)
+    with open(naver_path, "wb") as f:
+        f.write(body)
+    print(f"✅ {FIXTURES_DIR}: {fixture_digest()}")
+
+
+def fixture_digest():
+    """fixtures/ 의 파일 이름과 내용으로 만든 요약값 (없으면 'synthetic')"""
+    if not os.path.isdir(FIXTURES_DIR):
+        return "synthetic"
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        path = os.path.join(FIXTURES_DIR, name)
+        if os.path.isfile(path):
+            digest.update(name.encode('utf-8'))
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:12]
+
+
+def record_fixtures(query="증시", timeout=10):
+    """SOURCES 의 실제 피드와 네이버 응답을 한 번 받아 fixtures/ 에 저장"""
+    import requests
+    from rss_collector import SOURCES, NAVER_API_URL, _naver_credentials
+
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for market, sources in SOURCES.items():
+        for name, url in sources.items():
+            try:
+                res = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0 (ai_news_summary)"})
+                res.raise_for_status()
+                with open(os.path.join(FIXTURES_DIR, f"{_slug(market, name)}.xml"), "wb") as f:
+                    f.write(res.content)
+                print(f"✅ {market}/{name}: {len(res.content):,} bytes")
+            except Exception as e:
+                print(f"⚠️ {market}/{name} 녹화 실패: {e}")
+
+    naver_id, naver_secret = _naver_credentials()
+    if not naver_id or not naver_secret:
+        print("⚠️ 네이버 API 키가 없어 네이버 응답은 녹화하지 않았습니다.")
+        return
+    try:
+        res = requests.get(NAVER_API_URL, timeout=timeout,
+                           headers={"X-Naver-Client-Id": naver_id, "X-Naver-Client-Secret": naver_secret},
+                           params={"query": query, "display": 100, "sort": "date"})
+        res.raise_for_status()
+        with open(os.path.join(FIXTURES_DIR, NAVER_FIXTURE), "wb") as f:
+            f.write(res.content)
+        print(f"✅ Naver: {len(res.json().get('items', []))}건")
+    except Exception as e:
+        print(f"⚠️ 네이버 응답 녹화 실패: {e}")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser = argparse.ArgumentParser(description="벤치마크 픽스처 녹화/미리보기")
+    parser.add_argument("--record", action="store_true", help="실제 피드와 네이버 응답을 fixtures/ 에 저장")
+    parser.add_argument("--freeze", action="store_true", help="합성 피드로 fixtures/ 픽스처 세트를 다시 만듦")
+    parser.add_argument("--preview", metavar="SOURCE", help="해당 언론사 피드를 5건 생성해 출력")
+    args = parser.parse_args()
+    if args.record:
+        record_fixtures()
+    elif args.freeze:
+        freeze_fixtures()
+    elif args.preview:
+        from rss_collector import SOURCES
+        market = next(m for m, s in SOURCES.items() if args.preview in s)
+        print(build_feed(market, args.preview, 5).decode('utf-8'))
+    else:
+        parser.print_help()
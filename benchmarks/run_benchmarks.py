@@ -0,0 +1,311 @@
+# benchmarks/run_benchmarks.py
+# 수집/렌더링 파이프라인 오프라인 벤치마크
+# - fetch_rss_feeds (시장 전체 / 언론사별), fetch_naver_news, display_news_cards 를
+#   기사 10 ~ 10,000건 규모에서 반복 측정해 지연(p50/p95)과 처리량(건/초)을 기록
+# - 네트워크 대신 로컬 스탠드인 서버(benchmarks/stub_server.py)와 픽스처만 사용
+# - 결과는 benchmarks/results/<커밋>.json 으로 저장되어 커밋 간 비교 가능
+#
+# 사용 예 (저장소 루트에서):
+#   python -m benchmarks.run_benchmarks                       # 기본 규모로 전체 측정
+#   python -m benchmarks.run_benchmarks --only rss --sizes 100,1000 --latency-ms 80
+#   python -m benchmarks.run_benchmarks --compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+import os
+import sys
+import json
+import time
+import math
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+BENCHES = ("rss", "naver", "cards")
+
+
+def _prepare_environment():
+    """실제 캐시/DB/시크릿을 건드리지 않도록 임시 경로와 가짜 키를 사용"""
+    work_dir = tempfile.mkdtemp(prefix="news-bench-")
+    os.environ.setdefault("FEED_CACHE_DIR", os.path.join(work_dir, "feeds"))
+    os.environ.setdefault("NEWS_DB_PATH", os.path.join(work_dir, "news.db"))
+    os.environ.setdefault("COLLECTOR_MODE", "external")
+    os.environ.setdefault("AI_STUB_MODEL", "1")
+    os.environ.setdefault("NAVER_ID", "bench")
+    os.environ.setdefault("NAVER_SECRET", "bench")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+
+def _git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, dirty
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _result(bench, case, size, samples, items, stages=None, error=None):
+    """측정값(초) 목록을 결과 한 줄로 요약"""
+    if error:
+        error = error.splitlines()[0]
+    row = {'bench': bench, 'case': case, 'size': size, 'runs': len(samples), 'items': items, 'error': error}
+    if samples:
+        mean = sum(samples) / len(samples)
+        row.update({
+            'mean_ms': round(mean * 1000, 2),
+            'p50_ms': round(_percentile(samples, 0.50) * 1000, 2),
+            'p95_ms': round(_percentile(samples, 0.95) * 1000, 2),
+            'min_ms': round(min(samples) * 1000, 2),
+            'items_per_s': round(items / mean, 1) if mean > 0 else None,
+        })
+    if stages:
+        row['stages'] = stages
+    return row
+
+
+def _stage_breakdown():
+    """perf_metrics 에 쌓인 구간별 p50(ms) (언론사 구분 없이 중앙값)"""
+    from perf_metrics import latency_summary
+    summary = latency_summary()
+    if summary.empty:
+        return {}
+    return {stage: round(float(p50), 2) for stage, p50 in summary.groupby('stage')['p50_ms'].median().items()}
+
+
+def _measure(fn, repeat, warmup=1):
+    """fn() 을 warmup 후 repeat 회 실행해 (소요 시간 목록, 마지막 결과 건수, 구간별 p50) 반환"""
+    import perf_metrics
+    for _ in range(warmup):
+        fn()
+    perf_metrics.reset()
+    samples, items = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        items = fn()
+        samples.append(time.perf_counter() - started)
+    return samples, items, _stage_breakdown()
+
+
+# --- 개별 벤치마크 ---
+def bench_rss(server, sizes, repeat, per_source=True):
+    import rss_collector
+    results = []
+    original = {market: dict(sources) for market, sources in rss_collector.SOURCES.items()}
+    try:
+        for market, sources in original.items():
+            for size in sizes:
+                # 시장 전체 기사 수가 size 가 되도록 언론사마다 나눠서 배정
+                per_feed = max(1, math.ceil(size / len(sources)))
+                rss_collector.SOURCES[market] = server.source_urls(market, per_feed)
+                cases = [(market, None)] + ([(f"{market}/{name}", name) for name in sources] if per_source else [])
+                for case, source_name in cases:
+                    try:
+                        samples, items, stages = _measure(
+                            lambda: len(rss_collector.fetch_rss_feeds(market, source_name)), repeat)
+                        results.append(_result("fetch_rss_feeds", case, size if source_name is None else per_feed,
+                                               samples, items, stages))
+                    except Exception as e:
+                        results.append(_result("fetch_rss_feeds", case, size, [], 0,
+                                               error=f"{type(e).__name__}: {e}"))
+                    _print_row(results[-1])
+    finally:
+        for market, sources in original.items():
+            rss_collector.SOURCES[market] = sources
+    return results
+
+
+def bench_naver(server, sizes, repeat):
+    import rss_collector
+    results = []
+    original_url = rss_collector.NAVER_API_URL
+    try:
+        for size in sizes:
+            # 스탠드인은 size 건을 보유하고 요청된 start/display 만큼만 돌려준다 (실제 API 와 동일)
+            rss_collector.NAVER_API_URL = server.naver_url(size)
+            for case, use_cache in (("증시", False), ("증시/cached", True)):
+                try:
+                    samples, items, stages = _measure(
+                        lambda: len(rss_collector.fetch_naver_news("증시", max_results=size, use_cache=use_cache)),
+                        repeat)
+                    results.append(_result("fetch_naver_news", case, size, samples, items, stages))
+                except Exception as e:
+                    results.append(_result("fetch_naver_news", case, size, [], 0, error=f"{type(e).__name__}: {e}"))
+                _print_row(results[-1])
+    finally:
+        rss_collector.NAVER_API_URL = original_url
+    return results
+
+
+def bench_cards(sizes, repeat, full_max=1000):
+    """AppTest 로 display_news_cards 실행. 첫 페이지(기본 페이지 크기)와 전체 펼침(full_max 이하)을 측정"""
+    from streamlit.testing.v1 import AppTest
+    from news_dashboard import NEWS_PAGE_SIZE
+    import perf_metrics
+
+    from streamlit.logger import set_log_level
+    set_log_level("error")   # AppTest 실행 사이에 나오는 ScriptRunContext 경고 숨김
+
+    script = os.path.join(ROOT, "benchmarks", "cards_app.py")
+    results = []
+    cwd = os.getcwd()
+    os.chdir(ROOT)   # style_global.css 를 상대 경로로 읽음
+    try:
+        for size in sizes:
+            variants = [("first_page", None)] + ([("all", size)] if size <= full_max else [])
+            for case, page_size in variants:
+                os.environ["BENCH_CARDS_SIZE"] = str(size)
+                if page_size:
+                    os.environ["BENCH_PAGE_SIZE"] = str(page_size)
+                else:
+                    os.environ.pop("BENCH_PAGE_SIZE", None)
+
+                def run_once():
+                    at = AppTest.from_file(script, default_timeout=600)
+                    at.run()
+                    if at.exception:
+                        raise RuntimeError(at.exception[0].message)
+                    return len(at.markdown)
+
+                try:
+                    run_once()   # 데이터 준비(cache_resource)와 import 비용을 측정에서 제외
+                    perf_metrics.reset()
+                    wall = []
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        run_once()
+                        wall.append(time.perf_counter() - started)
+                    stages = _stage_breakdown()
+                    stages['apptest_run'] = round(_percentile(wall, 0.5) * 1000, 2)
+                    # 지연은 스크립트 안에서 잰 display_news_cards 구간만 사용 (AppTest 오버헤드 제외)
+                    samples = perf_metrics.samples("display_news_cards")
+                    rendered = min(size, page_size or NEWS_PAGE_SIZE)
+                    results.append(_result("display_news_cards", case, size, samples, rendered, stages))
+                except Exception as e:
+                    results.append(_result("display_news_cards", case, size, [], 0, error=f"{type(e).__name__}: {e}"))
+                _print_row(results[-1])
+    finally:
+        os.chdir(cwd)
+        os.environ.pop("BENCH_CARDS_SIZE", None)
+        os.environ.pop("BENCH_PAGE_SIZE", None)
+    return results
+
+
+# --- 출력/저장/비교 ---
+def _print_row(row):
+    if row.get('error'):
+        print(f"  {row['bench']:<20} {row['case']:<22} {row['size']:>6}  ❌ {row['error']}")
+        return
+    print(f"  {row['bench']:<20} {row['case']:<22} {row['size']:>6}  "
+          f"p50 {row['p50_ms']:>9.1f}ms  p95 {row['p95_ms']:>9.1f}ms  {row['items_per_s'] or 0:>10,.0f} 건/s")
+
+
+def save_results(results, config):
+    from benchmarks.fixtures import fixture_digest
+    commit, dirty = _git_revision()
+    payload = {
+        'commit': commit,
+        'dirty': dirty,
+        'fixtures': fixture_digest(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'results': results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare_results(base_path, head_path, threshold=0.10):
+    """두 결과 파일의 p50 비교. threshold 이상 느려진 항목 수를 반환"""
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(head_path, encoding="utf-8") as f:
+        head = json.load(f)
+    if base['config'] != head['config']:
+        print("⚠️ 두 결과의 측정 설정이 다릅니다. 수치를 그대로 비교하기 어렵습니다.")
+        print(f"   base: {base['config']}\n   head: {head['config']}")
+    if base.get('fixtures') != head.get('fixtures'):
+        print("⚠️ 두 결과의 픽스처가 다릅니다 (입력 데이터가 달라 수치 비교가 정확하지 않을 수 있음).")
+        print(f"   base: {base.get('fixtures', '-')}  head: {head.get('fixtures', '-')}")
+
+    key = lambda r: (r['bench'], r['case'], r['size'])
+    base_rows = {key(r): r for r in base['results']}
+    regressions = 0
+    print(f"{'bench':<20} {'case':<22} {'size':>6} {base['commit']:>12} {head['commit']:>12} {'변화':>8}")
+    for row in head['results']:
+        old = base_rows.get(key(row))
+        if not old or old.get('error') or row.get('error'):
+            status = row.get('error') or (old or {}).get('error') or "새 항목"
+            print(f"{row['bench']:<20} {row['case']:<22} {row['size']:>6} {'-':>12} {'-':>12}  {status}")
+            continue
+        change = (row['p50_ms'] - old['p50_ms']) / old['p50_ms'] if old['p50_ms'] else 0.0
+        mark = " ▲" if change >= threshold else (" ▼" if change <= -threshold else "")
+        regressions += change >= threshold
+        print(f"{row['bench']:<20} {row['case']:<22} {row['size']:>6} "
+              f"{old['p50_ms']:>10.1f}ms {row['p50_ms']:>10.1f}ms {change:>+8.1%}{mark}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="뉴스 수집/렌더링 오프라인 벤치마크")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="기사 수 목록 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=5, help="규모별 반복 횟수")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="스탠드인 응답 지연")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="응답 지연에 더할 최대 무작위 지연")
+    parser.add_argument("--only", default=",".join(BENCHES), help=f"실행할 벤치마크 ({', '.join(BENCHES)})")
+    parser.add_argument("--no-per-source", action="store_true", help="RSS 언론사별 측정 생략 (시장 전체만)")
+    parser.add_argument("--cards-full-max", type=int, default=1000, help="카드 전체 펼침을 측정할 최대 기사 수")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="두 결과 파일 비교")
+    parser.add_argument("--threshold", type=float, default=0.10, help="비교 시 회귀로 표시할 p50 증가율")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return 1 if compare_results(*args.compare, threshold=args.threshold) else 0
+
+    _prepare_environment()
+    from benchmarks.stub_server import StubServer
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = {b.strip() for b in args.only.split(",")}
+    config = {'sizes': sizes, 'repeat': args.repeat, 'latency_ms': args.latency_ms,
+              'jitter_ms': args.jitter_ms, 'only': sorted(only), 'per_source': not args.no_per_source,
+              'cards_full_max': args.cards_full_max}
+
+    server = StubServer(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000).start()
+    print(f"📡 스탠드인: {server.base_url} (지연 {args.latency_ms}ms)")
+    results = []
+    try:
+        if "rss" in only:
+            print("▶ fetch_rss_feeds")
+            results += bench_rss(server, sizes, args.repeat, per_source=not args.no_per_source)
+        if "naver" in only:
+            print("▶ fetch_naver_news")
+            results += bench_naver(server, sizes, args.repeat)
+        if "cards" in only:
+            print("▶ display_news_cards")
+            results += bench_cards(sizes, args.repeat, full_max=args.cards_full_max)
+    finally:
+        server.stop()
+
+    print(f"💾 {save_results(results, config)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# benchmarks/stub_server.py
+# 실제 언론사/네이버 대신 픽스처를 내려주는 로컬 HTTP 스탠드인 (지연 시간 설정 가능)
+#   /rss/<market>/<index>/<n>        : SOURCES[market] 의 index 번째 언론사 피드 (기사 n건, RSS 2.0)
+#   /atom/<market>/<index>/<n>       : 같은 내용의 Atom 피드
+#   /naver/<n>/news.json?start=&display= : 기사 n건 중 start/display 구간 (네이버 검색 API 와 같은 페이지 방식)
+# 단독 실행: python -m benchmarks.stub_server --port 8800 --latency-ms 80
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from benchmarks.fixtures import build_feed, build_naver_response
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "BenchStub/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        stub = self.server.stub
+        stub.wait_latency()
+        parts = urlsplit(self.path)
+        segments = [s for s in parts.path.split('/') if s]
+        try:
+            if len(segments) == 4 and segments[0] in ('rss', 'atom'):
+                body = stub.feed(segments[1], int(segments[2]), int(segments[3]), fmt=segments[0])
+                content_type = "application/rss+xml" if segments[0] == 'rss' else "application/atom+xml"
+            elif len(segments) == 3 and segments[0] == 'naver':
+                query = parse_qs(parts.query)
+                body = stub.naver_page(int(segments[1]),
+                                       start=int(query.get('start', ['1'])[0]),
+                                       display=int(query.get('display', ['10'])[0]),
+                                       query=query.get('query', ['증시'])[0])
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+        except (ValueError, IndexError, KeyError):
+            self.send_error(400)
+            return
+        stub.requests += 1
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, seed=0):
+        """latency/jitter 는 초 단위. 응답마다 latency + U(0, jitter) 만큼 기다린 뒤 응답"""
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.requests = 0
+        self._bodies = {}
+        self._naver_items = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def wait_latency(self):
+        if self.latency or self.jitter:
+            with self._lock:
+                delay = self.latency + self._rng.uniform(0, self.jitter)
+            time.sleep(delay)
+
+    def feed(self, market, index, n, fmt="rss"):
+        from rss_collector import SOURCES
+        key = (fmt, market, index, n)
+        with self._lock:
+            body = self._bodies.get(key)
+        if body is None:
+            source_name = list(SOURCES[market])[index]
+            body = build_feed(market, source_name, n, seed=self.seed, fmt=fmt)
+            with self._lock:
+                self._bodies[key] = body
+        return body
+
+    def naver_page(self, n, start=1, display=10, query="증시"):
+        key = (n, query)
+        with self._lock:
+            data = self._naver_items.get(key)
+        if data is None:
+            data = json.loads(build_naver_response(n, query=query, seed=self.seed))
+            with self._lock:
+                self._naver_items[key] = data
+        page = dict(data, start=start, display=display,
+                    items=data['items'][max(start, 1) - 1:max(start, 1) - 1 + display])
+        return json.dumps(page, ensure_ascii=False).encode('utf-8')
+
+    # --- 벤치마크에서 쓰는 URL ---
+    def source_urls(self, market, n, fmt="rss"):
+        """SOURCES[market] 과 같은 모양의 {언론사: 스탠드인 URL} (언론사별 기사 n건)"""
+        from rss_collector import SOURCES
+        return {name: f"{self.base_url}/{fmt}/{market}/{i}/{n}" for i, name in enumerate(SOURCES[market])}
+
+    def naver_url(self, n):
+        return f"{self.base_url}/naver/{n}/news.json"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="bench-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 피드/네이버 스탠드인 서버")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    server = StubServer(port=args.port, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000)
+    print(f"📡 스탠드인 서버: {server.base_url}  (지연 {args.latency_ms}ms + 최대 {args.jitter_ms}ms)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+        sys.exit(0)
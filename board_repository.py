@@ -0,0 +1,89 @@
+# board_repository.py
+# QnA / Notice 같은 게시판 시트 접근 계층
+# - 행마다 고정 id 를 두고, 추가는 시트 끝에 행만 덧붙이고 수정/삭제는 id 로 찾은 행만 변경
+# - id 는 숫자가 아닌 접두어로 시작 (시트를 읽을 때 '0123'/'12e45' 같은 값이 숫자로 바뀌어 행을 못 찾는 일이 없도록)
+# - 목록 읽기는 짧은 TTL 로 모든 세션이 공유 (쓰기 후에는 캐시를 바로 고쳐서 반영)
+import time
+import uuid
+import threading
+import pandas as pd
+
+QNA_COLUMNS = ['id', 'username', 'question', 'answer', 'status', 'created_at', 'replied_at']
+NOTICE_COLUMNS = ['id', 'title', 'content', 'created_at']
+
+
+ROW_ID_PREFIX = "r"
+
+
+def new_row_id():
+    return ROW_ID_PREFIX + uuid.uuid4().hex[:12]
+
+
+class BoardRepository:
+    def __init__(self, backend, worksheet, columns, read_ttl=10):
+        self.backend = backend
+        self.worksheet = worksheet
+        self.columns = columns
+        self.read_ttl = read_ttl
+        self._df = None
+        self._loaded_at = 0.0
+        self._lock = threading.RLock()
+
+    def _empty(self):
+        return pd.DataFrame(columns=self.columns)
+
+    def _load(self):
+        if self._df is not None and time.monotonic() - self._loaded_at < self.read_ttl:
+            return self._df
+        try:
+            df = self.backend.read(self.worksheet)
+            # 시트가 비어 있거나 헤더가 없으면 빈 게시판으로 취급
+            if df.empty and not set(self.columns[1:]) & set(df.columns):
+                df = self._empty()
+        except Exception as e:
+            print(f"⚠️ {self.worksheet} 시트 읽기 실패: {e}")
+            df = self._empty()
+        for col in self.columns:
+            if col not in df.columns:
+                df[col] = ""
+        df = df.astype(object).where(df.notna(), "")
+        df = df[(df[self.columns[1:]] != "").any(axis=1)].reset_index(drop=True)
+
+        # id 가 없거나 접두어 없는 이전 형식(숫자로 읽혔을 수 있음)인 행에는 한 번만 새 id 를 부여해 저장
+        # (이후로는 행 단위 작업만 사용)
+        df['id'] = df['id'].astype(str)
+        missing = ~df['id'].str.startswith(ROW_ID_PREFIX)
+        if missing.any():
+            df.loc[missing, 'id'] = [new_row_id() for _ in range(missing.sum())]
+            self.backend.write_all(self.worksheet, df)
+
+        self._df, self._loaded_at = df, time.monotonic()
+        return self._df
+
+    def list(self):
+        with self._lock:
+            return self._load().copy()
+
+    def append(self, row):
+        """새 행을 시트 끝에 추가하고 id 를 반환"""
+        row = {col: row.get(col, "") for col in self.columns if col != 'id'} | {'id': new_row_id()}
+        with self._lock:
+            self._load()
+            self.backend.append_rows(self.worksheet, [row])
+            self._df = pd.concat([self._df, pd.DataFrame([row])], ignore_index=True)
+        return row['id']
+
+    def update(self, row_id, **values):
+        """id 로 찾은 행의 지정된 칸만 수정"""
+        with self._lock:
+            self._load()
+            self.backend.update_row(self.worksheet, 'id', row_id, values)
+            mask = self._df['id'] == row_id
+            for col, value in values.items():
+                self._df.loc[mask, col] = value
+
+    def delete(self, row_id):
+        with self._lock:
+            self._load()
+            self.backend.delete_row(self.worksheet, 'id', row_id)
+            self._df = self._df[self._df['id'] != row_id].reset_index(drop=True)
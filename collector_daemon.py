@@ -0,0 +1,208 @@
+# collector_daemon.py
+# 화면(Streamlit 재실행)과 분리된 뉴스 수집기
+# - 언론사별로 자기 주기에 맞춰 RSS를 수집하고 로컬 SQLite 저장소에 기록합니다.
+# - 언론사별 기준점(source_watermark) 이후 처음 보는 기사만 델타로 구독자에게 전달합니다.
+#   피드가 바뀐 경우(304 가 아닌 응답) 이미 본 기사도 함께 저장해 고쳐진 제목/요약을 반영합니다(검색 색인도 다시 만듦).
+# - 같은 언론사 수집(주기 수집과 새로고침 버튼)은 언론사별 lock 으로 한 번에 하나씩 처리합니다.
+# - 대시보드는 저장소에 모인 데이터만 읽습니다.
+# - 단독 실행: python collector_daemon.py  (이 경우 앱에는 COLLECTOR_MODE=external 설정)
+import time
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# 단독 실행할 때도 앱과 같은 .env 설정(NEWS_DB_PATH 등)을 쓰도록, 환경변수를 읽는 모듈보다 먼저 불러옴
+from dotenv import load_dotenv
+load_dotenv()
+
+from rss_collector import SOURCES, fetch_new_articles
+from database_manager import (DB_PATH, upsert_articles, get_latest_articles, get_last_collected_at,
+                              get_last_attempt_at, record_poll_attempt)
+from search_index import index_pending
+from source_watermark import load_watermark, save_watermark
+from market_digest import get_digest_scheduler
+
+# 언론사별 수집 주기(초) - 속보성 피드는 짧게, 나머지는 기본값
+DEFAULT_POLL_INTERVAL = 300
+POLL_INTERVALS = {
+    "연합뉴스": 120,
+    "CNBC(속보)": 120,
+    "인포맥스": 180,
+}
+
+# --- 로컬 저장소 (database_manager 의 SQLite) ---
+def save_collected_feed(market_type, source_name, df):
+    """기사를 저장하고 수집 시각을 기록 (df 가 비어 있어도 수집 시각은 갱신)"""
+    saved = upsert_articles(df, market=market_type, source=source_name)
+    # 새로 들어온 기사를 검색 인덱스에 반영
+    if saved:
+        index_pending()
+    return saved
+
+def load_collected_feed(market_type, source_name, limit=50):
+    """수집된 최신 기사와 마지막 수집 시각을 반환 (아직 수집 전이면 (None, None))"""
+    collected_at = get_last_collected_at(market_type, source_name)
+    if collected_at is None:
+        return None, None
+    return get_latest_articles(source=source_name, market=market_type, limit=limit), collected_at
+
+
+class FeedCollector:
+    """SOURCES 의 모든 언론사를 각자의 주기로 수집하는 백그라운드 작업"""
+
+    def __init__(self, intervals=None, max_workers=4):
+        self.intervals = dict(POLL_INTERVALS, **(intervals or {}))
+        self.last_status = {}
+        self._next_run = {(market, name): 0.0 for market, feeds in SOURCES.items() for name in feeds}
+        self._in_flight = set()
+        self._watermarks = {}
+        self._source_locks = {}     # (market, source) -> 수집~저장~기준점 기록~알림을 묶는 lock
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collector")
+        self._thread = None
+
+    def interval_for(self, source_name):
+        return self.intervals.get(source_name, DEFAULT_POLL_INTERVAL)
+
+    # --- 새 기사 델타 구독 ---
+    def subscribe(self, callback):
+        """callback(market_type, source_name, delta_df) 를 새 기사가 저장될 때마다 호출. 해제 함수를 반환"""
+        with self._lock:
+            self._subscribers.append(callback)
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _publish(self, market_type, source_name, delta):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(market_type, source_name, delta)
+            except Exception as e:
+                print(f"⚠️ 새 기사 구독자 오류 [{source_name}]: {e}")
+
+    def _watermark(self, market_type, source_name):
+        key = (market_type, source_name)
+        if key not in self._watermarks:
+            self._watermarks[key] = load_watermark(market_type, source_name)
+        return self._watermarks[key]
+
+    def _source_lock(self, market_type, source_name):
+        with self._lock:
+            return self._source_locks.setdefault((market_type, source_name), threading.RLock())
+
+    def poll_source(self, market_type, source_name):
+        """
+        언론사 1곳을 즉시 수집하여 저장소에 기록하고 새 기사(델타)를 반환.
+        같은 언론사를 동시에 수집하면(주기 수집 중 새로고침 등) 앞의 수집이 끝난 뒤 실행되어 같은 델타를 두 번 알리지 않음
+        """
+        with self._source_lock(market_type, source_name):
+            watermark = self._watermark(market_type, source_name)
+            fetched, info = fetch_new_articles(market_type, source_name, watermark, include_seen=True)
+            delta = fetched
+            if 'is_new' in fetched.columns:
+                delta = fetched[fetched['is_new']].drop(columns='is_new').reset_index(drop=True)
+                fetched = fetched.drop(columns='is_new')
+            # 실패하면 저장소의 기존 기사와 기준점을 그대로 둔다
+            if info['status'] == 'ok':
+                # 새 기사뿐 아니라 이미 본 기사도 저장 (바뀐 제목/요약만 실제로 갱신됨)
+                save_collected_feed(market_type, source_name, fetched)
+                if not delta.empty:
+                    watermark.advance(delta)
+                    save_watermark(watermark)
+                    self._publish(market_type, source_name, delta)
+            # 결과와 관계없이 시도 자체를 기록 (실패한 언론사를 화면 쪽에서 다시 받지 않도록)
+            record_poll_attempt(market_type, source_name, info['status'])
+            with self._lock:
+                self.last_status[(market_type, source_name)] = dict(info, polled_at=datetime.now())
+        return delta
+
+    def collect_if_missing(self, market_type, source_name):
+        """
+        아직 한 번도 수집을 시도하지 않은 언론사면 수집. 진행 중인 수집(첫 주기 등)이 있으면 끝나기를 기다리고 다시 받지 않음.
+        시도했지만 실패/빈 피드였던 언론사는 다음 주기 수집에 맡김
+        """
+        with self._source_lock(market_type, source_name):
+            if get_last_attempt_at(market_type, source_name) is None:
+                self.poll_source(market_type, source_name)
+
+    def poll_now(self, market_type, source_name):
+        """다음 주기를 기다리지 않고 해당 언론사를 바로 수집하도록 예약"""
+        with self._lock:
+            self._next_run[(market_type, source_name)] = 0.0
+        self._wake.set()
+
+    def _run_poll(self, key):
+        try:
+            self.poll_source(*key)
+        except Exception as e:
+            print(f"⚠️ 수집기 오류 [{key[1]}]: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+                self._next_run[key] = time.monotonic() + self.interval_for(key[1])
+            self._wake.set()
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [key for key, at in self._next_run.items()
+                       if at <= now and key not in self._in_flight]
+                self._in_flight.update(due)
+                pending = [at for key, at in self._next_run.items() if key not in self._in_flight]
+            for key in due:
+                self._pool.submit(self._run_poll, key)
+
+            # 가장 가까운 다음 수집 시각까지 대기 (poll_now 호출 시 즉시 깨어남)
+            wait_for = max(0.0, min(pending) - time.monotonic()) if pending else DEFAULT_POLL_INTERVAL
+            self._wake.wait(timeout=wait_for)
+            self._wake.clear()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name="feed-collector", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_collector = None
+_collector_lock = threading.Lock()
+
+def get_collector():
+    """프로세스당 하나의 수집기를 시작하여 반환"""
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = FeedCollector().start()
+        return _collector
+
+
+if __name__ == "__main__":
+    print(f"📡 뉴스 수집기 시작 (저장 위치: {DB_PATH})")
+    collector = get_collector()
+    # 앱과 수집기를 분리한 경우 시장 요약도 이 프로세스에서 생성
+    if get_digest_scheduler() is None:
+        print("ℹ️ GEMINI_API_KEY 가 없어 시장 요약은 생성하지 않습니다.")
+    try:
+        while True:
+            time.sleep(60)
+            for (market, name), info in sorted(collector.last_status.items()):
+                print(f"[{info['polled_at']:%H:%M:%S}] {market}/{name}: {info['status']} "
+                      f"({info.get('count', 0)}건, 새 기사 {info.get('new', 0)}건)")
+    except KeyboardInterrupt:
+        collector.stop()
@@ -0,0 +1,270 @@
+# database_manager.py
+# 수집한 기사를 보관하는 SQLite 저장소
+# - WAL 모드: 수집기가 쓰는 동안에도 대시보드가 막힘 없이 읽을 수 있음
+# - link 기준 일괄 upsert, (source, published) 인덱스로 "언론사별 최신 N건" 조회
+# - (source, link) 기준 유일: 같은 기사를 여러 언론사가 실으면 언론사마다 한 행씩 저장해
+#   언론사별 최신 N건 조회에서 빠지지 않도록 함 (통합 화면에서는 link/유사 기사 중복 제거로 한 번만 노출)
+import os
+import sqlite3
+import threading
+import pandas as pd
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+DB_PATH = os.environ.get(
+    "NEWS_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "news.db")
+)
+
+ARTICLE_COLUMNS = ['id', 'title', 'link', 'published', 'summary', 'source', 'market', 'collected_at']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    link         TEXT NOT NULL,
+    title        TEXT,
+    summary      TEXT,
+    published    TEXT,              -- KST 기준 'YYYY-MM-DD HH:MM:SS'
+    source       TEXT NOT NULL DEFAULT '',   -- 출처 미지정 기사는 '' (UNIQUE 에서 NULL 은 서로 다른 값으로 취급되므로)
+    market       TEXT,
+    collected_at TEXT,
+    UNIQUE (source, link)              -- 같은 기사라도 언론사마다 한 행
+);
+CREATE INDEX IF NOT EXISTS idx_articles_source_published ON articles(source, published DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published DESC, id DESC);
+-- 최신순 페이지 조회용: 발행 시각이 없는(NULL) 기사도 맨 뒤 페이지까지 빠짐없이 나오도록 '' 로 정렬
+CREATE INDEX IF NOT EXISTS idx_articles_source_published_key ON articles(source, COALESCE(published, '') DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_published_key ON articles(COALESCE(published, '') DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS source_state (
+    market            TEXT NOT NULL,
+    source            TEXT NOT NULL,
+    last_collected_at TEXT,             -- 마지막으로 기사를 저장한 시각
+    last_attempt_at   TEXT,             -- 결과(ok/empty/error/timeout)와 관계없이 마지막으로 수집을 시도한 시각
+    last_status       TEXT,
+    PRIMARY KEY (market, source)
+);
+"""
+
+# link 단독 UNIQUE 였던 이전 스키마의 articles 를 (source, link) 로 옮길 때 쓰는 임시 테이블
+_ARTICLES_V2 = _SCHEMA.split("CREATE INDEX", 1)[0].replace(
+    "CREATE TABLE IF NOT EXISTS articles (", "CREATE TABLE articles_v2 (")
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized_paths = set()
+
+def get_connection():
+    """스레드마다 하나의 연결을 재사용 (sqlite3 연결은 스레드 간 공유 불가)"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and getattr(_local, 'path', None) == DB_PATH:
+        return conn
+
+    os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    with _init_lock:
+        if DB_PATH not in _initialized_paths:
+            _migrate_link_unique(conn)
+            conn.executescript(_SCHEMA)
+            _add_source_state_columns(conn)
+            _initialized_paths.add(DB_PATH)
+    _local.conn, _local.path = conn, DB_PATH
+    return conn
+
+def _has_link_only_unique(conn):
+    for index in conn.execute("PRAGMA index_list(articles)").fetchall():
+        if index['unique']:
+            cols = [c['name'] for c in conn.execute(f"PRAGMA index_info('{index['name']}')")]
+            if cols == ['link']:
+                return True
+    return False
+
+def _migrate_link_unique(conn):
+    """link 단독 UNIQUE 로 만든 기존 DB 를 (source, link) UNIQUE 로 재구성 (id 는 그대로 유지)"""
+    if not _has_link_only_unique(conn):
+        return
+    with conn:
+        conn.execute(_ARTICLES_V2)
+        conn.execute("""
+            INSERT INTO articles_v2 (id, link, title, summary, published, source, market, collected_at)
+            SELECT id, link, title, summary, published, COALESCE(source, ''), market, collected_at FROM articles
+        """)
+        conn.execute("DROP TABLE articles")
+        conn.execute("ALTER TABLE articles_v2 RENAME TO articles")
+
+def _add_source_state_columns(conn):
+    """수집 시도 기록 컬럼이 없던 기존 DB 의 source_state 에 컬럼 추가"""
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(source_state)")}
+    with conn:
+        for column in ('last_attempt_at', 'last_status'):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE source_state ADD COLUMN {column} TEXT")
+
+def init_db():
+    get_connection()
+
+def _to_kst_text(value):
+    """datetime/문자열을 KST 기준 정렬 가능한 문자열로 변환"""
+    if value is None:
+        return None
+    try:
+        ts = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        return None
+    if pd.isna(ts):
+        return None
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("Asia/Seoul").tz_localize(None)
+    return ts.strftime("%Y-%m-%d %H:%M:%S")
+
+def _rows_to_df(rows):
+    df = pd.DataFrame([dict(r) for r in rows], columns=ARTICLE_COLUMNS)
+    # 저장된 값은 KST 기준이므로 수집 경로와 같은 KST tz-aware 컬럼으로 복원
+    df['published'] = pd.to_datetime(df['published']).dt.tz_localize("Asia/Seoul")
+    return df
+
+# --- 쓰기 ---
+def upsert_articles(articles, market=None, source=None):
+    """
+    기사 여러 건을 한 트랜잭션으로 저장합니다. 같은 언론사의 같은 link 면 내용만 갱신합니다.
+    다른 언론사가 같은 link 를 실으면 그 언론사 행으로 따로 저장합니다.
+    articles: DataFrame 또는 dict 리스트 (title, link, published, summary[, source, market])
+    반환값: 처리한 행 수
+    """
+    records = articles.to_dict('records') if isinstance(articles, pd.DataFrame) else list(articles)
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    params = [
+        (r.get('link'), r.get('title'), r.get('summary'), _to_kst_text(r.get('published')),
+         r.get('source') or source or '', r.get('market') or market, now)
+        for r in records if r.get('link') and r.get('link') != '#'
+    ]
+
+    conn = get_connection()
+    with conn:
+        conn.executemany("""
+            INSERT INTO articles (link, title, summary, published, source, market, collected_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(source, link) DO UPDATE SET
+                title = excluded.title,
+                summary = excluded.summary,
+                published = COALESCE(excluded.published, articles.published)
+            WHERE articles.title IS NOT excluded.title
+               OR articles.summary IS NOT excluded.summary
+               OR articles.published IS NOT COALESCE(excluded.published, articles.published)
+        """, params)
+        if market and source:
+            conn.execute("""
+                INSERT INTO source_state (market, source, last_collected_at) VALUES (?, ?, ?)
+                ON CONFLICT(market, source) DO UPDATE SET last_collected_at = excluded.last_collected_at
+            """, (market, source, now))
+    return len(params)
+
+def record_poll_attempt(market, source, status):
+    """수집 시도를 기록 (실패/빈 피드도 기록해서, 화면 쪽이 '아직 수집 전'으로 보고 매번 다시 받지 않도록)"""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn = get_connection()
+    with conn:
+        conn.execute("""
+            INSERT INTO source_state (market, source, last_attempt_at, last_status) VALUES (?, ?, ?, ?)
+            ON CONFLICT(market, source) DO UPDATE SET
+                last_attempt_at = excluded.last_attempt_at, last_status = excluded.last_status
+        """, (market, source, now, status))
+
+def insert_article(title, link, published, summary, source=None, market=None):
+    """단건 저장 (이전 버전 호환용) - 여러 건은 upsert_articles 사용"""
+    return upsert_articles([{'title': title, 'link': link, 'published': published, 'summary': summary}],
+                           market=market, source=source)
+
+# --- 읽기 ---
+def get_latest_articles(source=None, limit=10, market=None, before=None):
+    """
+    최신순 기사 조회 (인덱스 사용). before=(published, id) 를 넘기면 그 이후 페이지를 반환합니다.
+    발행 시각이 없는 기사는 맨 뒤에 오며, 이 경우 before 의 published 는 None/NaT 로 넘기면 됩니다.
+    """
+    where, params = [], []
+    if source:
+        where.append("source = ?")
+        params.append(source)
+    if market:
+        where.append("market = ?")
+        params.append(market)
+    if before:
+        where.append("(COALESCE(published, ''), id) < (?, ?)")
+        params.extend([_to_kst_text(before[0]) or "", int(before[1])])
+    sql = "SELECT * FROM articles"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY COALESCE(published, '') DESC, id DESC LIMIT ?"
+    params.append(int(limit))
+    return _rows_to_df(get_connection().execute(sql, params).fetchall())
+
+def iter_articles(source=None, market=None, since=None, until=None, batch_size=500):
+    """조건에 맞는 기사를 batch_size 단위 DataFrame 으로 나눠서 반환 (전체를 메모리에 올리지 않음)"""
+    where, params = [], []
+    if source:
+        where.append("source = ?")
+        params.append(source)
+    if market:
+        where.append("market = ?")
+        params.append(market)
+    if since is not None:
+        where.append("published >= ?")
+        params.append(_to_kst_text(since))
+    if until is not None:
+        where.append("published < ?")
+        params.append(_to_kst_text(until))
+    sql = "SELECT * FROM articles"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY published DESC, id DESC"
+
+    cursor = get_connection().execute(sql, params)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield _rows_to_df(rows)
+
+def get_recent_articles(hours=24, source=None, market=None, limit=500):
+    # 저장된 발행 시각은 KST 이므로 기준 시각도 서버 시간대가 아닌 KST 로 계산
+    since = datetime.now(ZoneInfo("Asia/Seoul")) - timedelta(hours=hours)
+    frames = []
+    for batch in iter_articles(source=source, market=market, since=since, batch_size=min(limit, 500)):
+        frames.append(batch)
+        if sum(len(f) for f in frames) >= limit:
+            break
+    if not frames:
+        return _rows_to_df([])
+    return pd.concat(frames, ignore_index=True).head(limit)
+
+def get_last_collected_at(market, source):
+    row = get_connection().execute(
+        "SELECT last_collected_at FROM source_state WHERE market = ? AND source = ?", (market, source)
+    ).fetchone()
+    if row is None or row['last_collected_at'] is None:
+        return None
+    return datetime.strptime(row['last_collected_at'], "%Y-%m-%d %H:%M:%S")
+
+def get_last_attempt_at(market, source):
+    row = get_connection().execute(
+        "SELECT last_attempt_at FROM source_state WHERE market = ? AND source = ?", (market, source)
+    ).fetchone()
+    if row is None or row['last_attempt_at'] is None:
+        return None
+    return datetime.strptime(row['last_attempt_at'], "%Y-%m-%d %H:%M:%S")
+
+def get_max_article_id():
+    row = get_connection().execute("SELECT MAX(id) AS max_id FROM articles").fetchone()
+    return row['max_id'] or 0
+
+def count_articles_after(after_id):
+    """id 가 after_id 보다 큰(그 뒤에 새로 저장된) 기사 수를 (market, source) 별로 반환 (기본 키 범위 조회)"""
+    rows = get_connection().execute("""
+        SELECT market, source, COUNT(*) AS count FROM articles
+        WHERE id > ? GROUP BY market, source
+    """, (int(after_id),)).fetchall()
+    return pd.DataFrame([dict(r) for r in rows], columns=['market', 'source', 'count'])
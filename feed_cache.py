@@ -0,0 +1,155 @@
+# feed_cache.py
+# 프로세스 전체가 공유하는 언론사별 뉴스 캐시
+# - (market, source) 단위 항목, 언론사별 TTL, 전체 메모리 상한(LRU 제거)
+# - TTL 이 지나면 기존 데이터를 그대로 보여주면서 뒤에서 새로 읽음 (stale-while-revalidate)
+# - 같은 항목을 여러 사용자가 동시에 요청해도 실제 로드는 한 번만 수행 (진행 중인 로드를 함께 기다림)
+# - get_nowait 은 캐시에 있는 항목만 바로 돌려주고, 없는 항목은 뒤에서 로드만 시작 (여러 언론사를 합쳐 보는 화면용)
+# - invalidate 는 항목의 세대(generation)를 올려, 그 전에 시작된 로드 결과가 캐시에 다시 들어가지 않게 함
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+DEFAULT_FEED_TTL = 60
+FEED_TTLS = {
+    "연합뉴스": 30,
+    "CNBC(속보)": 30,
+}
+FEED_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _df_size(value):
+    df = value[0] if isinstance(value, tuple) else value
+    try:
+        return int(df.memory_usage(deep=True).sum())
+    except Exception:
+        return 0
+
+
+class FeedCache:
+    def __init__(self, loader, default_ttl=DEFAULT_FEED_TTL, ttls=None, max_bytes=FEED_CACHE_MAX_BYTES):
+        """loader(market_type, source_name) 의 반환값을 캐시합니다."""
+        self.loader = loader
+        self.default_ttl = default_ttl
+        self.ttls = dict(FEED_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> {'value', 'loaded_at', 'size'}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._in_flight = {}            # key -> 진행 중인 로드의 Future
+        self._generations = {}          # key -> invalidate 횟수
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="feed-cache")
+        # 미리 채우기는 별도 풀에서 (보고 있는 탭의 만료 갱신이 미리 채우기 뒤에 밀리지 않도록)
+        self._prewarm_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="feed-prewarm")
+
+    def ttl_for(self, source_name):
+        return self.ttls.get(source_name, self.default_ttl)
+
+    def _store(self, key, value, generation):
+        size = _df_size(value)
+        with self._lock:
+            # 로드하는 동안 invalidate 되었으면 (이미 낡은 결과이므로) 캐시에 넣지 않음
+            if self._generations.get(key, 0) != generation:
+                return
+            old = self._entries.pop(key, None)
+            if old:
+                self._total_bytes -= old['size']
+            self._entries[key] = {'value': value, 'loaded_at': time.monotonic(), 'size': size}
+            self._total_bytes += size
+            # 메모리 상한을 넘으면 가장 오래 안 쓰인 항목부터 제거 (방금 넣은 항목은 유지)
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted['size']
+
+    def _begin_load(self, key):
+        """진행 중인 로드가 없으면 새로 등록 (lock 안에서 호출). (future, 세대, 새로 등록했는지) 반환"""
+        future = self._in_flight.get(key)
+        if future is not None:
+            return future, None, False
+        future = self._in_flight[key] = Future()
+        return future, self._generations.get(key, 0), True
+
+    def _run_load(self, key, future, generation):
+        try:
+            value = self.loader(*key)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._store(key, value, generation)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+
+    def _background_refresh(self, key, future, generation):
+        try:
+            self._run_load(key, future, generation)
+        except Exception as e:
+            print(f"⚠️ 뉴스 캐시 갱신 실패 [{key[1]}]: {e}")
+
+    def _cached(self, key):
+        """캐시된 항목 (없으면 None). 만료된 항목은 그대로 돌려주고 뒤에서 갱신 (lock 안에서 호출)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        if time.monotonic() - entry['loaded_at'] >= self.ttl_for(key[1]):
+            # 이미 갱신 중이면 그대로 둠
+            future, generation, started = self._begin_load(key)
+            if started:
+                self._pool.submit(self._background_refresh, key, future, generation)
+        return entry
+
+    def get(self, market_type, source_name):
+        key = (market_type, source_name)
+        with self._lock:
+            entry = self._cached(key)
+            if entry is not None:
+                return entry['value']
+            # 항목이 없으면 진행 중인 로드를 기다리거나 직접 로드
+            future, generation, started = self._begin_load(key)
+        if started:
+            return self._run_load(key, future, generation)
+        return future.result()
+
+    def get_nowait(self, market_type, source_name):
+        """get 과 같지만 기다리지 않음: 항목이 없으면 뒤에서 로드를 시작하고 None 을 반환"""
+        key = (market_type, source_name)
+        with self._lock:
+            entry = self._cached(key)
+            if entry is not None:
+                return entry['value']
+            future, generation, started = self._begin_load(key)
+            if started:
+                self._pool.submit(self._background_refresh, key, future, generation)
+        return None
+
+    def prewarm(self, keys):
+        """비어 있는 항목을 뒤에서 미리 채움 (이미 있거나 채우는 중인 항목은 건너뜀). 예약한 수를 반환"""
+        submitted = 0
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    continue
+                future, generation, started = self._begin_load(key)
+                if started:
+                    self._prewarm_pool.submit(self._background_refresh, key, future, generation)
+                    submitted += 1
+        return submitted
+
+    def invalidate(self, market_type, source_name):
+        """해당 언론사 항목만 제거 (다른 언론사/다른 캐시는 그대로). 진행 중인 로드 결과도 버리고 다음 요청은 새로 로드"""
+        key = (market_type, source_name)
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._in_flight.pop(key, None)
+            entry = self._entries.pop(key, None)
+            if entry:
+                self._total_bytes -= entry['size']
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._total_bytes, 'max_bytes': self.max_bytes}
@@ -0,0 +1,168 @@
+# market_digest.py
+# 시장별 AI 요약(다이제스트)을 주기적으로 미리 만들어 두고 모든 사용자에게 같은 결과를 보여줌
+# - 주기마다 시장(SOURCES)별 최신 기사로 "국내장 요약", "미국장 요약"을 한 번씩 생성
+# - 생성 결과와 생성 시각은 SQLite 에 저장 (화면은 저장된 최신 요약만 읽음, 로그인 불필요)
+# - 서버 키(GEMINI_API_KEY)를 사용하며, AI_STUB_MODEL=1 이면 스텁 모델로 동작
+import os
+import threading
+from datetime import datetime
+import pandas as pd
+import streamlit as st
+from ai_analyzer import GEMINI_MODEL, get_model_client
+from database_manager import get_connection, get_latest_articles
+from rss_collector import SOURCES, dedupe_articles
+from perf_metrics import timed
+import database_manager
+
+DIGEST_INTERVAL = 60 * 30      # 요약을 새로 만드는 주기(초)
+DIGEST_RETRY_INTERVAL = 60     # 아직 기사가 없거나 실패한 경우 다시 시도하는 주기(초)
+DIGEST_ARTICLES = 40           # 요약에 넣을 시장별 최신 기사 수 (중복 기사 제외 전)
+DIGEST_TITLES = {"KOREA": "국내장 요약", "USA": "미국장 요약"}
+
+DIGEST_PROMPT = (
+    "투자 전문가로서 아래 최신 뉴스 {count}건을 바탕으로 오늘 시장을 움직이는 이슈를 '{title}'으로 정리하세요. "
+    "핵심 이슈 3~5개(관련 종목/섹터 포함), 전반적인 시장 분위기, 주목할 일정과 리스크를 "
+    "간결한 마크다운 목록으로 작성하세요.\n\n"
+    "{articles}"
+)
+DIGEST_ARTICLE = "- [{source}] {title} ({published})"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS market_digests (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    market         TEXT NOT NULL,
+    content        TEXT NOT NULL,
+    article_count  INTEGER NOT NULL,
+    last_article_id INTEGER NOT NULL,  -- 요약에 반영된 가장 최근 기사 id (새 기사가 없으면 다시 만들지 않음)
+    model          TEXT,
+    generated_at   TEXT NOT NULL       -- KST 기준 'YYYY-MM-DD HH:MM:SS'
+);
+CREATE INDEX IF NOT EXISTS idx_market_digests_market ON market_digests(market, id DESC);
+"""
+
+_schema_ready = set()
+
+def _conn():
+    conn = get_connection()
+    if database_manager.DB_PATH not in _schema_ready:
+        conn.executescript(_SCHEMA)
+        _schema_ready.add(database_manager.DB_PATH)
+    return conn
+
+def _digest_api_key():
+    """요약 생성에 쓰는 서버 키: secrets.toml 의 GEMINI_API_KEY, 없으면 같은 이름의 환경변수"""
+    try:
+        api_key = st.secrets.get("GEMINI_API_KEY")
+    except Exception:
+        api_key = None
+    return api_key or os.environ.get("GEMINI_API_KEY")
+
+# --- 조회 ---
+def get_latest_digest(market):
+    """가장 최근에 만든 시장 요약 (dict) 또는 None"""
+    row = _conn().execute("""
+        SELECT market, content, article_count, last_article_id, model, generated_at
+        FROM market_digests WHERE market = ? ORDER BY id DESC LIMIT 1
+    """, (market,)).fetchone()
+    if row is None:
+        return None
+    digest = dict(row)
+    digest['generated_at'] = datetime.strptime(digest['generated_at'], "%Y-%m-%d %H:%M:%S")
+    return digest
+
+# --- 생성 ---
+def build_digest_prompt(market, df):
+    body = "\n".join(
+        DIGEST_ARTICLE.format(source=row['source'], title=row['title'],
+                              published=row['published'].strftime("%m-%d %H:%M") if pd.notna(row['published']) else "-")
+        for row in df.to_dict('records')
+    )
+    return DIGEST_PROMPT.format(title=DIGEST_TITLES.get(market, market), count=len(df), articles=body)
+
+def generate_digest(market, client=None, limit=DIGEST_ARTICLES, force=False):
+    """
+    시장의 최신 기사로 요약을 1건 만들어 저장하고 반환합니다.
+    기사가 없거나, 마지막 요약 이후 새 기사가 없으면(force=False) 모델을 호출하지 않고 None 을 반환합니다.
+    """
+    df = get_latest_articles(market=market, limit=limit)
+    if df.empty:
+        return None
+    last_article_id = int(df['id'].max())
+    previous = get_latest_digest(market)
+    if not force and previous is not None and previous['last_article_id'] >= last_article_id:
+        return None
+
+    # 여러 언론사에 실린 같은 기사는 한 번만 넣음
+    df = dedupe_articles(df)
+    models = client or get_model_client(_digest_api_key())
+    with timed("digest_generate", source=market):
+        response = models.generate_content(model=GEMINI_MODEL, contents=build_digest_prompt(market, df))
+    content = (response.text or "").strip()
+    if not content:
+        raise ValueError("모델 응답이 비어 있습니다.")
+
+    generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with _conn() as conn:
+        conn.execute("""
+            INSERT INTO market_digests (market, content, article_count, last_article_id, model, generated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (market, content, len(df), last_article_id, GEMINI_MODEL, generated_at))
+    return get_latest_digest(market)
+
+
+class DigestScheduler:
+    """DIGEST_INTERVAL 마다 모든 시장의 요약을 만드는 백그라운드 작업"""
+
+    def __init__(self, interval=DIGEST_INTERVAL, client=None):
+        self.interval = interval
+        self.client = client
+        self.last_status = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self):
+        """모든 시장 요약을 한 번씩 시도. 다시 시도가 필요한 시장이 있으면 True"""
+        retry = False
+        for market in SOURCES:
+            try:
+                digest = generate_digest(market, client=self.client)
+                if digest is None and get_latest_digest(market) is None:
+                    # 아직 수집된 기사가 없음 (수집기 시작 직후)
+                    retry = True
+                self.last_status[market] = {'status': 'ok' if digest else 'skipped', 'at': datetime.now()}
+            except Exception as e:
+                retry = True
+                self.last_status[market] = {'status': 'error', 'error': str(e), 'at': datetime.now()}
+                print(f"⚠️ 시장 요약 생성 실패 [{market}]: {e}")
+        return retry
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            retry = self.run_once()
+            self._stop.wait(timeout=DIGEST_RETRY_INTERVAL if retry else self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name="market-digest", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_digest_scheduler():
+    """프로세스당 하나의 요약 스케줄러를 시작하여 반환 (서버 키도 스텁 모델도 없으면 None)"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            if not (_digest_api_key() or os.environ.get("AI_STUB_MODEL")):
+                return None
+            _scheduler = DigestScheduler().start()
+        return _scheduler
@@ -0,0 +1,105 @@
+# market_timeline.py
+# 시장 전체("전체" 탭) 타임라인
+# - 언론사별로 이미 최신순 정렬된 기사 목록을 heapq.merge 로 k-way 병합 (전체 재정렬 없음)
+# - 새 기사가 들어오면 새 기사들만 기존 타임라인과 병합해서 갱신
+# - 화면용 DataFrame 은 타임라인이 바뀔 때만 다시 만듦
+# - 여러 언론사에 실린 같은(유사한) 기사는 화면용 목록에서 한 건으로 묶음 (link 가 달라도 제목/요약이 비슷하면)
+import heapq
+import threading
+import pandas as pd
+from rss_collector import dedupe_articles
+
+TIMELINE_MAX_ITEMS = 5000   # 시장별로 보관할 최대 기사 수 (오래된 기사부터 제외)
+TIMELINE_COLUMNS = ['title', 'link', 'published', 'summary', 'source']
+
+
+class MarketTimeline:
+    def __init__(self, market_type, max_items=TIMELINE_MAX_ITEMS):
+        self.market_type = market_type
+        self.max_items = max_items
+        self._entries = []          # (정렬 키, 순번, 기사 dict) 최신순
+        self._links = set()
+        self._seq = 0               # 같은 시각 기사 사이의 순서 고정용
+        self._last_frames = {}      # source -> 마지막으로 반영한 DataFrame (같은 객체면 건너뜀)
+        self._frame = None
+        self._deduped = None        # (원본 frame, 중복 제거한 frame)
+        self._lock = threading.Lock()
+
+    def _entries_from(self, source, df):
+        """df(최신순) 중 아직 없는 기사만 (정렬 키, 순번, 기사) 목록으로"""
+        if df is None or df.empty:
+            return []
+        links = self._links
+        new = df[[link not in links for link in df['link'].tolist()]].drop_duplicates(subset='link')
+        if new.empty:
+            return []
+        # 정렬 키는 컬럼 단위로 계산 (NaT 는 int64 최솟값이 되어 맨 뒤로)
+        keys = pd.to_datetime(new['published'], utc=True).dt.as_unit('ns').astype('int64').tolist()
+        records = new.reindex(columns=TIMELINE_COLUMNS).to_dict('records')
+        start = self._seq
+        self._seq += len(records)
+        entries = []
+        for i, (key, record) in enumerate(zip(keys, records)):
+            record['source'] = record['source'] or source
+            entries.append((key, -(start + i), record))
+        # 저장소/수집 결과는 이미 최신순이지만, 순서가 어긋난 피드도 있을 수 있어 새 기사분만 확인 후 정렬
+        if any(a[0] < b[0] for a, b in zip(entries, entries[1:])):
+            entries.sort(key=lambda e: e[0], reverse=True)
+        return entries
+
+    def _add_stream(self, source, df):
+        stream = self._entries_from(source, df)
+        self._links.update(e[2]['link'] for e in stream)
+        self._last_frames[source] = df
+        return stream
+
+    def _merge(self, streams):
+        """기존 타임라인과 새 스트림들을 병합 (각각 이미 최신순이므로 재정렬 없음)"""
+        merged = list(heapq.merge(self._entries, *streams, key=lambda e: (e[0], e[1]), reverse=True))
+        # 상한을 넘는 오래된 기사는 제외하고 링크 집합에서도 뺌
+        for entry in merged[self.max_items:]:
+            self._links.discard(entry[2]['link'])
+        self._entries = merged[:self.max_items]
+        self._frame = None
+
+    def rebuild(self, frames):
+        """{source: 최신순 DataFrame} 전체로 타임라인을 새로 만듦 (언론사별 스트림 k-way 병합)"""
+        with self._lock:
+            self._entries, self._links, self._last_frames = [], set(), {}
+            streams = []
+            for source, df in frames.items():
+                streams.append(self._add_stream(source, df))
+            self._merge(streams)
+
+    def update(self, source, df):
+        """언론사 1곳의 최신 목록을 반영. 새 기사만 기존 타임라인과 병합하고, 추가된 건수를 반환"""
+        with self._lock:
+            if self._last_frames.get(source) is df:
+                return 0
+            stream = self._add_stream(source, df)
+            if stream:
+                self._merge([stream])
+            return len(stream)
+
+    def frame(self):
+        """타임라인 전체를 최신순 DataFrame 으로 (바뀌지 않았으면 이전 결과 재사용)"""
+        with self._lock:
+            if self._frame is None:
+                # 컬럼 단위로 구성하고 발행 시각은 정렬 키(ns)에서 한 번에 복원
+                records = [e[2] for e in self._entries]
+                frame = pd.DataFrame({col: [r[col] for r in records] for col in TIMELINE_COLUMNS if col != 'published'})
+                frame.insert(2, 'published', pd.to_datetime([e[0] for e in self._entries], unit='ns', utc=True)
+                             .tz_convert("Asia/Seoul"))
+                self._frame = frame
+            return self._frame
+
+    def deduped_frame(self):
+        """frame() 에서 유사 기사 묶음마다 대표 1건만 남긴 목록 (cluster_size 포함, 타임라인이 바뀔 때만 다시 계산)"""
+        frame = self.frame()
+        with self._lock:
+            if self._deduped is None or self._deduped[0] is not frame:
+                self._deduped = (frame, dedupe_articles(frame))
+            return self._deduped[1]
+
+    def __len__(self):
+        return len(self._entries)
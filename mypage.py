@@ -1,8 +1,7 @@
 import streamlit as st
 import pandas as pd
-from streamlit_gsheets import GSheetsConnection
-import bcrypt
 import os
+from perf_metrics import lazy_import
 
 # --- CSS 파일을 불러오는 함수 ---
 def local_css(file_name):
@@ -12,7 +11,7 @@ def local_css(file_name):
     else:
         st.error(f"CSS 파일을 찾을 수 없습니다: {file_name}")
 
-def render_mypage(conn):
+def render_mypage(user_repo):
     local_css("mypage.css") # 외부 파일 로드
 
     # --- 로그인 체크 ---
@@ -22,18 +21,17 @@ def render_mypage(conn):
 
     def update_info(field, value):
         try:
-            df = conn.read(worksheet="Users")
-            idx = df.index[df['username'] == st.session_state.username].tolist()[0]
+            username = st.session_state.username
+            # 해당 사용자 행의 필드만 수정 (저장소 캐시에 즉시 반영, 시트는 뒤에서 기록)
             if field == 'password':
-                df.at[idx, 'hashed_password'] = bcrypt.hashpw(value.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+                bcrypt = lazy_import("bcrypt")
+                user_repo.update(username, hashed_password=bcrypt.hashpw(value.encode('utf-8'), bcrypt.gensalt()).decode('utf-8'))
             elif field == 'gemini':
-                df.at[idx, 'gemini_api_key'] = value
+                user_repo.update(username, gemini_api_key=value)
                 st.session_state.user_keys['GEMINI'] = value
             elif field == 'gpt':
-                df.at[idx, 'openai_api_key'] = value
+                user_repo.update(username, openai_api_key=value)
                 st.session_state.user_keys['OPENAI'] = value
-            conn.update(worksheet="Users", data=df)
-            st.cache_data.clear()
             return True
         except Exception as e:
             st.error(f"오류 발생: {e}")
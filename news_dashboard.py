@@ -1,115 +1,404 @@
+import os
+import hashlib
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import pandas as pd
 import streamlit as st
-from google import genai
-from rss_collector import fetch_rss_feeds, fetch_naver_news, SOURCES
+from ai_analyzer import analyze_news_batch, is_failed_analysis
+from ai_jobs import get_job_queue, JobRejected
+from rss_collector import fetch_rss_feeds, fetch_naver_news, dedupe_articles, cluster_near_duplicates, SOURCES
+from collector_daemon import get_collector, load_collected_feed, save_collected_feed
+from search_index import search_articles
+from database_manager import get_max_article_id, count_articles_after, get_last_collected_at
+from feed_cache import FeedCache
+from market_timeline import MarketTimeline
+from market_digest import DIGEST_TITLES, get_digest_scheduler, get_latest_digest
+from perf_metrics import timed
 
 # CSS 파일을 불러오는 유틸리티 함수
 def local_css(file_name):
     with open(file_name, encoding="utf-8") as f:
         st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
-# --- Gemini 요약 함수 ---
-def analyze_news_gemini(api_key, title, summary):
-    try:
-        client = genai.Client(api_key=api_key.strip())
-        prompt = f"투자 전문가로서 뉴스 분석: {title}\n내용: {summary}. 핵심요약, 시장영향, 투자포인트 작성."
-        response = client.models.generate_content(model="gemini-3-flash-preview", contents=prompt)
-        return response.text
-    except Exception as e:
-        return f"⚠️ 분석 실패: {str(e)}"
+NEWS_PAGE_SIZE = 10      # 한 번에 보여줄 카드 수 ('더 보기'로 추가)
+NEWS_READ_LIMIT = 200    # 언론사별로 저장소에서 읽어올 최대 기사 수
+NEW_ARTICLES_CHECK_INTERVAL = 30   # 새 기사 알림을 확인하는 주기(초)
+MARKET_LABELS = {"KOREA": "국내", "USA": "미국"}
+DIGEST_READ_TTL = 60     # 저장된 시장 요약을 다시 읽는 주기(초)
+AI_JOB_POLL_INTERVAL = 1 # 진행 중인 AI 분석 작업을 확인하는 주기(초)
+TIMELINE_PENDING_POLL = 2  # "전체" 탭에서 아직 불러오는 언론사가 있는지 확인하는 주기(초)
+
+# --- 백그라운드 수집기 연동 ---
+@st.cache_resource(show_spinner=False)
+def start_background_collector():
+    # 수집기를 별도 프로세스로 돌리는 경우(COLLECTOR_MODE=external) 앱 안에서는 시작하지 않음
+    if os.environ.get("COLLECTOR_MODE") == "external":
+        return None
+    collector = get_collector()
+    feed_cache = get_feed_cache()
+    timelines = {market: get_market_timeline(market) for market in SOURCES}
+
+    def on_new_articles(market_type, source_name, delta):
+        # 새 기사가 저장되면 그 언론사 캐시만 비우고, 전체 타임라인에는 델타만 병합
+        feed_cache.invalidate(market_type, source_name)
+        timelines[market_type].update(source_name, delta)
+
+    collector.subscribe(on_new_articles)
+    # 시장 요약도 수집기와 같은 프로세스에서 주기적으로 생성
+    get_digest_scheduler()
+    return collector
+
+def _collect_source_now(market_type, source_name):
+    """해당 언론사만 즉시 다시 수집해서 저장소에 기록"""
+    collector = start_background_collector()
+    if collector is not None:
+        return collector.poll_source(market_type, source_name)
+    df = fetch_rss_feeds(market_type, source_name=source_name)
+    if not df.empty:
+        save_collected_feed(market_type, source_name, df)
+    return df
+
+def _collect_missing_source(market_type, source_name):
+    """
+    아직 수집을 시도한 적 없는 언론사 수집 (수집기가 이미 받는 중이면 그 결과를 기다림).
+    수집기를 따로 실행하는 경우(COLLECTOR_MODE=external)에는 그쪽 첫 수집을 기다림 (화면에서 직접 받지 않음)
+    """
+    collector = start_background_collector()
+    if collector is not None:
+        collector.collect_if_missing(market_type, source_name)
+
+def _read_source_news(market_type, source_name):
+    """
+    저장소에서 기사를 읽고, 아직 수집을 시도한 적 없는 언론사면 수집기로 한 번 수집 (st 호출 없음: 백그라운드 갱신용).
+    시도했지만 저장된 기사가 없으면 빈 목록을 반환하고 다음 수집은 수집기 주기에 맡김
+    """
+    with timed("store_read", source=source_name):
+        df, collected_at = load_collected_feed(market_type, source_name, limit=NEWS_READ_LIMIT)
+    if df is None:
+        _collect_missing_source(market_type, source_name)
+        df, collected_at = load_collected_feed(market_type, source_name, limit=NEWS_READ_LIMIT)
+        if df is None:
+            df, collected_at = pd.DataFrame(columns=['title', 'link', 'published', 'summary', 'source']), None
+    return df, collected_at
+
+# 모든 사용자가 공유하는 언론사별 캐시 (TTL 만료 시 기존 값을 보여주며 뒤에서 갱신)
+@st.cache_resource(show_spinner=False)
+def get_feed_cache():
+    return FeedCache(_read_source_news)
+
+def prewarm_feed_cache():
+    """
+    저장소에 이미 기사가 있는 언론사 캐시 항목을 뒤에서 미리 채움 (서버 시작 직후 첫 방문자가 읽기를 기다리지 않도록).
+    아직 수집된 적 없는 언론사는 수집기가 곧 첫 수집을 하므로 건너뜀 (같은 피드를 두 번 받지 않도록)
+    """
+    keys = [(market, name) for market, feeds in SOURCES.items() for name in feeds
+            if get_last_collected_at(market, name) is not None]
+    return get_feed_cache().prewarm(keys)
+
+def refresh_source_news(market_type, source_name):
+    """새로고침 버튼: 해당 언론사만 다시 수집하고 그 캐시 항목만 무효화"""
+    df = _collect_source_now(market_type, source_name)
+    get_feed_cache().invalidate(market_type, source_name)
+    return df
+
+def load_source_news(market_type, source_name):
+    """수집기가 모아 둔 기사를 공유 캐시를 거쳐 읽음"""
+    df, collected_at = get_feed_cache().get(market_type, source_name)
+    if collected_at:
+        st.caption(f"🕒 {collected_at.strftime('%H:%M:%S')} 수집")
+    return df
+
+# 시장별 "전체" 타임라인 (모든 사용자가 공유). 언론사별 캐시 항목이 바뀐 경우에만 새 기사를 병합
+@st.cache_resource(show_spinner=False)
+def get_market_timeline(market_type):
+    return MarketTimeline(market_type)
+
+def load_market_timeline(market_type):
+    """
+    시장의 모든 언론사 기사를 발행 시각 순으로 합친 목록.
+    이미 캐시에 있는 언론사만 합치고, 아직 없는 언론사는 기다리지 않고 뒤에서 불러옴 (첫 화면이 모든 언론사 수집을 기다리지 않도록)
+    """
+    timeline = get_market_timeline(market_type)
+    cache = get_feed_cache()
+    collected, pending = [], []
+    with timed("timeline_merge", source=market_type):
+        for name in SOURCES[market_type]:
+            cached = cache.get_nowait(market_type, name)
+            if cached is None:
+                pending.append(name)
+                continue
+            df, collected_at = cached
+            timeline.update(name, df)
+            if collected_at:
+                collected.append(collected_at)
+    if collected:
+        loaded = len(SOURCES[market_type]) - len(pending)
+        st.caption(f"🕒 {max(collected).strftime('%H:%M:%S')} 수집 · {loaded}개 언론사 {len(timeline)}건")
+    if pending:
+        _wait_for_sources(market_type, tuple(pending))
+    # 여러 언론사가 함께 실은 기사는 한 번만 보여줌
+    return timeline.deduped_frame()
+
+@st.fragment(run_every=TIMELINE_PENDING_POLL)
+def _wait_for_sources(market_type, pending):
+    """불러오는 중인 언론사 안내. 모두 캐시에 들어오면 "전체" 목록을 다시 그림"""
+    cache = get_feed_cache()
+    remaining = [name for name in pending if cache.get_nowait(market_type, name) is None]
+    if not remaining:
+        st.rerun()
+    st.caption(f"⏳ {', '.join(remaining)} 기사를 불러오는 중입니다...")
+
+# --- 시장 요약 (모든 방문자에게 같은 결과, 로그인 불필요) ---
+@st.cache_data(ttl=DIGEST_READ_TTL, show_spinner=False)
+def load_market_digests():
+    return {market: get_latest_digest(market) for market in SOURCES}
+
+def render_market_digests():
+    digests = load_market_digests()
+    if not any(digests.values()):
+        return
+    cols = st.columns(len(digests))
+    for col, (market, digest) in zip(cols, digests.items()):
+        with col:
+            with st.expander(f"📝 {DIGEST_TITLES.get(market, market)}", expanded=True):
+                if digest is None:
+                    st.caption("아직 생성된 요약이 없습니다.")
+                    continue
+                st.caption(f"🕒 {digest['generated_at'].strftime('%m-%d %H:%M')} 생성 · 최신 기사 {digest['article_count']}건 기준")
+                st.markdown(digest['content'])
 
 # --- 개별 뉴스 카드 렌더링 함수 ---
-def display_news_cards(df, market_key):
+# AI 버튼을 눌러도 해당 카드만 다시 실행되도록 fragment 로 분리
+@st.fragment
+def render_news_card(row, card_key, batch_result=None, show_source=False):
+    published_text = row["published"].strftime("%Y-%m-%d %H:%M") if pd.notna(row["published"]) else "-"
+    if show_source and row.get("source"):
+        published_text = f'{row["source"]} · {published_text}'
+    with st.container():
+        st.markdown(
+            f'<div class="news-card">'
+            f'<h3>{row["title"]}</h3>'
+            f'<p style="color:#6B7280; font-size:0.9rem;">{published_text} | '
+            f'<a href="{row["link"]}" target="_blank" style="color:#3B82F6;">기사 원문</a></p>'
+            f'</div>',
+            unsafe_allow_html=True
+        )
+
+        # 목록 위치가 아니라 기사 링크로 작업을 기억 (새 기사가 위에 추가되어도 다른 카드에 결과가 붙지 않도록)
+        job_state_key = f"ai_job_{hashlib.sha1(str(row['link']).encode('utf-8')).hexdigest()[:16]}"
+        if st.button(f"🤖 AI 분석 실행", key=f"ai_{card_key}"):
+            if st.session_state.logged_in:
+                if st.session_state.user_keys['GEMINI']:
+                    # 작업만 등록하고 바로 돌아옴 (결과는 아래 영역이 주기적으로 확인해서 표시)
+                    try:
+                        job = get_job_queue().submit_analysis(st.session_state.user_keys['GEMINI'],
+                                                              row['title'], row['summary'], link=row['link'])
+                        st.session_state[job_state_key] = job.id
+                    except JobRejected as e:
+                        st.warning(str(e))
+                else:
+                    st.error("API 키를 등록해주세요.")
+            else:
+                st.warning("로그인이 필요합니다.")
+
+        job = get_job_queue().get(st.session_state.get(job_state_key))
+        if job is not None and job.finished:
+            _show_ai_job(job)
+        elif job is not None:
+            render_ai_job(job_state_key)
+        elif batch_result:
+            st.markdown(f'<div class="ai-result">{batch_result}</div>', unsafe_allow_html=True)
+
+def _show_ai_job(job):
+    if job.status == "error":
+        st.error(f"⚠️ 분석 실패: {job.error}")
+    elif job.text:
+        st.markdown(f'<div class="ai-result">{job.text}</div>', unsafe_allow_html=True)
+    else:
+        status = "AI 분석 중..." if job.status == "running" else "AI 분석 대기 중..."
+        st.markdown(f'<div class="ai-result">{status}</div>', unsafe_allow_html=True)
+
+# 진행 중인 작업만 주기적으로 다시 그림 (생성된 부분까지 표시)
+@st.fragment(run_every=AI_JOB_POLL_INTERVAL)
+def render_ai_job(job_state_key):
+    job = get_job_queue().get(st.session_state.get(job_state_key))
+    if job is None:
+        # 보관 시간이 지나 정리된 작업 (결과는 분석 캐시에 있으므로 다시 실행하면 바로 표시됨)
+        st.session_state.pop(job_state_key, None)
+        return
+    # 끝난 작업도 이 fragment 가 그대로 결과를 그림 (앱 전체를 다시 실행하지 않음).
+    # 다음에 카드가 다시 그려질 때는 끝난 작업이므로 이 fragment 없이 결과만 표시됨
+    _show_ai_job(job)
+
+def _show_more(limit_key, count):
+    st.session_state[limit_key] = count
+
+# 목록도 fragment: '더 보기'/일괄 분석은 목록만 다시 그림
+@st.fragment
+def display_news_cards(df, market_key, page_size=NEWS_PAGE_SIZE, show_source=False):
     local_css("style_global.css")
     if df.empty:
         st.info("표시할 뉴스가 없습니다.")
         return
 
-    for idx, row in df.head(10).iterrows():
-        with st.container():
-            pub_time = row["published"].strftime("%m/%d %H:%M")
-            st.markdown(
-                f'<div class="news-card">'
-                f'<h3>{row["title"]}</h3>'
-                f'<p style="color:#6B7280; font-size:0.9rem;">{row["published"].strftime("%Y-%m-%d %H:%M")} | '
-                f'<a href="{row["link"]}" target="_blank" style="color:#3B82F6;">기사 원문</a></p>'
-                f'</div>',
-                unsafe_allow_html=True
-            )
-
-            if st.button(f"🤖 AI 분석 실행", key=f"ai_{market_key}_{idx}"):
-                if st.session_state.logged_in:
-                    if st.session_state.user_keys['GEMINI']:
-                        with st.spinner("AI 분석 중..."):
-                            res = analyze_news_gemini(st.session_state.user_keys['GEMINI'], row['title'], row['summary'])
-                            st.markdown(f'<div class="ai-result">{res}</div>', unsafe_allow_html=True)
-                    else:
-                        st.error("API 키를 등록해주세요.")
-                else:
-                    st.warning("로그인이 필요합니다.")
+    limit_key = f"news_limit_{market_key}"
+    visible = st.session_state.get(limit_key, page_size)
+    page_df = df.head(visible)
+
+    # 목록의 기사들을 한 번의 요청으로 묶어서 분석
+    if st.button("🤖 이 목록 전체 AI 분석", key=f"ai_batch_{market_key}"):
+        if st.session_state.logged_in:
+            if st.session_state.user_keys['GEMINI']:
+                # 유사 기사 묶음마다 대표 기사만 요청하고, 결과는 묶음의 모든 카드에 표시
+                clustered = cluster_near_duplicates(page_df)
+                canonical = clustered[clustered['is_canonical']]
+                with st.spinner(f"AI 분석 중... ({len(canonical)}건 일괄)"):
+                    results = analyze_news_batch(st.session_state.user_keys['GEMINI'],
+                                                 canonical[['title', 'summary', 'link']].to_dict('records'),
+                                                 reuse_single=True)
+                by_cluster = dict(zip(canonical['cluster_id'], results))
+                # 성공한 결과만 세션에 보관 (실패는 이번에만 알리고 다음 시도 때 다시 분석)
+                succeeded = {link: by_cluster[cluster_id]
+                             for link, cluster_id in zip(clustered['link'], clustered['cluster_id'])
+                             if not is_failed_analysis(by_cluster[cluster_id])}
+                st.session_state.setdefault('batch_ai_results', {}).update(succeeded)
+                failed = sum(is_failed_analysis(r) for r in results)
+                if failed:
+                    st.warning(f"{failed}건은 분석하지 못했습니다. 잠시 후 다시 시도해주세요.")
+            else:
+                st.error("API 키를 등록해주세요.")
+        else:
+            st.warning("로그인이 필요합니다.")
+    batch_results = st.session_state.get('batch_ai_results', {})
+
+    for idx, row in page_df.iterrows():
+        render_news_card(row, f"{market_key}_{idx}", batch_results.get(row['link']), show_source=show_source)
+
+    if len(df) > visible:
+        # 콜백에서 표시 개수를 늘리면 이 목록 fragment 만 다시 그려짐
+        st.button(f"⬇️ 더 보기 ({visible}/{len(df)})", key=f"more_{market_key}",
+                  on_click=_show_more, args=(limit_key, visible + page_size))
+
+# --- 시장별 언론사 탭 (선택된 탭 1개만 읽어서 렌더링) ---
+def render_market_tabs(market_type):
+    flag, suffix, key_prefix = {"KOREA": ("🇰🇷", "증시 뉴스", "kor"), "USA": ("🇺🇸", "뉴스", "usa")}[market_type]
+    source_names = list(SOURCES[market_type].keys())
+    # 2단계 하위 탭: 전체(모든 언론사 병합) + 언론사별
+    all_tab, *sub_tabs = st.tabs(["전체"] + source_names, key=f"news_sub_tab_{key_prefix}", on_change="rerun")
+
+    if all_tab.open:
+        with all_tab:
+            st.subheader(f"{flag} 전체 {suffix}")
+            display_news_cards(load_market_timeline(market_type), f"{key_prefix.upper()}_ALL", show_source=True)
+
+    for i, name in enumerate(source_names):
+        if not sub_tabs[i].open:
+            continue
+        with sub_tabs[i]:
+            st.subheader(f"{flag} {name} {suffix}")
+            if st.button(f"🔄 {name} 새로고침", key=f"refresh_{key_prefix}_{i}"):
+                refresh_source_news(market_type, name)
+                st.rerun()
+
+            news_df = load_source_news(market_type, name)
+            display_news_cards(news_df, f"{key_prefix.upper()}_{name}")
+
+# --- 새 기사 알림 ---
+# 세션이 마지막으로 본 기사 id 이후 저장된 기사 수만 센다 (기본 키 범위 COUNT 라 주기적으로 실행해도 가벼움)
+@st.fragment(run_every=NEW_ARTICLES_CHECK_INTERVAL)
+def render_new_articles_indicator():
+    seen_id = st.session_state.get('news_seen_article_id')
+    if seen_id is None:
+        return
+    new_counts = count_articles_after(seen_id)
+    if new_counts.empty:
+        return
+    by_market = new_counts.groupby(new_counts['market'].fillna(""))['count'].sum()
+    detail = " · ".join(f"{MARKET_LABELS.get(market, '기타')} {count}건" for market, count in by_market.items())
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        st.info(f"🆕 새 기사 {int(by_market.sum())}건 ({detail})")
+    with col2:
+        if st.button("새로 보기", key="show_new_articles"):
+            # 새 기사가 들어온 언론사 캐시만 비우고 전체 화면을 다시 그림
+            for row in new_counts.itertuples(index=False):
+                get_feed_cache().invalidate(row.market, row.source)
+            st.session_state['news_seen_article_id'] = get_max_article_id()
+            st.rerun()
 
 # --- 메인 뉴스 화면 렌더링 함수 ---
 def render_news_section():
     st.title("📈 증시 핵심 요약 대시보드")
+    start_background_collector()
+    render_market_digests()
+    render_new_articles_indicator()
 
     # 1단계 메인 탭: 국내장, 미국장
-    tab_kor, tab_usa, tab_search = st.tabs(["🇰🇷 국내장", "🇺🇸 미국장", "🔍 뉴스 검색"])
+    # on_change="rerun": 선택된 탭의 내용만 실행 (나머지 탭은 수집/렌더링하지 않음)
+    tab_kor, tab_usa, tab_search = st.tabs(["🇰🇷 국내장", "🇺🇸 미국장", "🔍 뉴스 검색"],
+                                           key="news_main_tab", on_change="rerun")
 
     # --- 국내장 섹션 ---
-    with tab_kor:
-        kor_source_names = list(SOURCES["KOREA"].keys())
-        # 2단계 하위 탭: 국내 언론사 6개
-        sub_tabs_kor = st.tabs(kor_source_names)
+    if tab_kor.open:
+        with tab_kor:
+            render_market_tabs("KOREA")
 
-        for i, name in enumerate(kor_source_names):
-            with sub_tabs_kor[i]:
-                st.subheader(f"🇰🇷 {name} 증시 뉴스")
-                if st.button(f"🔄 {name} 새로고침", key=f"refresh_kor_{i}"):
-                    st.cache_data.clear()
-                    st.rerun()
+    # --- 미국장 섹션 ---
+    if tab_usa.open:
+        with tab_usa:
+            render_market_tabs("USA")
 
-                news_df = fetch_rss_feeds("KOREA", source_name=name)
-                display_news_cards(news_df, f"KOR_{name}")
+    # --- [신규] 뉴스 검색 탭 ---
+    if tab_search.open:
+        with tab_search:
+            st.subheader("🔎 키워드로 뉴스 찾기")
+            # 검색 폼 사용 (엔터를 치거나 버튼을 누를 때만 실행)
+            with st.form(key="search_form"):
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    query = st.text_input("검색어를 입력하세요", key="search_input_field")
+                with col2:
+                    search_market = st.selectbox("시장", ["전체(수집 기사)", "국내(Naver)"])
 
-    # --- 미국장 섹션 ---
-    with tab_usa:
-        usa_source_names = list(SOURCES["USA"].keys())
-        # 2단계 하위 탭: 미국 관련 소스 2개
-        sub_tabs_usa = st.tabs(usa_source_names)
+                # 수집 기사 검색 전용 필터 (Naver 검색에서는 무시)
+                col3, col4 = st.columns([3, 1])
+                with col3:
+                    all_sources = [name for feeds in SOURCES.values() for name in feeds]
+                    search_sources = st.multiselect("언론사 (비우면 전체)", all_sources)
+                with col4:
+                    search_days = st.selectbox("기간", [1, 7, 30, 365], index=1, format_func=lambda d: f"최근 {d}일")
 
-        for i, name in enumerate(usa_source_names):
-            with sub_tabs_usa[i]:
-                st.subheader(f"🇺🇸 {name} 뉴스")
-                if st.button(f"🔄 {name} 새로고침", key=f"refresh_usa_{i}"):
-                    st.cache_data.clear()
-                    st.rerun()
+                # Naver 검색 전용 옵션 (100건을 넘으면 여러 페이지를 동시에 받아서 합침)
+                col5, col6 = st.columns([3, 1])
+                with col5:
+                    naver_refine = st.checkbox("증권 관련 기사로 좁히기 (Naver)")
+                with col6:
+                    naver_count = st.selectbox("건수 (Naver)", [15, 100, 300, 1000], format_func=lambda n: f"{n}건")
 
-                news_df = fetch_rss_feeds("USA", source_name=name)
-                display_news_cards(news_df, f"USA_{name}")
+                submit_btn = st.form_submit_button("검색 실행")
 
-    # --- [신규] 뉴스 검색 탭 ---
-    with tab_search:
-        st.subheader("🔎 키워드로 뉴스 찾기")
-        # 검색 폼 사용 (엔터를 치거나 버튼을 누를 때만 실행)
-        with st.form(key="search_form"):
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                query = st.text_input("검색어를 입력하세요", key="search_input_field")
-            with col2:
-                search_market = st.selectbox("시장", ["국내(Naver)"])
-
-            submit_btn = st.form_submit_button("검색 실행")
-
-        # 검색 버튼을 누르면 결과를 세션에 저장
-        if submit_btn and query:
-            with st.spinner(f"'{query}' 검색 중..."):
-                if search_market == "국내(Naver)":
-                    df_res = fetch_naver_news(query)
-
-                # 검색 결과와 키워드를 세션에 저장 (핵심!)
-                st.session_state['last_search_df'] = df_res
-                st.session_state['last_query'] = query
-
-        # 페이지가 새로고침되어도 세션에 결과가 있으면 출력
-        if 'last_search_df' in st.session_state:
-            st.write(f"### '{st.session_state.last_query}' 검색 결과")
-            display_news_cards(st.session_state.last_search_df, "SEARCH_RESULT")
\ No newline at end of file
+            # 검색 버튼을 누르면 결과를 세션에 저장
+            if submit_btn and query:
+                with st.spinner(f"'{query}' 검색 중..."):
+                    if search_market == "국내(Naver)":
+                        df_res = fetch_naver_news(query, max_results=naver_count, refine=naver_refine)
+                    else:
+                        # 게시일은 KST 로 저장되어 있으므로 서버 시간대와 무관하게 KST 기준으로 계산
+                        since = datetime.now(ZoneInfo("Asia/Seoul")) - timedelta(days=search_days)
+                        df_res = search_articles(query, sources=search_sources or None, since=since, limit=200)
+                        # 여러 언론사에 실린 같은 기사는 대표 기사 1건만 표시
+                        df_res = dedupe_articles(df_res)
+
+                    # 검색 결과와 키워드를 세션에 저장 (핵심!)
+                    st.session_state['last_search_df'] = df_res
+                    st.session_state['last_query'] = query
+                    st.session_state.pop("news_limit_SEARCH_RESULT", None)
+
+            # 페이지가 새로고침되어도 세션에 결과가 있으면 출력
+            if 'last_search_df' in st.session_state:
+                st.write(f"### '{st.session_state.last_query}' 검색 결과 ({len(st.session_state.last_search_df)}건)")
+                display_news_cards(st.session_state.last_search_df, "SEARCH_RESULT")
+
+    # 첫 화면에서 읽은 기사까지는 본 것으로 처리 (그 이후 저장분만 새 기사로 알림)
+    if 'news_seen_article_id' not in st.session_state:
+        st.session_state['news_seen_article_id'] = get_max_article_id()
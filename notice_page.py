@@ -1,17 +1,13 @@
 # notice_page.py
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 
-def render_notice_manager(conn):
+def render_notice_manager(notice_repo):
     st.title("📢 공지사항 관리 (Admin)")
     st.markdown("---")
 
     # 1. 데이터 불러오기
-    try:
-        notice_df = conn.read(worksheet="Notice", ttl=0)
-    except:
-        notice_df = pd.DataFrame(columns=['title', 'content', 'created_at'])
+    notice_df = notice_repo.list()
 
     # 2. 새 공지사항 작성 섹션
     st.subheader("🆕 새 공지사항 등록")
@@ -22,13 +18,11 @@ def render_notice_manager(conn):
 
         if submit:
             if n_title and n_content:
-                new_n = pd.DataFrame([{
+                notice_repo.append({
                     "title": n_title,
                     "content": n_content,
                     "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }])
-                updated_df = pd.concat([notice_df, new_n], ignore_index=True)
-                conn.update(worksheet="Notice", data=updated_df)
+                })
                 st.success("✅ 공지사항이 성공적으로 등록되었습니다.")
                 st.rerun()
             else:
@@ -43,15 +37,14 @@ def render_notice_manager(conn):
     else:
         # 최신순 정렬
         notice_df = notice_df.sort_values(by="created_at", ascending=False)
-        for idx, row in notice_df.iterrows():
+        for _, row in notice_df.iterrows():
             col1, col2 = st.columns([7, 1])
             with col1:
                 with st.expander(f"📌 {row['title']} ({row['created_at']})"):
                     st.write(row['content'])
             with col2:
-                if st.button("삭제", key=f"del_notice_{idx}"):
-                    # 해당 인덱스 삭제 후 업데이트
-                    updated_df = notice_df.drop(idx)
-                    conn.update(worksheet="Notice", data=updated_df)
+                if st.button("삭제", key=f"del_notice_{row['id']}"):
+                    # id 로 해당 공지 행만 삭제
+                    notice_repo.delete(row['id'])
                     st.toast("🗑️ 공지사항이 삭제되었습니다.")
                     st.rerun()
\ No newline at end of file
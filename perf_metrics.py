@@ -0,0 +1,118 @@
+# perf_metrics.py
+# 구간별 소요 시간 측정 (프로세스 메모리에 최근 N건만 보관)
+# 사용 예:
+#     with timed("feed_download", source="한국경제"):
+#         ...
+# 어드민 패널에서 latency_summary() 로 구간/언론사별 p50/p95/p99 를 확인합니다.
+# 서버 시작 시 import 시간은 "import" 구간으로 기록하고 boot_report() 로 한 번 출력합니다.
+import sys
+import time
+import importlib
+import threading
+from collections import deque
+from contextlib import contextmanager
+import pandas as pd
+
+MAX_SAMPLES = 1000   # (구간, 언론사) 조합별로 보관할 최근 측정 수
+
+_samples = {}
+_lock = threading.Lock()
+_boot = {'started': time.perf_counter(), 'reported': False}   # 이 모듈을 처음 불러온 시각 = 첫 실행 시작
+
+
+def record(stage, elapsed, source=None):
+    key = (stage, source or "-")
+    with _lock:
+        bucket = _samples.get(key)
+        if bucket is None:
+            bucket = _samples[key] = deque(maxlen=MAX_SAMPLES)
+        bucket.append(elapsed)
+
+
+@contextmanager
+def timed(stage, source=None):
+    """with 블록의 실행 시간을 stage(+source) 이름으로 기록 (예외가 나도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started, source)
+
+
+@contextmanager
+def import_timer(label):
+    """with 블록에서 새 모듈을 실제로 불러온 경우에만 걸린 시간을 "import" 구간으로 기록 (이미 불러온 재실행은 제외)"""
+    before = len(sys.modules)
+    started = time.perf_counter()
+    yield
+    if len(sys.modules) > before:
+        record("import", time.perf_counter() - started, label)
+
+
+def lazy_import(name):
+    """처음 쓸 때 모듈을 불러옴 (무거운 SDK 를 앱 시작 시점이 아니라 실제 사용 시점으로 미룸)"""
+    module = sys.modules.get(name)
+    if module is None:
+        with import_timer(name):
+            module = importlib.import_module(name)
+    return module
+
+
+def samples(stage, source=None):
+    """stage 의 최근 측정값(초) 목록. source 를 주지 않으면 모든 언론사를 합침"""
+    with _lock:
+        return [v for (s, src), values in _samples.items()
+                if s == stage and (source is None or src == source) for v in values]
+
+
+def latency_summary(by_source=True):
+    """
+    구간/언론사별 호출 수와 p50/p95/p99/최대(ms) 표.
+    by_source=False 이면 언론사를 합친 구간별 측정값 전체로 백분위를 계산 (source 는 '전체')
+    """
+    with _lock:
+        snapshot = {key: list(values) for key, values in _samples.items()}
+    if not by_source:
+        pooled = {}
+        for (stage, _), values in snapshot.items():
+            pooled.setdefault((stage, "전체"), []).extend(values)
+        snapshot = pooled
+    rows = []
+    for (stage, source), values in sorted(snapshot.items()):
+        s = pd.Series(values) * 1000
+        rows.append({
+            'stage': stage,
+            'source': source,
+            'count': len(s),
+            'p50_ms': round(s.quantile(0.50), 1),
+            'p95_ms': round(s.quantile(0.95), 1),
+            'p99_ms': round(s.quantile(0.99), 1),
+            'max_ms': round(s.max(), 1),
+        })
+    return pd.DataFrame(rows, columns=['stage', 'source', 'count', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+
+
+def boot_report(deferred=()):
+    """
+    첫 화면을 다 그린 뒤 프로세스당 한 번만: 첫 실행 소요 시간을 "first_render" 로 기록하고
+    import 시간 표를 문자열로 반환 (이미 보고했으면 None). deferred 는 아직 불러오지 않았는지 확인할 모듈 이름들
+    """
+    with _lock:
+        if _boot['reported']:
+            return None
+        _boot['reported'] = True
+        imports = {src: values[0] for (s, src), values in _samples.items() if s == "import" and values}
+    elapsed = time.perf_counter() - _boot['started']
+    record("first_render", elapsed)
+    lines = [f"⏱️ 첫 실행 {elapsed * 1000:.0f}ms (import 시간, 느린 순)"]
+    for name, value in sorted(imports.items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"  {name:<24} {value * 1000:8.1f}ms")
+    for name in deferred:
+        if name not in sys.modules:
+            lines.append(f"  {name:<24} {'지연':>8} (아직 사용 전)")
+    return "\n".join(lines)
+
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -1,37 +1,22 @@
 # qna_page.py
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 
-def render_qna_page(conn):
+def render_qna_page(qna_repo, notice_repo):
     st.title("✉️ 1:1 문의 게시판")
     st.markdown("---")
 
     # --- [공통] 공지사항 불러오기 섹션 ---
-    try:
-        notice_df = conn.read(worksheet="Notice", ttl=0)
-        if not notice_df.empty:
-            st.subheader("📢 공지사항")
-            for _, n_row in notice_df.sort_values(by="created_at", ascending=False).iterrows():
-                with st.expander(f"📌 {n_row['title']} ({n_row['created_at']})"):
-                    st.write(n_row['content'])
-            st.markdown("---")
-    except:
-        pass
-
-    # 기본 컬럼 정의
-    required_columns = ['username', 'question', 'answer', 'status', 'created_at', 'replied_at']
-
-    # QnA 데이터 불러오기
-    try:
-        df = conn.read(worksheet="QnA", ttl=0)
+    notice_df = notice_repo.list()
+    if not notice_df.empty:
+        st.subheader("📢 공지사항")
+        for _, n_row in notice_df.sort_values(by="created_at", ascending=False).iterrows():
+            with st.expander(f"📌 {n_row['title']} ({n_row['created_at']})"):
+                st.write(n_row['content'])
+        st.markdown("---")
 
-        # 만약 시트가 비어있거나 헤더가 없어서 데이터프레임이 제대로 안 만들어졌을 경우
-        if df.empty or 'username' not in df.columns:
-            df = pd.DataFrame(columns=required_columns)
-    except:
-        # 시트 자체를 못 읽어올 경우
-        df = pd.DataFrame(columns=required_columns)
+    # QnA 데이터 불러오기 (시트가 비어있거나 읽지 못하면 빈 게시판)
+    df = qna_repo.list()
 
     # 현재 접속 유저 정보
     curr_user = st.session_state.username
@@ -44,16 +29,15 @@ def render_qna_page(conn):
             user_question = st.text_area("문의하실 내용을 입력해주세요.")
             if st.form_submit_button("질문 등록"):
                 if user_question.strip():
-                    new_q = pd.DataFrame([{
+                    # 시트 끝에 질문 한 행만 추가
+                    qna_repo.append({
                         "username": curr_user,
                         "question": user_question,
                         "answer": "",
                         "status": "답변대기",
                         "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                         "replied_at": ""
-                    }])
-                    updated_df = pd.concat([df, new_q], ignore_index=True)
-                    conn.update(worksheet="QnA", data=updated_df)
+                    })
                     st.success("질문이 등록되었습니다. 관리자가 확인 후 답변드립니다.")
                     st.rerun()
                 else:
@@ -85,20 +69,19 @@ def render_qna_page(conn):
         if pending_qna.empty:
             st.success("새로운 문의가 없습니다!")
         else:
-            for idx, row in pending_qna.iterrows():
+            for _, row in pending_qna.iterrows():
+                row_id = row['id']
                 with st.container():
                     st.write(f"**작성자:** {row['username']} | **작성일:** {row['created_at']}")
                     st.write(f"**질문:** {row['question']}")
 
                     with st.expander("답변 달기"):
-                        admin_answer = st.text_area("답변 내용을 입력하세요", key=f"ans_{idx}")
-                        if st.button("답변 저장", key=f"btn_{idx}"):
+                        admin_answer = st.text_area("답변 내용을 입력하세요", key=f"ans_{row_id}")
+                        if st.button("답변 저장", key=f"btn_{row_id}"):
                             if admin_answer.strip():
-                                # 원본 데이터프레임 인덱스 찾아서 수정
-                                df.loc[idx, 'answer'] = admin_answer
-                                df.loc[idx, 'status'] = "답변완료"
-                                df.loc[idx, 'replied_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                conn.update(worksheet="QnA", data=df)
+                                # id 로 해당 질문 행의 답변 칸만 수정
+                                qna_repo.update(row_id, answer=admin_answer, status="답변완료",
+                                                replied_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
                                 st.success("답변이 등록되었습니다.")
                                 st.rerun()
                     st.markdown("---")
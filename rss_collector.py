@@ -1,10 +1,22 @@
 import feedparser
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from collections import OrderedDict
+import time
+import os
+import json
+import hashlib
+import threading
 import requests
 import re
+import unicodedata
+import io
+import xml.etree.ElementTree as ET
+import numpy as np
 import streamlit as st
 import toml
+from perf_metrics import timed
 
 # --- 뉴스 출처를 언론사별로 세분화하여 관리 ---
 SOURCES = {
@@ -26,94 +38,590 @@ SOURCES = {
 }
 
 # --- 1. 네이버 뉴스 검색 (국내) ---
-def fetch_naver_news(query="증시"):
-    # 2. 방어적 로직: secrets에서 안전하게 키 가져오기
+NAVER_API_URL = os.environ.get("NAVER_API_URL", "https://openapi.naver.com/v1/search/news.json")
+
+
+def _naver_credentials():
+    """secrets.toml 의 키를 우선 사용하고, 없으면 환경변수(NAVER_ID/NAVER_SECRET)에서 읽기"""
     try:
-        # st.secrets.get()을 사용하면 키가 없을 때 None을 반환하여 에러를 막을 수 있습니다.
-        NAVER_ID = st.secrets.get("NAVER_ID")
-        NAVER_SECRET = st.secrets.get("NAVER_SECRET")
+        naver_id, naver_secret = st.secrets.get("NAVER_ID"), st.secrets.get("NAVER_SECRET")
+    except Exception:
+        naver_id = naver_secret = None
+    return (naver_id or os.environ.get("NAVER_ID"),
+            naver_secret or os.environ.get("NAVER_SECRET"))
 
-        if not NAVER_ID or not NAVER_SECRET:
-            st.error("API 키가 설정되지 않았습니다. .streamlit/secrets.toml을 확인하세요.")
-            return pd.DataFrame()
 
-    except Exception as e:
-        st.error(f"Secrets 로드 중 오류: {e}")
+NAVER_TIMEOUT = 5            # 페이지 1개 요청의 최대 대기 시간(초)
+NAVER_MAX_DISPLAY = 100      # API 가 허용하는 한 페이지 최대 건수
+NAVER_MAX_START = 1000       # API 가 허용하는 start 최댓값
+NAVER_CACHE_TTL = 300        # 같은 검색어 결과를 재사용하는 시간(초)
+NAVER_CACHE_MAX = 256        # 보관할 검색 결과 수 (오래 안 쓰인 것부터 제거)
+REFINED_QUERY_SUFFIX = " +(증권|공시|주가|주식)"
+NAVER_ITEM_FIELDS = ['title', 'link', 'description', 'pubDate']   # 응답 item 에서 사용하는 필드
+
+_naver_cache = OrderedDict()   # (검색어, 건수) -> (저장 시각, DataFrame)
+_naver_cache_lock = threading.Lock()
+_naver_session = None
+_naver_session_lock = threading.Lock()
+# 여러 페이지를 동시에 받기 위한 전용 풀 (RSS 수집 풀과 분리)
+_naver_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="naver")
+
+
+def _get_naver_session():
+    """연결을 재사용하는 공용 Session (동시 페이지 요청 수만큼 커넥션 풀 확보)"""
+    global _naver_session
+    with _naver_session_lock:
+        if _naver_session is None:
+            session = requests.Session()
+            session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=10))
+            session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=10))
+            _naver_session = session
+        return _naver_session
+
+
+def _naver_cache_get(key):
+    with _naver_cache_lock:
+        entry = _naver_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= NAVER_CACHE_TTL:
+            del _naver_cache[key]
+            return None
+        _naver_cache.move_to_end(key)
+        return entry[1].copy()
+
+
+def _naver_cache_put(key, df):
+    with _naver_cache_lock:
+        _naver_cache[key] = (time.monotonic(), df)
+        _naver_cache.move_to_end(key)
+        while len(_naver_cache) > NAVER_CACHE_MAX:
+            _naver_cache.popitem(last=False)
+
+
+def _fetch_naver_page(headers, query, start, display):
+    with timed("naver_request"):
+        res = _get_naver_session().get(NAVER_API_URL, headers=headers, timeout=NAVER_TIMEOUT,
+                                       params={"query": query, "display": display, "start": start, "sort": "date"})
+    if res.status_code != 200:
+        raise requests.HTTPError(f"{res.status_code} - {res.text}")
+    return res.json().get('items', [])
+
+
+def fetch_naver_news(query="증시", max_results=15, refine=False, use_cache=True):
+    """
+    네이버 뉴스 검색 (최신순).
+    max_results: 가져올 건수. 100건을 넘으면 start 페이지들을 동시에 요청해서 합침 (API 한도: start 1000)
+    refine: True 이면 증권/공시/주가/주식 관련 기사로 좁혀서 검색
+    같은 검색어/건수는 NAVER_CACHE_TTL 동안 캐시된 결과를 반환합니다.
+    """
+    # 2. 방어적 로직: secrets(또는 환경변수)에서 안전하게 키 가져오기
+    NAVER_ID, NAVER_SECRET = _naver_credentials()
+    if not NAVER_ID or not NAVER_SECRET:
+        st.error("API 키가 설정되지 않았습니다. .streamlit/secrets.toml을 확인하세요.")
         return pd.DataFrame()
 
-    url = "https://openapi.naver.com/v1/search/news.json"
+    search_query = f"{query}{REFINED_QUERY_SUFFIX}" if refine else query
+    cache_key = (search_query, max_results)
+    if use_cache:
+        cached = _naver_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
     headers = {"X-Naver-Client-Id": NAVER_ID, "X-Naver-Client-Secret": NAVER_SECRET}
-    refined_query = f"{query} +(증권|공시|주가|주식)"
-    params = {"query": query, "display": 15, "sort": "date"}
+    display = max(1, min(max_results, NAVER_MAX_DISPLAY))
+    starts = [start for start in range(1, max_results + 1, display) if start <= NAVER_MAX_START]
+    # 모든 페이지를 동시에 요청 -> 전체 대기 시간이 대략 요청 1번 수준
+    futures = [_naver_executor.submit(_fetch_naver_page, headers, search_query, start, display) for start in starts]
+    pages, failed = [], 0
+    for start, fut in zip(starts, futures):
+        try:
+            pages.append(fut.result())
+        except Exception as e:
+            failed += 1
+            print(f"⚠️ Naver API 호출 실패 (start={start}): {e}")
+    if failed == len(starts):
+        return pd.DataFrame()
+    print(f"✅ Naver API 호출 성공: {search_query} ({len(starts) - failed}/{len(starts)} 페이지)")
+
+    items = [item for page in pages for item in page]
+    if not items:
+        return pd.DataFrame()
+    # 태그 제거와 날짜 변환을 컬럼 단위로 한 번에 처리 (응답에 빠진 필드는 빈 값으로, 링크 없는 항목은 제외)
+    raw = pd.DataFrame(items).reindex(columns=NAVER_ITEM_FIELDS)
+    raw[['title', 'link', 'description']] = raw[['title', 'link', 'description']].fillna("").astype(str)
+    raw = raw[raw['link'] != ""].drop_duplicates(subset='link').head(max_results)
+    if raw.empty:
+        return pd.DataFrame()
+    df = pd.DataFrame({
+        'title': raw['title'].str.replace('<[^<]+?>', '', regex=True),
+        'link': raw['link'],
+        'published': normalize_published(raw['pubDate'], "Naver"),
+        'summary': raw['description'].str.replace('<[^<]+?>', '', regex=True)
+    }).reset_index(drop=True)
+    # 일부 페이지가 실패한 결과는 캐시하지 않음 (다음 검색에서 다시 시도)
+    if not failed:
+        _naver_cache_put(cache_key, df)
+    return df.copy()
+
+# --- 2. RSS 수집 (병렬 + 타임아웃) ---
+FEED_TIMEOUT = 5          # 피드 1개당 최대 대기 시간(초)
+TOTAL_TIMEOUT = 10        # 시장 전체 수집의 최대 대기 시간(초)
+MAX_FEED_WORKERS = 8
+
+# 스크립트 재실행마다 스레드를 새로 띄우지 않도록 모듈 단위로 풀을 공유
+_feed_executor = ThreadPoolExecutor(max_workers=MAX_FEED_WORKERS, thread_name_prefix="rss")
+
+# --- 조건부 요청(ETag/Last-Modified) 캐시 ---
+# 피드별 검증자와 파싱된 기사 목록을 디스크에 보관하고, 304 응답이면 파싱을 건너뜁니다.
+FEED_CACHE_DIR = os.environ.get(
+    "FEED_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "feeds")
+)
+
+def _feed_cache_path(url):
+    return os.path.join(FEED_CACHE_DIR, hashlib.sha1(url.encode('utf-8')).hexdigest() + ".json")
+
+def _load_feed_cache(url):
     try:
-        res = requests.get(url, headers=headers, params=params)
-        if res.status_code == 200:
-            print(f"✅ Naver API 호출 성공: {query}")
-            items = res.json().get('items', [])
-            data = []
-            for item in items:
-                data.append({
-                    'title': re.sub('<[^<]+?>', '', item['title']),
-                    'link': item['link'],
-                    'published': datetime.strptime(item['pubDate'], '%a, %d %b %Y %H:%M:%S +0900'),
-                    'summary': re.sub('<[^<]+?>', '', item['description'])
-                })
-            return pd.DataFrame(data)
+        with open(_feed_cache_path(url), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_feed_cache(url, etag, last_modified, articles):
+    os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+    path = _feed_cache_path(url)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'saved_at': datetime.now().isoformat(),
+            'articles': articles
+        }, f, ensure_ascii=False)
+    # 여러 스레드가 동시에 써도 파일이 깨지지 않도록 교체 방식으로 저장
+    os.replace(tmp_path, path)
+
+FEED_CHUNK_SIZE = 64 * 1024
+
+def _download_feed(url, timeout, cached=None, deadline=None):
+    """
+    피드를 받아 (응답, 본문 bytes) 를 반환 (캐시가 있으면 조건부 요청).
+    requests 의 timeout 은 연결/읽기 1회 단위라서, 조금씩 계속 보내는 서버도 끊을 수 있도록
+    받는 동안 전체 제한 시각(deadline, 기본은 지금부터 timeout 초)을 직접 확인합니다.
+    """
+    limit = time.monotonic() + timeout
+    deadline = min(deadline, limit) if deadline is not None else limit
+    headers = {"User-Agent": "Mozilla/5.0 (ai_news_summary)"}
+    if cached:
+        if cached.get('etag'):
+            headers["If-None-Match"] = cached['etag']
+        if cached.get('last_modified'):
+            headers["If-Modified-Since"] = cached['last_modified']
+    with requests.get(url, timeout=timeout, headers=headers, stream=True) as res:
+        if res.status_code == 304:
+            return res, b""
+        res.raise_for_status()
+        chunks = []
+        while True:
+            if time.monotonic() > deadline:
+                raise requests.Timeout(f"{timeout}초 안에 다 받지 못함")
+            # read1: 도착한 만큼만 바로 반환 (64KB 가 다 찰 때까지 기다리지 않음)
+            chunk = res.raw.read1(FEED_CHUNK_SIZE, decode_content=True)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return res, b"".join(chunks)
+
+# --- 피드 파싱 ---
+# 우리가 받는 피드는 RSS 2.0 / Atom 뿐이라 필요한 필드만 스트리밍으로 뽑고,
+# 그 밖의 형식(RSS 1.0, 선언 안 된 엔티티, 지원 안 되는 인코딩 등)만 feedparser 로 넘깁니다.
+FAST_FEED_PARSER = os.environ.get("FAST_FEED_PARSER", "1") != "0"
+
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+_RSS_FIELDS = {'title': 'title', 'link': 'link', 'guid': 'guid', 'pubDate': 'published',
+               _DC_DATE: 'dc_date', 'description': 'summary'}
+_ATOM_FIELDS = {_ATOM_NS + 'title': 'title', _ATOM_NS + 'id': 'guid', _ATOM_NS + 'published': 'published',
+                _ATOM_NS + 'updated': 'updated', _ATOM_NS + 'summary': 'summary',
+                _ATOM_NS + 'content': 'content'}
+
+
+class _UnsupportedFeed(Exception):
+    pass
+
+
+def _stream_feed_articles(content):
+    """iterparse 로 RSS 2.0/Atom 의 item/entry 만 읽고, 읽은 요소는 바로 버려 메모리를 아낌"""
+    stack = []
+    item_tag = fields = None
+    articles = []
+    for event, elem in ET.iterparse(io.BytesIO(content), events=('start', 'end')):
+        if event == 'start':
+            if item_tag is None:
+                if elem.tag == 'rss':
+                    item_tag, fields = 'item', _RSS_FIELDS
+                elif elem.tag == _ATOM_NS + 'feed':
+                    item_tag, fields = _ATOM_NS + 'entry', _ATOM_FIELDS
+                else:
+                    raise _UnsupportedFeed(elem.tag)
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if elem.tag != item_tag:
+            continue
+        values = {}
+        for child in elem:
+            if child.tag == _ATOM_NS + 'link':
+                if child.get('rel', 'alternate') == 'alternate' and 'link' not in values:
+                    values['link'] = child.get('href')
+            elif child.tag in fields:
+                values[fields[child.tag]] = (child.text or "").strip()
+        guid = values.get('guid') or None
+        articles.append({
+            'title': values.get('title') or 'No Title',
+            'link': values.get('link') or guid or '#',
+            'published': values.get('published') or values.get('dc_date') or values.get('updated'),
+            'summary': values.get('summary') or values.get('content') or 'No Summary',
+            'guid': guid,
+        })
+        # 처리한 item 은 부모에서 떼어내 트리가 커지지 않게 함
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+    if item_tag is None:
+        raise _UnsupportedFeed("empty document")
+    return articles
+
+def _feedparser_articles(content):
+    feed = feedparser.parse(content)
+    articles = []
+    for entry in feed.entries:
+        published = getattr(entry, 'published', None) or getattr(entry, 'updated', None)
+        parsed = getattr(entry, 'published_parsed', None) or getattr(entry, 'updated_parsed', None)
+        if not published and parsed:
+            # 문자열이 없으면 feedparser 가 해석한 UTC 시각을 ISO 형식으로 보관
+            published = time.strftime('%Y-%m-%dT%H:%M:%SZ', parsed)
+        articles.append({
+            'title': getattr(entry, 'title', 'No Title'),
+            'link': getattr(entry, 'link', '#'),
+            'published': published,
+            'summary': getattr(entry, 'summary', 'No Summary'),
+            'guid': getattr(entry, 'id', None)
+        })
+    return articles
+
+_XML_ENCODING_RE = re.compile(rb'^\s*<\?xml[^>]*encoding=["\']([A-Za-z0-9._-]+)["\']')
+_STREAM_ENCODINGS = {"utf-8", "utf8", "us-ascii", "ascii"}
+
+def _parse_feed_articles(content, source=None):
+    declared = _XML_ENCODING_RE.match(content[:200])
+    # expat 은 EUC-KR 같은 멀티바이트 인코딩을 읽지 못하므로 선언된 인코딩이 UTF-8 이 아니면 바로 feedparser 로
+    streamable = declared is None or declared.group(1).decode('ascii').lower() in _STREAM_ENCODINGS
+    if FAST_FEED_PARSER and streamable:
+        try:
+            return _stream_feed_articles(content)
+        except (ET.ParseError, _UnsupportedFeed, ValueError, LookupError):
+            # ValueError/LookupError: expat 이 지원하지 않는 인코딩 (선언이 없거나 BOM 으로 지정된 경우)
+            pass
+    with timed("feedparser_fallback", source=source):
+        return _feedparser_articles(content)
+
+def _fetch_single_feed(name, url, timeout=FEED_TIMEOUT, deadline=None):
+    """피드 1개를 받아 기사 목록과 상태 정보를 반환 (deadline: 호출한 쪽의 전체 제한 시각, time.monotonic 기준)"""
+    started = time.monotonic()
+    status = {'status': 'ok', 'count': 0, 'elapsed': 0.0, 'error': None, 'not_modified': False}
+    articles = []
+    cached = _load_feed_cache(url)
+    try:
+        # feedparser.parse(url)은 타임아웃을 지원하지 않으므로 직접 받아서 넘긴다
+        with timed("feed_download", source=name):
+            res, content = _download_feed(url, timeout, cached, deadline)
+        if res.status_code == 304 and cached:
+            # 변경 없음: 다운로드/파싱 없이 저장된 기사 사용
+            articles = cached.get('articles', [])
+            status['not_modified'] = True
         else:
-            print(f"❌ Naver API 오류: {res.status_code} - {res.text}")
-            return pd.DataFrame()
+            with timed("feed_parse", source=name):
+                articles = _parse_feed_articles(content, source=name)
+            if articles and (res.headers.get('ETag') or res.headers.get('Last-Modified')):
+                _save_feed_cache(url, res.headers.get('ETag'), res.headers.get('Last-Modified'), articles)
+        if not articles:
+            status['status'] = 'empty'
+    except requests.Timeout:
+        status.update(status='timeout', error=f"{timeout}초 초과")
     except Exception as e:
-        print(f"⚠️ Naver API 연결 실패: {e}")
-        return pd.DataFrame()
+        status.update(status='error', error=str(e))
+
+    status['count'] = len(articles)
+    status['elapsed'] = round(time.monotonic() - started, 3)
+    return articles, status
+
+# --- 발행 시각 정규화 ---
+# 언론사마다 published 형식/시간대가 달라서, 알려진 형식으로 한 번에(벡터) 파싱한 뒤
+# 전부 KST tz-aware 값으로 맞춥니다. 형식이 안 맞는 값만 ISO8601 -> feedparser 날짜 파서 순서로 재시도합니다.
+KST_TZ = "Asia/Seoul"
+RFC822_FORMAT = "%a, %d %b %Y %H:%M:%S %z"
+SOURCE_DATE_FORMATS = {
+    "한국경제": RFC822_FORMAT,
+    "매일경제": RFC822_FORMAT,
+    "연합뉴스": RFC822_FORMAT,
+    "이데일리": RFC822_FORMAT,
+    "뉴스핌": "%Y-%m-%d %H:%M:%S",
+    "인포맥스": "%Y-%m-%d %H:%M:%S",
+    "CNBC(속보)": "%a, %d %b %Y %H:%M:%S GMT",
+    "Yahoo(시장)": "ISO8601",
+    "Investing": "%Y-%m-%d %H:%M:%S",
+    "한경국제": RFC822_FORMAT,
+    "매경글로벌": RFC822_FORMAT,
+    "Naver": RFC822_FORMAT,
+}
+# 오프셋 없이 오는 시각의 기준 시간대 (기본은 KST)
+SOURCE_NAIVE_TZ = {
+    "Investing": "UTC",
+}
+_HAS_OFFSET = r"(?:Z|[+-]\d{2}:?\d{2}|GMT|UTC)$"
+
+def _parse_dates(values, fmt, naive_tz):
+    """문자열 Series 를 fmt 로 파싱해 KST Series 로 (실패는 NaT). 오프셋 없는 값은 naive_tz 로 간주"""
+    has_offset = values.str.contains(_HAS_OFFSET, regex=True)
+    aware = pd.to_datetime(values[has_offset], format=fmt, utc=True, errors='coerce')
+    naive = pd.to_datetime(values[~has_offset], format=fmt, errors='coerce')
+    if naive.dt.tz is None:
+        naive = naive.dt.tz_localize(naive_tz, ambiguous='NaT', nonexistent='NaT')
+    parts = [p.dt.tz_convert(KST_TZ) for p in (aware, naive) if len(p)]
+    return pd.concat(parts).reindex(values.index)
+
+# feedparser 의 날짜 파서는 공개 API 가 아니라 버전에 따라 없어질 수 있으므로, 없거나 실패하면 pandas 로 재시도
+try:
+    from feedparser.datetimes import _parse_date as _feedparser_parse_date
+except ImportError:
+    _feedparser_parse_date = None
+
+def _parse_date_fallback(value):
+    """feedparser 의 날짜 파서(published_parsed 와 같은 해석, UTC)로 한 건씩 재시도하고, 안 되면 pandas 로 재시도"""
+    parsed = None
+    if _feedparser_parse_date is not None:
+        try:
+            parsed = _feedparser_parse_date(value)
+        except Exception:
+            parsed = None
+    if parsed:
+        return pd.Timestamp(datetime(*parsed[:6]), tz="UTC")
+    try:
+        # 시간대 표기가 없으면 feedparser 와 같이 UTC 로 간주
+        return pd.to_datetime(value, utc=True)
+    except (ValueError, TypeError, OverflowError):
+        return pd.NaT
 
-def fetch_rss_feeds(market_type="KOREA", source_name=None):
+def normalize_published(raw, source=None):
+    """발행 시각 문자열 Series -> KST tz-aware Series (읽을 수 없는 값은 NaT)"""
+    values = raw.astype(object).where(raw.notna(), None).map(lambda v: str(v).strip() if v is not None else None)
+    # 'KST' 표기는 파서들이 모르는 약어라 오프셋으로 바꿔 둠
+    values = values.str.replace(r"\s*KST$", " +0900", regex=True)
+    result = pd.Series(pd.NaT, index=values.index, dtype=f"datetime64[us, {KST_TZ}]")
+    pending = values.notna() & (values != "")
+    naive_tz = SOURCE_NAIVE_TZ.get(source, KST_TZ)
+    for fmt in dict.fromkeys(filter(None, [SOURCE_DATE_FORMATS.get(source), "ISO8601"])):
+        if not pending.any():
+            break
+        result[pending] = _parse_dates(values[pending].astype(str), fmt, naive_tz)
+        pending &= result.isna()
+    if pending.any():
+        fallback = pd.to_datetime(values[pending].map(_parse_date_fallback), utc=True)
+        result[pending] = fallback.dt.tz_convert(KST_TZ)
+    return result
+
+def normalize_published_by_source(df):
+    """source 컬럼별로 형식을 골라 published 를 KST tz-aware 로 변환"""
+    if 'source' not in df.columns:
+        return normalize_published(df['published'])
+    # source 가 비어 있는 행(NaN)도 버리지 않고 기본 형식으로 파싱
+    parts = [normalize_published(group, source if pd.notna(source) else None)
+             for source, group in df.groupby('source', sort=False, dropna=False)['published']]
+    return pd.concat(parts).reindex(df.index) if parts else normalize_published(df['published'])
+
+def _build_articles_df(all_articles, label=None):
+    if not all_articles:
+        return pd.DataFrame(columns=['title', 'link', 'published', 'summary', 'source'])
+
+    with timed("dataframe_build", source=label):
+        df = pd.DataFrame(all_articles)
+    # 언론사별 형식으로 파싱해 KST 로 통일 (정렬/기간 필터가 시간대와 무관하게 맞도록)
+    with timed("to_datetime", source=label):
+        df['published'] = normalize_published_by_source(df)
+    # 최신순 정렬
+    df = df.sort_values(by='published', ascending=False, na_position='last', kind='stable').reset_index(drop=True)
+    return df
+
+def fetch_rss_feeds_with_status(market_type="KOREA", source_name=None,
+                                feed_timeout=FEED_TIMEOUT, total_timeout=TOTAL_TIMEOUT, dedup=False):
     """
-    market_type: "KOREA" 또는 "USA"
-    source_name: 특정 언론사 선택 (None일 경우 해당 시장 전체 수집)
+    여러 피드를 병렬로 받아서 (DataFrame, 언론사별 상태) 를 반환합니다.
+    total_timeout 안에 끝난 피드만 결과에 포함되고, 나머지는 status='timeout' 으로 표시됩니다.
+    상태 예: {"한국경제": {"status": "ok", "count": 50, "elapsed": 0.42, "error": None}}
+    dedup=True 이면 언론사 간 중복 기사를 묶어 대표 기사만 남깁니다.
     """
     market_data = SOURCES.get(market_type, SOURCES["KOREA"])
 
     if source_name:
-        rss_urls = [market_data.get(source_name)]
+        targets = [(source_name, market_data.get(source_name))]
     else:
-        rss_urls = list(market_data.values())
+        targets = list(market_data.items())
+    targets = [(name, url) for name, url in targets if url]
+
+    # 전체 제한을 넘긴 피드는 결과에서 빠질 뿐 아니라 다운로드도 그 시각에 멈춤 (워커를 붙잡지 않도록)
+    deadline = time.monotonic() + total_timeout
+    futures = {_feed_executor.submit(_fetch_single_feed, name, url, feed_timeout, deadline): name
+               for name, url in targets}
+    done, not_done = wait(futures, timeout=total_timeout)
 
     all_articles = []
+    status = {}
+    # SOURCES 순서를 유지하기 위해 targets 순서대로 결과를 모은다
+    by_name = {name: fut for fut, name in futures.items()}
+    for name, _ in targets:
+        fut = by_name[name]
+        if fut in done:
+            articles, status[name] = fut.result()
+            all_articles.extend(dict(a, source=name) for a in articles)
+        else:
+            # 늦은 피드는 버린다 (스레드는 deadline 에 스스로 종료)
+            fut.cancel()
+            status[name] = {'status': 'timeout', 'count': 0, 'elapsed': total_timeout,
+                            'error': f"전체 제한 {total_timeout}초 초과", 'not_modified': False}
 
-    for url in rss_urls:
-        if not url: continue
-        feed = feedparser.parse(url)
-        if not feed.entries:
-            continue
+    df = _build_articles_df(all_articles, label=source_name or market_type)
+    if dedup:
+        df = dedupe_articles(df)
+    return df, status
 
-        try:
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                dt = datetime(*entry.published_parsed[:6])
-                published = dt + timedelta(hours=9)
-            else:
-                published = datetime.now()
-        except Exception:
-            published = datetime.now()
+def fetch_rss_feeds(market_type="KOREA", source_name=None, dedup=False):
+    """
+    market_type: "KOREA" 또는 "USA"
+    source_name: 특정 언론사 선택 (None일 경우 해당 시장 전체 수집)
+    dedup: True 이면 중복 기사(같은 통신 기사 등)를 대표 기사 1건으로 축약
+    """
+    df, status = fetch_rss_feeds_with_status(market_type, source_name, dedup=dedup)
+    for name, info in status.items():
+        if info['status'] != 'ok':
+            print(f"⚠️ RSS 수집 실패 [{name}]: {info['status']} {info['error'] or ''}")
+    return df
 
-        for entry in feed.entries:
-            title = getattr(entry, 'title', 'No Title')
-            link = getattr(entry, 'link', '#')
-            published_str = getattr(entry, 'published', None)
-            summary = getattr(entry, 'summary', 'No Summary')
+def fetch_new_articles(market_type, source_name, watermark=None, feed_timeout=FEED_TIMEOUT, include_seen=False):
+    """
+    언론사 1곳을 받아 watermark 이후 처음 보는 기사만 (DataFrame, 상태) 로 반환합니다.
+    이미 본 기사(guid/link)는 DataFrame 변환과 날짜 파싱 전에 빼므로 작업량은 새 기사 수에 비례합니다.
+    watermark: is_seen(article), cutoff() 를 가진 객체 (source_watermark.SourceWatermark). None 이면 전부 새 기사
+    include_seen: True 이면 피드가 바뀐 경우(304 가 아닌 응답) 이미 본 기사도 함께 반환하고 is_new 컬럼으로 구분
+                  (제목/요약이 고쳐진 기사를 저장소에 반영하는 용도)
+    상태에는 'new'(새 기사 수)가 추가됩니다.
+    """
+    url = SOURCES.get(market_type, {}).get(source_name)
+    if not url:
+        return _build_articles_df([]), {'status': 'error', 'count': 0, 'elapsed': 0.0, 'new': 0,
+                                        'error': '알 수 없는 언론사', 'not_modified': False}
+    articles, status = _fetch_single_feed(source_name, url, feed_timeout)
+    keep_seen = include_seen and not status['not_modified']
+    if watermark is not None:
+        is_new = [not watermark.is_seen(a) for a in articles]
+        if not keep_seen:
+            articles = [a for a, new in zip(articles, is_new) if new]
+            is_new = [True] * len(articles)
+    else:
+        is_new = [True] * len(articles)
+    df = _build_articles_df([dict(a, source=source_name, is_new=new) for a, new in zip(articles, is_new)],
+                            label=source_name)
+    cutoff = watermark.cutoff() if watermark is not None else None
+    if cutoff is not None and not df.empty:
+        # 기억에서 밀려난 오래된 기사가 피드에 다시 보이는 경우는 새 기사로 치지 않음
+        too_old = df['published'].notna() & (df['published'] < cutoff)
+        df = (df.assign(is_new=df['is_new'] & ~too_old) if keep_seen else df[~too_old]).reset_index(drop=True)
+    status['new'] = int(df['is_new'].sum()) if not df.empty else 0
+    if not keep_seen and 'is_new' in df.columns:
+        df = df.drop(columns='is_new')
+    return df, status
 
-            all_articles.append({
-                'title': title,
-                'link': link,
-                'published': published_str,
-                'summary': summary
-            })
+# --- 3. 언론사 간 중복 기사 묶기 (SimHash) ---
+# 같은 통신 기사가 연합뉴스/한국경제/매일경제/이데일리에 함께 실리는 경우를 하나로 묶습니다.
+SIMHASH_MAX_DISTANCE = 6   # 64비트 중 이 개수 이하로 다르면 같은 기사로 판단
+_SIMHASH_BANDS = 8         # 8비트 x 8밴드: 거리 7 이하인 쌍은 반드시 한 밴드 이상 일치
 
-    if not all_articles:
-        return pd.DataFrame(columns=['title', 'link', 'published', 'summary'])
+_BRACKET_RE = re.compile(r'\[[^\]]*\]|\([^)]*기자[^)]*\)')
+_NON_WORD_RE = re.compile(r'[\W_]+')
 
-    df = pd.DataFrame(all_articles)
-    # 날짜 정렬을 위해 datetime 형식 확정
-    df['published'] = pd.to_datetime(df['published'])
-    # 최신순 정렬
-    df = df.sort_values(by='published', ascending=False).reset_index(drop=True)
-    return df
\ No newline at end of file
+def _normalize_for_dedup(title, summary):
+    text = f"{title} {summary}"
+    text = re.sub('<[^<]+?>', ' ', text)
+    text = unicodedata.normalize("NFKC", text).lower()
+    # [속보], [단독], (홍길동 기자) 같은 머리말과 공백/문장부호 제거
+    text = _BRACKET_RE.sub(' ', text)
+    return _NON_WORD_RE.sub('', text)
+
+def simhash(text, shingle=3):
+    """글자 3-gram 기반 64비트 SimHash"""
+    if len(text) < shingle:
+        text = text.ljust(shingle)
+    grams = {text[i:i + shingle] for i in range(len(text) - shingle + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(), 'little') for g in grams),
+        dtype=np.uint64, count=len(grams)
+    )
+    # 각 비트 위치에서 1 이 과반이면 1
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    votes = bits.sum(axis=0) * 2 > len(grams)
+    return int(np.packbits(votes, bitorder='little').view(np.uint64)[0])
+
+def cluster_near_duplicates(df, max_distance=SIMHASH_MAX_DISTANCE):
+    """
+    제목+요약의 SimHash 가 가까운 기사끼리 묶어 cluster_id, cluster_size, is_canonical 컬럼을 추가합니다.
+    대표 기사는 가장 먼저 게시된 기사(같으면 요약이 긴 기사)입니다.
+    """
+    df = df.reset_index(drop=True).copy()
+    n = len(df)
+    if n == 0:
+        return df.assign(cluster_id=pd.Series(dtype=int), cluster_size=pd.Series(dtype=int),
+                         is_canonical=pd.Series(dtype=bool))
+
+    if not pd.api.types.is_datetime64_any_dtype(df['published']):
+        # 문자열 그대로 들어온 경우 언론사별 형식으로 파싱해야 대표 기사(가장 먼저 게시) 비교가 맞음
+        df['published'] = normalize_published_by_source(df)
+
+    hashes = [simhash(_normalize_for_dedup(t, s)) for t, s in zip(df['title'], df['summary'])]
+
+    parent = list(range(n))
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # 밴드가 같은 기사만 후보로 비교 (전체 쌍 비교 대신)
+    band_bits = 64 // _SIMHASH_BANDS
+    mask = (1 << band_bits) - 1
+    for band in range(_SIMHASH_BANDS):
+        buckets = {}
+        for i, h in enumerate(hashes):
+            buckets.setdefault((h >> (band * band_bits)) & mask, []).append(i)
+        for members in buckets.values():
+            for a_pos, a in enumerate(members):
+                for b in members[a_pos + 1:]:
+                    if find(a) != find(b) and bin(hashes[a] ^ hashes[b]).count('1') <= max_distance:
+                        parent[find(b)] = find(a)
+
+    df['cluster_id'] = [find(i) for i in range(n)]
+    df['cluster_size'] = df.groupby('cluster_id')['cluster_id'].transform('size')
+
+    order = df.assign(_summary_len=df['summary'].astype(str).str.len()).sort_values(
+        ['published', '_summary_len'], ascending=[True, False], na_position='last')
+    canonical_idx = order.drop_duplicates('cluster_id').index
+    df['is_canonical'] = df.index.isin(canonical_idx)
+    return df
+
+def dedupe_articles(df, max_distance=SIMHASH_MAX_DISTANCE):
+    """중복 묶음마다 대표 기사 1건만 남긴 DataFrame (cluster_size 로 묶인 기사 수 표시)"""
+    clustered = cluster_near_duplicates(df, max_distance)
+    return clustered[clustered['is_canonical']].drop(columns=['is_canonical']).reset_index(drop=True)
@@ -0,0 +1,165 @@
+# search_index.py
+# 수집된 기사 전체에 대한 오프라인 검색 인덱스 (database_manager 와 같은 SQLite 파일 사용)
+# - 한글은 띄어쓰기/조사 때문에 단어 단위 검색이 잘 안 맞으므로 글자 2-gram 으로 색인
+# - 영문/숫자는 단어 단위로 색인
+# - BM25 점수로 정렬, 날짜/언론사 필터 지원
+import re
+import math
+import unicodedata
+from collections import Counter
+import pandas as pd
+import database_manager
+from database_manager import get_connection, _rows_to_df, _to_kst_text, ARTICLE_COLUMNS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_postings (
+    gram       TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    tf         INTEGER NOT NULL,
+    PRIMARY KEY (gram, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_search_postings_article ON search_postings(article_id);
+
+CREATE TABLE IF NOT EXISTS search_docs (
+    article_id INTEGER PRIMARY KEY,
+    length     INTEGER NOT NULL
+);
+
+-- 제목/요약이 바뀐 기사는 색인에서 빼서 다음 index_pending() 때 다시 색인
+CREATE TRIGGER IF NOT EXISTS trg_articles_reindex AFTER UPDATE OF title, summary ON articles
+BEGIN
+    DELETE FROM search_postings WHERE article_id = NEW.id;
+    DELETE FROM search_docs WHERE article_id = NEW.id;
+END;
+"""
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SEARCH_ALL_TERMS_UPTO = 3      # 토큰이 이 개수 이하인 짧은 검색어는 모든 토큰이 들어 있어야 일치
+SEARCH_MIN_MATCH_RATIO = 0.6   # 긴 검색어는 토큰의 이 비율 이상이 들어 있어야 일치
+
+_TAG_RE = re.compile(r'<[^<]+?>')
+_TOKEN_RE = re.compile(r'[0-9a-z]+|[^\W\d_a-z]+')
+
+_schema_ready = set()
+
+def _ensure_schema(conn):
+    if database_manager.DB_PATH not in _schema_ready:
+        conn.executescript(_SCHEMA)
+        _schema_ready.add(database_manager.DB_PATH)
+
+def tokenize(text):
+    """검색용 토큰 목록: 영문/숫자는 단어, 그 외(한글 등)는 글자 2-gram"""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKC", _TAG_RE.sub(' ', str(text))).lower()
+    grams = []
+    for word in _TOKEN_RE.findall(text):
+        if word.isascii() or len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+def min_match_for(n_terms):
+    """검색어 토큰 수 기준으로, 기사에 최소 몇 개가 들어 있어야 결과로 보여줄지"""
+    if n_terms <= SEARCH_ALL_TERMS_UPTO:
+        return n_terms
+    return math.ceil(n_terms * SEARCH_MIN_MATCH_RATIO)
+
+def index_pending(batch_size=1000):
+    """아직 색인되지 않은 기사를 색인하고 처리 건수를 반환"""
+    conn = get_connection()
+    _ensure_schema(conn)
+    total = 0
+    while True:
+        rows = conn.execute("""
+            SELECT a.id, a.title, a.summary FROM articles a
+            LEFT JOIN search_docs d ON d.article_id = a.id
+            WHERE d.article_id IS NULL
+            LIMIT ?
+        """, (batch_size,)).fetchall()
+        if not rows:
+            return total
+
+        postings, docs = [], []
+        for row in rows:
+            # 제목은 요약보다 중요하므로 두 번 넣어 가중치를 준다
+            grams = tokenize(row['title']) * 2 + tokenize(row['summary'])
+            counts = Counter(grams)
+            postings.extend((gram, row['id'], tf) for gram, tf in counts.items())
+            docs.append((row['id'], max(len(grams), 1)))
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO search_postings (gram, article_id, tf) VALUES (?, ?, ?)", postings)
+            conn.executemany("INSERT OR REPLACE INTO search_docs (article_id, length) VALUES (?, ?)", docs)
+        total += len(rows)
+
+def rebuild_index():
+    conn = get_connection()
+    _ensure_schema(conn)
+    with conn:
+        conn.execute("DELETE FROM search_postings")
+        conn.execute("DELETE FROM search_docs")
+    return index_pending()
+
+def search_articles(query, sources=None, since=None, until=None, limit=100):
+    """
+    로컬 기사 검색. 네트워크를 사용하지 않습니다.
+    sources: 언론사 이름 리스트 (None 이면 전체)
+    since / until: 게시일 범위 (date/datetime/문자열)
+    반환: 점수순 DataFrame (score 컬럼 포함)
+    """
+    empty = pd.DataFrame(columns=ARTICLE_COLUMNS + ['score'])
+    query_grams = set(tokenize(query))
+    if not query_grams:
+        return empty
+
+    conn = get_connection()
+    _ensure_schema(conn)
+    stats = conn.execute("SELECT COUNT(*) AS n, AVG(length) AS avg_len FROM search_docs").fetchone()
+    n_docs, avg_len = stats['n'], stats['avg_len'] or 1.0
+    if not n_docs:
+        return empty
+
+    gram_list = sorted(query_grams)
+    marks = ",".join("?" * len(gram_list))
+    doc_freq = {r['gram']: r['df'] for r in conn.execute(
+        f"SELECT gram, COUNT(*) AS df FROM search_postings WHERE gram IN ({marks}) GROUP BY gram", gram_list)}
+    # 최소 일치 수는 색인에 있는 토큰이 아니라 검색어 자체의 토큰 수 기준
+    # (색인에 없는 토큰이 많은 긴 검색어가 느슨하게 일치하지 않도록)
+    min_match = min_match_for(len(query_grams))
+    if len(doc_freq) < min_match:
+        return empty
+    idf = {g: math.log(1 + (n_docs - df + 0.5) / (df + 0.5)) for g, df in doc_freq.items()}
+
+    where, params = [f"p.gram IN ({marks})"], list(gram_list)
+    if sources:
+        where.append(f"a.source IN ({','.join('?' * len(sources))})")
+        params.extend(sources)
+    if since is not None:
+        where.append("a.published >= ?")
+        params.append(_to_kst_text(since))
+    if until is not None:
+        where.append("a.published < ?")
+        params.append(_to_kst_text(until))
+
+    scores, matched = Counter(), Counter()
+    for r in conn.execute(f"""
+        SELECT p.article_id, p.gram, p.tf, d.length FROM search_postings p
+        JOIN search_docs d ON d.article_id = p.article_id
+        JOIN articles a ON a.id = p.article_id
+        WHERE {' AND '.join(where)}
+    """, params):
+        tf, norm = r['tf'], 1 - BM25_B + BM25_B * r['length'] / avg_len
+        scores[r['article_id']] += idf[r['gram']] * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        matched[r['article_id']] += 1
+
+    ranked = [(aid, s) for aid, s in scores.most_common() if matched[aid] >= min_match][:limit]
+    if not ranked:
+        return empty
+
+    ids = [aid for aid, _ in ranked]
+    rows = conn.execute(f"SELECT * FROM articles WHERE id IN ({','.join('?' * len(ids))})", ids).fetchall()
+    df = _rows_to_df(rows).set_index('id').loc[ids].reset_index()
+    df['score'] = [round(s, 3) for _, s in ranked]
+    return df
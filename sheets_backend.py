@@ -0,0 +1,203 @@
+# sheets_backend.py
+# 구글 시트 저장소 접근 계층
+# - GSheetsBackend: st.connection("gsheets") 위에서 행 단위 추가/수정/삭제 (서비스 계정일 때 gspread 공개 API 사용)
+# - LocalSheetBackend: 오프라인/테스트용 스탠드인 (메모리 또는 CSV 폴더)
+# - SHEETS_BACKEND=local 환경변수를 주면 앱 전체가 로컬 스탠드인을 사용합니다.
+import os
+import threading
+import pandas as pd
+import streamlit as st
+from perf_metrics import timed
+
+
+def _cell(value):
+    """시트에 쓸 수 있는 값으로 변환 (NaN/None -> 빈 문자열)"""
+    if value is None:
+        return ""
+    try:
+        if pd.isna(value):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    return value if isinstance(value, (int, float, bool)) else str(value)
+
+
+class LocalSheetBackend:
+    """워크시트를 DataFrame 으로 보관하는 로컬 스탠드인. data_dir 을 주면 <worksheet>.csv 로 저장"""
+
+    def __init__(self, data_dir=None, tables=None):
+        self.data_dir = data_dir
+        self._tables = {name: df.copy() for name, df in (tables or {}).items()}
+        self._lock = threading.Lock()
+
+    def _path(self, worksheet):
+        return os.path.join(self.data_dir, f"{worksheet}.csv")
+
+    def _load(self, worksheet):
+        if worksheet not in self._tables:
+            if self.data_dir and os.path.exists(self._path(worksheet)):
+                self._tables[worksheet] = pd.read_csv(self._path(worksheet), dtype=str, keep_default_na=False)
+            else:
+                self._tables[worksheet] = pd.DataFrame()
+        return self._tables[worksheet]
+
+    def _save(self, worksheet, df):
+        self._tables[worksheet] = df.reset_index(drop=True)
+        if self.data_dir:
+            os.makedirs(self.data_dir, exist_ok=True)
+            self._tables[worksheet].to_csv(self._path(worksheet), index=False)
+
+    def read(self, worksheet):
+        with self._lock:
+            return self._load(worksheet).copy()
+
+    def write_all(self, worksheet, df):
+        with self._lock:
+            self._save(worksheet, df.copy())
+
+    def append_rows(self, worksheet, rows):
+        with self._lock:
+            df = self._load(worksheet)
+            self._save(worksheet, pd.concat([df, pd.DataFrame(rows)], ignore_index=True))
+
+    def update_row(self, worksheet, key_col, key, values):
+        with self._lock:
+            df = self._load(worksheet).copy()
+            mask = df[key_col].astype(str) == str(key) if key_col in df.columns else pd.Series(False, index=df.index)
+            if not mask.any():
+                raise KeyError(f"{worksheet}: {key_col}={key} 행이 없습니다.")
+            for col, value in values.items():
+                if col not in df.columns:
+                    df[col] = ""
+                df[col] = df[col].astype(object)
+                df.loc[mask, col] = value
+            self._save(worksheet, df)
+
+    def delete_row(self, worksheet, key_col, key):
+        with self._lock:
+            df = self._load(worksheet)
+            if key_col in df.columns:
+                self._save(worksheet, df[df[key_col].astype(str) != str(key)])
+
+
+class GSheetsBackend:
+    """
+    st.connection 기반 구글 시트 접근.
+    서비스 계정 연결이면 gspread 워크시트로 행 단위 작업을 하고,
+    그렇지 않으면(공개 시트 등) 전체 읽기/쓰기로 대신합니다.
+    """
+
+    def __init__(self, conn, secrets=None):
+        self.conn = conn
+        self.secrets = secrets      # 기본은 secrets.toml 의 [connections.gsheets]
+        self._spreadsheet = None    # gspread 스프레드시트 (서비스 계정이 아니면 False)
+        self._worksheets = {}
+        self._headers = {}
+        self._lock = threading.Lock()
+
+    # --- 내부 유틸 ---
+    def _open_spreadsheet(self):
+        """서비스 계정 설정이면 gspread 로 스프레드시트를 한 번 열어 재사용 (아니면 None)"""
+        if self._spreadsheet is None:
+            secrets = dict(self.secrets if self.secrets is not None
+                           else st.secrets.get("connections", {}).get("gsheets", {}))
+            if secrets.get("type") != "service_account":
+                self._spreadsheet = False
+            else:
+                import gspread
+                spreadsheet = secrets.pop("spreadsheet", None)
+                secrets.pop("worksheet", None)
+                client = gspread.service_account_from_dict(secrets)
+                if str(spreadsheet).startswith(("http://", "https://")):
+                    self._spreadsheet = client.open_by_url(spreadsheet)
+                else:
+                    self._spreadsheet = client.open(spreadsheet)
+        return self._spreadsheet or None
+
+    def _worksheet(self, worksheet):
+        """행 단위 작업에 쓸 gspread 워크시트. 서비스 계정이 아니면 None (전체 읽기/쓰기로 대신)"""
+        with self._lock:
+            ws = self._worksheets.get(worksheet)
+            if ws is None:
+                spreadsheet = self._open_spreadsheet()
+                if spreadsheet is None:
+                    return None
+                ws = self._worksheets[worksheet] = spreadsheet.worksheet(worksheet)
+            return ws
+
+    def _header(self, ws, worksheet, needed=()):
+        """헤더(1행)를 캐시해서 쓰고, 없는 컬럼이 필요하면 헤더 끝에 추가"""
+        header = self._headers.get(worksheet)
+        if header is None:
+            header = ws.row_values(1)
+            self._headers[worksheet] = header
+        missing = [c for c in needed if c not in header]
+        for col in missing:
+            ws.update_cell(1, len(header) + 1, col)
+            header.append(col)
+        return header
+
+    def _find_row(self, ws, header, key_col, key):
+        cell = ws.find(str(key), in_column=header.index(key_col) + 1)
+        if cell is None:
+            raise KeyError(f"{key_col}={key} 행이 없습니다.")
+        return cell.row
+
+    # --- 공개 API ---
+    def read(self, worksheet):
+        with timed("sheets_read", source=worksheet):
+            return self.conn.read(worksheet=worksheet, ttl=0)
+
+    def write_all(self, worksheet, df):
+        with timed("sheets_write_all", source=worksheet):
+            self.conn.update(worksheet=worksheet, data=df)
+        self._headers.pop(worksheet, None)
+
+    def append_rows(self, worksheet, rows):
+        ws = self._worksheet(worksheet)
+        if ws is None:
+            df = self.read(worksheet)
+            return self.write_all(worksheet, pd.concat([df, pd.DataFrame(rows)], ignore_index=True))
+        with self._lock:
+            header = self._header(ws, worksheet, needed=[c for r in rows for c in r])
+            # 시트 끝에 행만 추가 (기존 행은 건드리지 않음)
+            with timed("sheets_append", source=worksheet):
+                ws.append_rows([[_cell(r.get(col)) for col in header] for r in rows], value_input_option="RAW")
+
+    def update_row(self, worksheet, key_col, key, values):
+        ws = self._worksheet(worksheet)
+        if ws is None:
+            df = self.read(worksheet)
+            mask = df[key_col].astype(str) == str(key)
+            if not mask.any():
+                raise KeyError(f"{key_col}={key} 행이 없습니다.")
+            for col, value in values.items():
+                df.loc[mask, col] = value
+            return self.write_all(worksheet, df)
+
+        from gspread.utils import rowcol_to_a1
+        with self._lock:
+            header = self._header(ws, worksheet, needed=[key_col, *values])
+            with timed("sheets_update_row", source=worksheet):
+                row = self._find_row(ws, header, key_col, key)
+                ws.batch_update([
+                    {'range': rowcol_to_a1(row, header.index(col) + 1), 'values': [[_cell(value)]]}
+                    for col, value in values.items()
+                ], value_input_option="RAW")
+
+    def delete_row(self, worksheet, key_col, key):
+        ws = self._worksheet(worksheet)
+        if ws is None:
+            df = self.read(worksheet)
+            return self.write_all(worksheet, df[df[key_col].astype(str) != str(key)])
+        with self._lock:
+            header = self._header(ws, worksheet, needed=[key_col])
+            with timed("sheets_delete_row", source=worksheet):
+                ws.delete_rows(self._find_row(ws, header, key_col, key))
+
+
+def get_sheets_backend(conn=None):
+    """환경에 맞는 시트 백엔드 반환 (SHEETS_BACKEND=local 이면 로컬 스탠드인)"""
+    if os.environ.get("SHEETS_BACKEND") == "local" or conn is None:
+        return LocalSheetBackend(os.environ.get("LOCAL_SHEETS_DIR"))
+    return GSheetsBackend(conn)
@@ -0,0 +1,96 @@
+# source_watermark.py
+# 언론사별 수집 기준점(high-water mark)
+# - 이미 본 기사 키(guid, link)와 가장 최근 발행 시각을 언론사마다 SQLite 에 보관
+# - 폴링마다 처음 보는 기사만 골라내 델타로 넘기는 데 사용 (저장/검색 색인/화면은 델타만 처리)
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import pandas as pd
+from database_manager import get_connection, get_latest_articles
+import database_manager
+
+WATERMARK_MAX_KEYS = 1000            # 언론사별로 기억하는 최근 기사 키 수 (피드 1회분보다 넉넉하게)
+WATERMARK_GRACE = timedelta(hours=6)  # 기준 시각보다 이만큼 이전 발행분까지는 늦게 올라온 새 기사로 인정
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_watermarks (
+    market     TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    published  TEXT,               -- 지금까지 본 가장 최근 발행 시각 (KST)
+    seen_keys  TEXT NOT NULL,      -- 최근 본 기사 키 JSON 배열 (오래된 것부터)
+    updated_at TEXT,
+    PRIMARY KEY (market, source)
+);
+"""
+
+_schema_ready = set()
+
+def _conn():
+    conn = get_connection()
+    if database_manager.DB_PATH not in _schema_ready:
+        conn.executescript(_SCHEMA)
+        _schema_ready.add(database_manager.DB_PATH)
+    return conn
+
+
+class SourceWatermark:
+    def __init__(self, market, source, published=None, keys=()):
+        self.market = market
+        self.source = source
+        self.published = published
+        self._keys = OrderedDict.fromkeys(keys)
+
+    def is_seen(self, article):
+        """guid 나 link 중 하나라도 이미 본 키면 True"""
+        return any(article.get(field) in self._keys for field in ('guid', 'link') if article.get(field))
+
+    def cutoff(self):
+        """이 시각보다 이전 발행 기사는 (키를 잊었더라도) 새 기사로 보지 않음"""
+        return None if self.published is None else self.published - WATERMARK_GRACE
+
+    def advance(self, df):
+        """새로 받은 기사들을 기준점에 반영 (키 추가, 최신 발행 시각 갱신)"""
+        if df is None or df.empty:
+            return
+        for field in ('guid', 'link'):
+            if field in df.columns:
+                for key in df[field].dropna().tolist():
+                    self._keys[key] = None
+                    self._keys.move_to_end(key)
+        while len(self._keys) > WATERMARK_MAX_KEYS:
+            self._keys.popitem(last=False)
+        latest = df['published'].max()
+        if pd.notna(latest) and (self.published is None or latest > self.published):
+            self.published = latest
+
+
+def load_watermark(market, source):
+    """저장된 기준점을 읽고, 없으면 저장소에 이미 있는 기사 링크로 초기화 (업그레이드 직후 전부 새 기사로 잡히지 않도록)"""
+    row = _conn().execute(
+        "SELECT published, seen_keys FROM source_watermarks WHERE market = ? AND source = ?", (market, source)
+    ).fetchone()
+    if row is not None:
+        published = pd.Timestamp(row['published']).tz_localize("Asia/Seoul") if row['published'] else None
+        return SourceWatermark(market, source, published, json.loads(row['seen_keys']))
+
+    stored = get_latest_articles(source=source, market=market, limit=WATERMARK_MAX_KEYS)
+    watermark = SourceWatermark(market, source)
+    watermark.advance(stored.iloc[::-1])
+    return watermark
+
+
+def save_watermark(watermark):
+    published = None
+    if watermark.published is not None:
+        published = watermark.published.tz_convert("Asia/Seoul").strftime("%Y-%m-%d %H:%M:%S")
+    with _conn() as conn:
+        conn.execute("""
+            INSERT INTO source_watermarks (market, source, published, seen_keys, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(market, source) DO UPDATE SET
+                published = excluded.published,
+                seen_keys = excluded.seen_keys,
+                updated_at = excluded.updated_at
+        """, (watermark.market, watermark.source, published,
+              json.dumps(list(watermark._keys), ensure_ascii=False),
+              datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
@@ -0,0 +1,13 @@
+# tests/conftest.py
+# 테스트는 임시 저장소/캐시 경로를 사용 (모듈이 import 시점에 경로를 읽으므로 가장 먼저 설정)
+import os
+import sys
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="ai_news_tests_")
+os.environ.setdefault("NEWS_DB_PATH", os.path.join(_TMP, "news.sqlite"))
+os.environ.setdefault("FEED_CACHE_DIR", os.path.join(_TMP, "feeds"))
+os.environ.setdefault("SHEETS_BACKEND", "local")
+os.environ.setdefault("AI_STUB_MODEL", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,43 @@
+# tests/test_admin_page.py
+import pandas as pd
+import pytest
+
+from admin_page import _editor_diff
+
+
+@pytest.fixture
+def users():
+    return pd.DataFrame({'username': ["alice", "bob", "carol"], 'role': ["user", "admin", "user"],
+                         'session_token': ["", "t1", ""]})
+
+
+def test_edited_rows_become_per_user_updates(users):
+    diff = _editor_diff(users, {'edited_rows': {0: {'role': "admin"}, 1: {'role': "admin"}, 2: {'session_token': None}}})
+    # 바꿨다가 되돌린 칸(bob)과 원래 값과 같은 칸(carol 의 빈 토큰)은 제외
+    assert diff == {'updated': {"alice": {'role': "admin"}}, 'added': [], 'deleted': []}
+
+
+def test_deleted_rows_skip_their_edits(users):
+    diff = _editor_diff(users, {'edited_rows': {"1": {'role': "user"}}, 'deleted_rows': [1]})
+    assert diff == {'updated': {}, 'added': [], 'deleted': ["bob"]}
+
+
+def test_added_rows_default_role_and_trim_username(users):
+    diff = _editor_diff(users, {'added_rows': [{'username': " dave ", 'role': None}]})
+    assert diff['added'] == [{'username': "dave", 'role': "user"}]
+
+
+def test_readding_deleted_username_is_allowed(users):
+    diff = _editor_diff(users, {'deleted_rows': [0], 'added_rows': [{'username': "alice"}]})
+    assert diff['deleted'] == ["alice"] and diff['added'][0]['username'] == "alice"
+
+
+@pytest.mark.parametrize("state", [
+    {'edited_rows': {0: {'username': "alice2"}}},
+    {'added_rows': [{'username': ""}]},
+    {'added_rows': [{'username': "bob"}]},
+    {'added_rows': [{'username': "dave"}, {'username': "dave"}]},
+])
+def test_invalid_edits_are_rejected(users, state):
+    with pytest.raises(ValueError):
+        _editor_diff(users, state)
@@ -0,0 +1,156 @@
+# tests/test_ai_analyzer.py
+import json
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+import ai_analyzer
+import database_manager
+from ai_analyzer import (StubModel, _parse_batch_response, analyze_news_batch, analyze_news_gemini,
+                         analyze_news_gemini_stream, get_cached_single_analysis,
+                         get_model_client, is_failed_analysis)
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_manager, "DB_PATH", str(tmp_path / "news.sqlite"))
+
+
+ARTICLES = [{'title': f"기사 {i}", 'summary': f"요약 {i}", 'link': f"https://a/{i}"} for i in range(3)]
+
+
+def test_batch_and_single_analysis_are_cached_separately():
+    model = StubModel()
+    results = analyze_news_batch("key", ARTICLES, client=model)
+    assert not any(is_failed_analysis(r) for r in results)
+    assert len(model.calls) == 1
+
+    # 같은 일괄 분석은 캐시에서
+    assert analyze_news_batch("key", ARTICLES, client=model) == results
+    assert len(model.calls) == 1
+
+    # 프롬프트가 다른 단건 분석은 일괄 결과를 쓰지 않고 새로 요청
+    single = analyze_news_gemini("key", ARTICLES[1]['title'], ARTICLES[1]['summary'],
+                                 link=ARTICLES[1]['link'], client=model)
+    assert len(model.calls) == 2
+    assert single != results[1]
+
+
+def test_batch_reuses_single_analysis_only_when_asked():
+    model = StubModel()
+    single = analyze_news_gemini("key", ARTICLES[0]['title'], ARTICLES[0]['summary'],
+                                 link=ARTICLES[0]['link'], client=model)
+    assert get_cached_single_analysis(ARTICLES[0]['title'], ARTICLES[0]['summary'], link=ARTICLES[0]['link']) == single
+
+    results = analyze_news_batch("key", ARTICLES, client=model, reuse_single=True)
+    assert results[0] == single
+    assert "기사 0" not in model.calls[-1]
+
+    plain = StubModel()
+    analyze_news_batch("key", ARTICLES[:1], client=plain)
+    assert len(plain.calls) == 1
+
+
+@pytest.mark.parametrize("text", [
+    '분석 결과입니다.\n```json\n[{"id": 1, "analysis": "a [참고]"}, {"id": 2, "analysis": "b"}]\n```\n끝 [1]',
+    '[{"id": 1, "analysis": "a [참고]"}, {"id": 2, "analysis": "b"}]\n참고: [1] 은 속보입니다.',
+    '기사 [1], [2] 분석: [{"id": 1, "analysis": "a [참고]"}, {"id": 2, "analysis": "b"}]',
+])
+def test_parse_batch_response_takes_first_complete_array(text):
+    assert _parse_batch_response(text) == {1: "a [참고]", 2: "b"}
+
+
+def test_parse_batch_response_without_array_raises():
+    with pytest.raises(ValueError):
+        _parse_batch_response("분석할 수 없습니다.")
+
+
+def test_missing_batch_items_are_failures_and_not_cached():
+    # 첫 기사 결과만 돌려주는 모델
+    model = StubModel(lambda prompt: json.dumps([{"id": 1, "analysis": "첫 기사 분석"}], ensure_ascii=False))
+    results = analyze_news_batch("key", ARTICLES, client=model)
+    assert results[0] == "첫 기사 분석"
+    assert all(is_failed_analysis(r) for r in results[1:])
+
+    retry = StubModel()
+    analyze_news_batch("key", ARTICLES, client=retry)
+    # 성공한 첫 기사는 캐시에서, 실패한 두 기사만 다시 요청
+    assert len(retry.calls) == 1
+    assert "[1] 제목: 기사 1" in retry.calls[0] and "기사 0" not in retry.calls[0]
+
+
+def test_model_error_is_reported_per_article():
+    def broken(prompt):
+        raise RuntimeError("quota")
+    results = analyze_news_batch("key", ARTICLES, client=StubModel(broken))
+    assert all(is_failed_analysis(r) and "quota" in r for r in results)
+
+
+# --- 스트리밍 ---
+class BrokenStreamModel(StubModel):
+    """몇 조각을 보낸 뒤 연결이 끊기는 모델"""
+
+    def generate_content_stream(self, model, contents):
+        self.calls.append(contents)
+        yield SimpleNamespace(text="핵심요약: ")
+        yield SimpleNamespace(text="반도체 ")
+        raise ConnectionError("stream reset")
+
+
+def test_stream_yields_chunks_and_caches_result():
+    model = StubModel(lambda prompt: "핵심요약: 반도체 강세 시장영향: 긍정적")
+    chunks = list(analyze_news_gemini_stream("key", "반도체", "요약", link="https://a/s", client=model))
+    assert len(chunks) > 1 and "".join(chunks) == "핵심요약: 반도체 강세 시장영향: 긍정적"
+
+    # 두 번째는 캐시에서 한 번에
+    assert list(analyze_news_gemini_stream("key", "반도체", "요약", link="https://a/s", client=model)) == ["".join(chunks)]
+    assert len(model.calls) == 1
+
+
+def test_stream_failure_raises_and_is_not_cached():
+    model = BrokenStreamModel()
+    stream = analyze_news_gemini_stream("key", "반도체", "요약", link="https://a/s", client=model)
+    assert next(stream) == "핵심요약: "
+    with pytest.raises(ConnectionError):
+        list(stream)
+    assert get_cached_single_analysis("반도체", "요약", link="https://a/s") is None
+
+
+# --- 모델 클라이언트 재사용 ---
+@pytest.fixture
+def fake_genai(monkeypatch):
+    monkeypatch.delenv("AI_STUB_MODEL", raising=False)
+    monkeypatch.setattr(ai_analyzer, "_client_pool", OrderedDict())
+    created = []
+
+    class Client:
+        def __init__(self, api_key):
+            self.models = SimpleNamespace(api_key=api_key)
+            created.append(api_key)
+
+    monkeypatch.setattr(ai_analyzer, "lazy_import", lambda name: SimpleNamespace(Client=Client))
+    return created
+
+
+def test_model_client_is_reused_per_api_key(fake_genai):
+    first = get_model_client("key-a")
+    assert get_model_client(" key-a ") is first      # 앞뒤 공백은 같은 키
+    assert get_model_client("key-b") is not first
+    assert fake_genai == ["key-a", "key-b"]
+
+
+def test_model_client_pool_evicts_least_recently_used(fake_genai, monkeypatch):
+    monkeypatch.setattr(ai_analyzer, "MAX_POOLED_CLIENTS", 2)
+    a = get_model_client("key-a")
+    get_model_client("key-b")
+    get_model_client("key-a")          # a 를 최근 사용으로
+    get_model_client("key-c")          # 가장 오래 안 쓴 b 가 빠짐
+    assert get_model_client("key-a") is a
+    get_model_client("key-b")
+    assert fake_genai == ["key-a", "key-b", "key-c", "key-b"]
+
+
+def test_stub_model_is_used_when_configured(monkeypatch):
+    monkeypatch.setenv("AI_STUB_MODEL", "1")
+    assert isinstance(get_model_client("key"), StubModel)
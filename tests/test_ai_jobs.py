@@ -0,0 +1,72 @@
+# tests/test_ai_jobs.py
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import ai_jobs
+import database_manager
+from ai_analyzer import StubModel, analyze_news_gemini_stream
+from ai_jobs import AIJobQueue, RateLimitError, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ai_jobs.time, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_burst_then_refill(clock):
+    bucket = TokenBucket(rate=0.5, capacity=2)
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(2.0)   # 다음 토큰까지 2초
+    clock.now += 1
+    assert bucket.try_acquire() == pytest.approx(1.0)
+    clock.now += 1
+    assert bucket.try_acquire() == 0.0
+
+
+def test_token_bucket_does_not_exceed_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=2)
+    clock.now += 3600
+    assert [bucket.try_acquire() for _ in range(3)][:2] == [0.0, 0.0]
+    assert bucket.tokens < 1
+
+
+def test_queue_coalesces_same_key_and_limits_rate():
+    release = threading.Event()
+    queue = AIJobQueue(workers=1, rate_per_minute=60, burst=2)
+    first = queue.submit("key", "article-1", release.wait)
+    assert queue.submit("key", "article-1", release.wait) is first   # 같은 기사는 같은 작업
+    queue.submit("key", "article-2", release.wait)
+    with pytest.raises(RateLimitError):
+        queue.submit("key", "article-3", release.wait)
+    queue.submit("other-key", "article-3", release.wait)              # 한도는 API 키별
+    release.set()
+
+
+def test_stream_failure_marks_job_as_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_manager, "DB_PATH", str(tmp_path / "news.sqlite"))
+
+    class BrokenStreamModel(StubModel):
+        def generate_content_stream(self, model, contents):
+            yield SimpleNamespace(text="핵심요약: ")
+            raise ConnectionError("stream reset")
+
+    queue = AIJobQueue(workers=1)
+    job = queue.submit("key", "article", analyze_news_gemini_stream, "key", "반도체", "요약", None,
+                       BrokenStreamModel())
+    queue._queue.join()
+    assert job.status == "error"
+    assert job.error == "stream reset"
+    assert job.text == "핵심요약: "     # 받은 부분까지는 남지만 완료로 표시하지 않음
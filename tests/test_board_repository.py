@@ -0,0 +1,78 @@
+# tests/test_board_repository.py
+import pandas as pd
+import pytest
+
+from board_repository import QNA_COLUMNS, ROW_ID_PREFIX, BoardRepository, new_row_id
+from sheets_backend import LocalSheetBackend
+
+
+class CountingBackend(LocalSheetBackend):
+    """시트 전체 쓰기(write_all) 횟수를 세는 로컬 백엔드"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.full_writes = 0
+
+    def write_all(self, worksheet, df):
+        self.full_writes += 1
+        super().write_all(worksheet, df)
+
+
+def question(username, text, **values):
+    return {'username': username, 'question': text, 'answer': "", 'status': "대기중",
+            'created_at': "2026-10-16 09:00", 'replied_at': ""} | values
+
+
+@pytest.fixture
+def backend():
+    return CountingBackend(tables={"QnA": pd.DataFrame(columns=QNA_COLUMNS)})
+
+
+@pytest.fixture
+def repo(backend):
+    return BoardRepository(backend, "QnA", QNA_COLUMNS, read_ttl=3600)
+
+
+def test_row_ids_are_never_numeric():
+    for _ in range(200):
+        row_id = new_row_id()
+        assert row_id.startswith(ROW_ID_PREFIX)
+        with pytest.raises(ValueError):
+            float(row_id)
+
+
+def test_append_adds_row_without_full_write(repo, backend):
+    row_id = repo.append(question("alice", "배당은 언제?"))
+    assert backend.full_writes == 0
+    assert backend.read("QnA")['id'].tolist() == [row_id]
+    assert repo.list().set_index('id').loc[row_id, 'question'] == "배당은 언제?"
+
+
+def test_update_and_delete_by_id(repo, backend):
+    first = repo.append(question("alice", "배당은 언제?"))
+    second = repo.append(question("bob", "공모주 일정?"))
+
+    repo.update(second, answer="다음 주", status="답변완료")
+    repo.delete(first)
+
+    for df in (repo.list(), backend.read("QnA")):
+        assert df['id'].tolist() == [second]
+        assert df.iloc[0]['answer'] == "다음 주" and df.iloc[0]['status'] == "답변완료"
+    assert backend.full_writes == 0
+
+
+def test_missing_and_legacy_ids_are_backfilled_once():
+    # id 가 없던 행, 그리고 숫자로 읽힌 이전 형식 id (0123 -> 123, 12e45 -> 1.2e46)
+    legacy = pd.DataFrame([question("alice", "a") | {'id': ""},
+                           question("bob", "b") | {'id': 123},
+                           question("carol", "c") | {'id': 1.2e46}])
+    backend = CountingBackend(tables={"QnA": legacy})
+
+    ids = BoardRepository(backend, "QnA", QNA_COLUMNS).list()['id'].tolist()
+    assert len(set(ids)) == 3 and all(i.startswith(ROW_ID_PREFIX) for i in ids)
+    assert backend.read("QnA")['id'].tolist() == ids
+    assert backend.full_writes == 1
+
+    # 다시 읽어도 (새 인스턴스/TTL 만료) id 는 그대로이고 전체 쓰기도 없음
+    assert BoardRepository(backend, "QnA", QNA_COLUMNS).list()['id'].tolist() == ids
+    assert backend.full_writes == 1
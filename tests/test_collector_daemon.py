@@ -0,0 +1,103 @@
+# tests/test_collector_daemon.py
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import database_manager
+import rss_collector
+from collector_daemon import FeedCollector
+from database_manager import get_latest_articles, get_last_attempt_at, get_last_collected_at
+from search_index import search_articles
+
+RSS_ITEM = "<item><title>{0}</title><link>{1}</link><description>{2}</description><pubDate>{3}</pubDate></item>"
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    items = []
+    delay = 0.0
+    hits = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        type(self).hits += 1
+        time.sleep(self.delay)
+        body = ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>t</title>'
+                + "".join(RSS_ITEM.format(*item) for item in self.items) + "</channel></rss>").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_manager, "DB_PATH", str(tmp_path / "news.sqlite"))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setitem(rss_collector.SOURCES, "KOREA", {"한국경제": f"http://127.0.0.1:{server.server_address[1]}/"})
+    _FeedHandler.items = [("반도체 수출 증가", "https://h/1", "요약", "Mon, 06 Jan 2025 09:00:00 +0900")]
+    _FeedHandler.delay = 0.0
+    _FeedHandler.hits = 0
+    collector = FeedCollector()
+    published = []
+    collector.subscribe(lambda market, source, delta: published.append(delta['link'].tolist()))
+    collector.published = published
+    yield collector
+    collector.stop()
+    server.shutdown()
+    server.server_close()
+
+
+def test_edited_article_is_updated_and_reindexed(collector):
+    assert collector.poll_source("KOREA", "한국경제")['link'].tolist() == ["https://h/1"]
+    assert len(search_articles("반도체")) == 1
+
+    # 같은 기사의 제목이 고쳐져서 다시 올라옴: 새 기사는 아니지만 저장소와 검색 색인에는 반영
+    _FeedHandler.items = [("2차전지 수출 증가", "https://h/1", "요약", "Mon, 06 Jan 2025 09:00:00 +0900"),
+                          ("환율 하락", "https://h/2", "요약", "Mon, 06 Jan 2025 09:10:00 +0900")]
+    assert collector.poll_source("KOREA", "한국경제")['link'].tolist() == ["https://h/2"]
+    stored = get_latest_articles(source="한국경제", market="KOREA", limit=10)
+    assert stored['title'].tolist() == ["환율 하락", "2차전지 수출 증가"]
+    assert search_articles("반도체").empty
+    assert search_articles("2차전지")['link'].tolist() == ["https://h/1"]
+    assert collector.published == [["https://h/1"], ["https://h/2"]]
+
+
+def test_concurrent_polls_publish_delta_once(collector):
+    _FeedHandler.delay = 0.2
+    threads = [threading.Thread(target=collector.poll_source, args=("KOREA", "한국경제")) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert collector.published == [["https://h/1"]]
+
+
+def test_collect_if_missing_waits_for_running_poll(collector):
+    _FeedHandler.delay = 0.3
+    first = threading.Thread(target=collector.poll_source, args=("KOREA", "한국경제"))
+    first.start()
+    time.sleep(0.1)
+    # 첫 수집이 진행 중일 때 방문자가 같은 언론사를 요청: 끝나기를 기다리고 다시 받지 않음
+    collector.collect_if_missing("KOREA", "한국경제")
+    first.join()
+    assert collector.published == [["https://h/1"]]
+    assert len(collector.last_status) == 1
+
+
+def test_empty_poll_is_recorded_and_not_repeated_by_readers(collector):
+    _FeedHandler.items = []
+    assert collector.poll_source("KOREA", "한국경제").empty
+    assert collector.last_status[("KOREA", "한국경제")]['status'] == 'empty'
+    # 기사를 저장하지는 못했지만 시도는 기록됨
+    assert get_last_collected_at("KOREA", "한국경제") is None
+    assert get_last_attempt_at("KOREA", "한국경제") is not None
+
+    # 화면 쪽 읽기(collect_if_missing)는 이미 시도한 언론사를 다시 받지 않음
+    collector.collect_if_missing("KOREA", "한국경제")
+    assert _FeedHandler.hits == 1
@@ -0,0 +1,114 @@
+# tests/test_database_manager.py
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import pytest
+
+import database_manager
+from database_manager import upsert_articles, get_latest_articles, get_recent_articles
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_manager, "DB_PATH", str(tmp_path / "news.sqlite"))
+    return database_manager
+
+
+def _pages(page_size, **kwargs):
+    """before 커서로 끝까지 넘기며 읽은 link 목록"""
+    links, before = [], None
+    while True:
+        page = get_latest_articles(limit=page_size, before=before, **kwargs)
+        if page.empty:
+            return links
+        links.extend(page['link'])
+        last = page.iloc[-1]
+        before = (last['published'], last['id'])
+
+
+def test_pagination_includes_articles_without_published(store):
+    articles = [{'title': f"t{i}", 'link': f"https://a/{i}", 'summary': "",
+                 'published': None if i % 3 == 0 else f"2026-10-16 10:{i:02d}:00"} for i in range(10)]
+    upsert_articles(articles, market="KOREA", source="한국경제")
+
+    links = _pages(3, source="한국경제")
+    assert sorted(links) == sorted(a['link'] for a in articles)
+    assert len(links) == len(set(links))
+    # 발행 시각 없는 기사는 맨 뒤
+    assert set(links[-4:]) == {f"https://a/{i}" for i in (0, 3, 6, 9)}
+
+
+def test_same_link_is_kept_per_source(store):
+    row = {'title': "같은 기사", 'link': "https://wire/1", 'summary': "", 'published': "2026-10-16 09:00:00"}
+    upsert_articles([row], market="KOREA", source="한국경제")
+    upsert_articles([dict(row, title="같은 기사(국제)")], market="GLOBAL", source="한경국제")
+    upsert_articles([dict(row, title="같은 기사(수정)")], market="KOREA", source="한국경제")
+
+    korea = get_latest_articles(source="한국경제")
+    world = get_latest_articles(source="한경국제")
+    assert list(korea['title']) == ["같은 기사(수정)"]
+    assert list(world['title']) == ["같은 기사(국제)"]
+    assert world.loc[0, 'market'] == "GLOBAL"
+    assert isinstance(korea.loc[0, 'published'], pd.Timestamp)
+
+
+def test_link_only_unique_db_is_migrated(store):
+    conn = sqlite3.connect(store.DB_PATH)
+    conn.executescript("""
+        CREATE TABLE articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, link TEXT NOT NULL UNIQUE, title TEXT, summary TEXT,
+            published TEXT, source TEXT, market TEXT, collected_at TEXT);
+        INSERT INTO articles (link, title, source, market) VALUES ('https://wire/1', '기존', '한국경제', 'KOREA');
+        INSERT INTO articles (link, title, source, market) VALUES ('https://wire/2', '출처 없음', NULL, NULL);
+    """)
+    conn.commit()
+    conn.close()
+
+    upsert_articles([{'title': "국제판", 'link': "https://wire/1", 'summary': ""}], market="GLOBAL", source="한경국제")
+    upsert_articles([{'title': "새 기사", 'link': "https://wire/3", 'summary': ""}], market="KOREA", source="한국경제")
+
+    korea = get_latest_articles(source="한국경제")
+    assert sorted(korea['title']) == ["기존", "새 기사"]
+    assert list(get_latest_articles(source="한경국제")['title']) == ["국제판"]
+    # 기존 id 는 유지되고 새 기사는 그 뒤 번호를 받음
+    assert korea.set_index('title').loc["새 기사", 'id'] > 2
+
+
+def test_source_state_without_attempt_columns_is_migrated(store):
+    conn = sqlite3.connect(store.DB_PATH)
+    conn.executescript("""
+        CREATE TABLE source_state (market TEXT NOT NULL, source TEXT NOT NULL, last_collected_at TEXT,
+                                   PRIMARY KEY (market, source));
+        INSERT INTO source_state VALUES ('KOREA', '한국경제', '2026-10-16 09:00:00');
+    """)
+    conn.commit()
+    conn.close()
+
+    assert store.get_last_attempt_at("KOREA", "한국경제") is None
+    store.record_poll_attempt("KOREA", "한국경제", "timeout")
+    assert store.get_last_attempt_at("KOREA", "한국경제") is not None
+    assert store.get_last_collected_at("KOREA", "한국경제") == datetime(2026, 10, 16, 9, 0)
+
+
+@pytest.fixture
+def new_york_clock(monkeypatch):
+    """서버 시간대가 KST 가 아닌 경우 (tzset 이 없는 플랫폼은 건너뜀)"""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset 없음")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_recent_articles_cutoff_uses_kst(store, new_york_clock):
+    now_kst = datetime.now(ZoneInfo("Asia/Seoul")).replace(tzinfo=None)
+    upsert_articles([
+        {'title': "1시간 전", 'link': "https://a/1", 'summary': "", 'published': now_kst - timedelta(hours=1)},
+        {'title': "30시간 전", 'link': "https://a/2", 'summary': "", 'published': now_kst - timedelta(hours=30)},
+    ], market="KOREA", source="한국경제")
+    assert get_recent_articles(hours=24)['title'].tolist() == ["1시간 전"]
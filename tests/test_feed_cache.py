@@ -0,0 +1,95 @@
+# tests/test_feed_cache.py
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from feed_cache import FeedCache
+
+
+class _SlowLoader:
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, market_type, source_name):
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.delay)
+        return f"{source_name}#{n}"
+
+
+def test_concurrent_cold_gets_load_once():
+    loader = _SlowLoader()
+    cache = FeedCache(loader)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get("KOREA", "한국경제"), range(8)))
+    assert loader.calls == 1
+    assert set(results) == {"한국경제#1"}
+
+
+def test_invalidate_during_load_discards_result():
+    loader = _SlowLoader(delay=0.3)
+    cache = FeedCache(loader)
+    first = threading.Thread(target=cache.get, args=("KOREA", "한국경제"))
+    first.start()
+    time.sleep(0.1)
+    cache.invalidate("KOREA", "한국경제")   # 로드 중에 새 기사가 들어옴
+    first.join()
+    assert cache.stats()['entries'] == 0
+    # 다음 요청은 낡은 결과가 아니라 새로 로드한 값을 받음
+    assert cache.get("KOREA", "한국경제") == "한국경제#2"
+
+
+def test_expired_entry_served_stale_and_refreshed_once():
+    loader = _SlowLoader(delay=0.1)
+    cache = FeedCache(loader, default_ttl=0.05)
+    assert cache.get("USA", "Investing") == "Investing#1"
+    time.sleep(0.06)
+    # 만료 후에도 기다리지 않고 기존 값을 돌려주며, 갱신은 한 번만 예약
+    assert [cache.get("USA", "Investing") for _ in range(5)] == ["Investing#1"] * 5
+    time.sleep(0.3)
+    assert loader.calls == 2
+    assert cache.get("USA", "Investing") == "Investing#2"
+
+
+def test_loader_error_reaches_waiters_and_is_not_cached():
+    calls = []
+
+    def failing(market_type, source_name):
+        calls.append(source_name)
+        raise RuntimeError("down")
+
+    cache = FeedCache(failing)
+    for _ in range(2):
+        try:
+            cache.get("KOREA", "뉴스핌")
+        except RuntimeError:
+            pass
+    assert len(calls) == 2
+    assert cache.stats()['entries'] == 0
+
+
+def test_get_nowait_starts_load_without_waiting():
+    loader = _SlowLoader(delay=0.3)
+    cache = FeedCache(loader)
+    started = time.monotonic()
+    assert cache.get_nowait("KOREA", "한국경제") is None
+    assert cache.get_nowait("KOREA", "한국경제") is None   # 진행 중인 로드를 다시 시작하지 않음
+    assert time.monotonic() - started < 0.1
+    assert cache.get("KOREA", "한국경제") == "한국경제#1"
+    assert cache.get_nowait("KOREA", "한국경제") == "한국경제#1"
+    assert loader.calls == 1
+
+
+def test_prewarm_does_not_delay_refreshes():
+    loader = _SlowLoader(delay=0.3)
+    cache = FeedCache(loader, default_ttl=0)
+    assert cache.get("KOREA", "한국경제") == "한국경제#1"
+    cache.prewarm([("USA", f"source-{i}") for i in range(6)])
+    # 만료된 항목의 뒤 갱신은 미리 채우기 작업 뒤에 줄 서지 않음
+    cache.get("KOREA", "한국경제")
+    time.sleep(0.45)
+    # 미리 채우기(6건 x 0.3초, 2개 워커)가 끝나기 전에 갱신된 값이 들어와 있음
+    assert cache.get_nowait("KOREA", "한국경제") != "한국경제#1"
@@ -0,0 +1,72 @@
+# tests/test_market_digest.py
+from datetime import datetime
+
+import pytest
+
+import database_manager
+import market_digest
+from ai_analyzer import StubModel
+from database_manager import upsert_articles
+from market_digest import DigestScheduler, generate_digest, get_latest_digest
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_manager, "DB_PATH", str(tmp_path / "news.sqlite"))
+    monkeypatch.setattr(market_digest, "SOURCES", {"KOREA": {}})
+
+
+def _add(*titles):
+    upsert_articles([{'title': t, 'link': f"https://a/{t}", 'summary': "", 'published': "2026-10-16 09:00:00"}
+                     for t in titles], market="KOREA", source="한국경제")
+
+
+def test_digest_is_stored_with_generated_at():
+    _add("반도체 수출 증가", "환율 하락")
+    model = StubModel(lambda prompt: "- 반도체 강세")
+
+    digest = generate_digest("KOREA", client=model)
+    assert digest['content'] == "- 반도체 강세"
+    assert digest['article_count'] == 2
+    assert isinstance(digest['generated_at'], datetime)
+    assert get_latest_digest("KOREA") == digest
+    assert "반도체 수출 증가" in model.calls[0]
+
+
+def test_digest_is_skipped_without_new_articles_unless_forced():
+    _add("반도체 수출 증가")
+    model = StubModel(lambda prompt: f"요약 {len(model.calls)}")
+    first = generate_digest("KOREA", client=model)
+
+    assert generate_digest("KOREA", client=model) is None
+    assert len(model.calls) == 1
+
+    forced = generate_digest("KOREA", client=model, force=True)
+    assert len(model.calls) == 2 and forced['content'] != first['content']
+
+    _add("환율 하락")
+    assert generate_digest("KOREA", client=model)['last_article_id'] > first['last_article_id']
+
+
+def test_scheduler_keeps_previous_digest_on_failure():
+    _add("반도체 수출 증가")
+    scheduler = DigestScheduler(client=StubModel(lambda prompt: "- 이전 요약"))
+    assert scheduler.run_once() is False
+    assert scheduler.last_status["KOREA"]['status'] == 'ok'
+
+    _add("환율 하락")
+
+    def broken(prompt):
+        raise RuntimeError("quota")
+    scheduler.client = StubModel(broken)
+    assert scheduler.run_once() is True
+    assert scheduler.last_status["KOREA"] == {'status': 'error', 'error': "quota",
+                                              'at': scheduler.last_status["KOREA"]['at']}
+    assert get_latest_digest("KOREA")['content'] == "- 이전 요약"
+
+
+def test_scheduler_retries_until_articles_exist():
+    scheduler = DigestScheduler(client=StubModel())
+    assert scheduler.run_once() is True
+    assert scheduler.last_status["KOREA"]['status'] == 'skipped'
+    assert get_latest_digest("KOREA") is None
@@ -0,0 +1,63 @@
+# tests/test_market_timeline.py
+import pandas as pd
+
+from market_timeline import MarketTimeline
+
+
+def feed(source, *items):
+    """(link, 'HH:MM') 목록 -> 최신순 기사 DataFrame"""
+    return pd.DataFrame({
+        'title': [f"{source} {link}" for link, _ in items],
+        'link': [link for link, _ in items],
+        'published': pd.to_datetime([f"2025-01-06 {hm}" if hm else None for _, hm in items]).tz_localize("Asia/Seoul"),
+        'summary': "",
+        'source': source,
+    })
+
+
+def test_rebuild_merges_sources_newest_first():
+    timeline = MarketTimeline("KOREA")
+    timeline.rebuild({
+        "A": feed("A", ("a2", "09:30"), ("a1", "09:00"), ("a0", None)),
+        "B": feed("B", ("b2", "09:40"), ("b1", "09:10")),
+    })
+    frame = timeline.frame()
+    assert frame['link'].tolist() == ["b2", "a2", "b1", "a1", "a0"]
+    assert frame.loc[0, 'published'] == pd.Timestamp("2025-01-06 09:40", tz="Asia/Seoul")
+
+
+def test_update_merges_only_new_articles():
+    timeline = MarketTimeline("KOREA")
+    first = feed("A", ("a1", "09:00"))
+    assert timeline.update("A", first) == 1
+    assert timeline.update("A", first) == 0    # 같은 DataFrame 은 건너뜀
+    assert timeline.update("B", feed("B", ("b1", "09:10"), ("a1", "09:00"))) == 1   # 다른 언론사에 실린 같은 링크
+    before = timeline.frame()
+    assert timeline.update("A", feed("A", ("a2", "09:20"), ("a1", "09:00"))) == 1
+    assert timeline.frame() is not before
+    assert timeline.frame()['link'].tolist() == ["a2", "b1", "a1"]
+
+
+def test_max_items_drops_oldest():
+    timeline = MarketTimeline("KOREA", max_items=2)
+    timeline.update("A", feed("A", ("a2", "09:20"), ("a1", "09:00")))
+    timeline.update("B", feed("B", ("b1", "09:10")))
+    assert timeline.frame()['link'].tolist() == ["a2", "b1"]
+    # 밀려난 기사는 다시 들어올 수 있음
+    assert "a1" not in timeline._links
+
+
+def test_deduped_frame_shows_cross_source_copies_once():
+    timeline = MarketTimeline("KOREA")
+    a = feed("A", ("a1", "09:20"), ("a0", "09:00"))
+    b = feed("B", ("b1", "09:10"))
+    a.loc[0, 'title'] = b.loc[0, 'title'] = "[속보] 코스피 2,700선 회복 외국인 순매수 전환"
+    timeline.rebuild({"A": a, "B": b})
+
+    deduped = timeline.deduped_frame()
+    assert deduped['link'].tolist() == ["b1", "a0"]     # 묶음의 대표는 먼저 게시된 기사
+    assert deduped.loc[0, 'cluster_size'] == 2
+    assert len(timeline.frame()) == 3
+    assert timeline.deduped_frame() is deduped         # 바뀌지 않았으면 다시 계산하지 않음
+    timeline.update("B", feed("B", ("b2", "09:30"), ("b1", "09:10")))
+    assert timeline.deduped_frame()['link'].tolist() == ["b2", "b1", "a0"]
@@ -0,0 +1,26 @@
+# tests/test_perf_metrics.py
+import pytest
+
+import perf_metrics
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    perf_metrics.reset()
+    yield
+    perf_metrics.reset()
+
+
+def test_pooled_summary_uses_all_samples():
+    # 빠른 언론사 99건 + 느린 언론사 1건: 합친 p50 은 빠른 쪽, 언론사별 p50 의 최댓값은 느린 쪽
+    for _ in range(99):
+        perf_metrics.record("feed_download", 0.010, "A")
+    perf_metrics.record("feed_download", 1.0, "B")
+
+    per_source = perf_metrics.latency_summary()
+    assert per_source.set_index('source').loc["B", 'p50_ms'] == 1000.0
+
+    pooled = perf_metrics.latency_summary(by_source=False)
+    assert pooled[['stage', 'source', 'count']].values.tolist() == [["feed_download", "전체", 100]]
+    assert pooled.iloc[0]['p50_ms'] == 10.0
+    assert pooled.iloc[0]['max_ms'] == 1000.0
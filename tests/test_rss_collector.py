@@ -0,0 +1,324 @@
+# tests/test_rss_collector.py
+import re
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+import pandas as pd
+import requests
+
+import perf_metrics
+import rss_collector
+
+
+class _TrickleHandler(BaseHTTPRequestHandler):
+    """헤더는 바로 보내고 본문은 0.1초마다 1바이트씩 보내는 서버 (읽기 timeout 에는 걸리지 않음)"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "1000")
+        self.end_headers()
+        try:
+            for _ in range(1000):
+                self.wfile.write(b"x")
+                self.wfile.flush()
+                time.sleep(0.1)
+        except OSError:
+            pass
+
+
+@pytest.fixture
+def trickle_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _TrickleHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/feed"
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_feed_stops_at_deadline(trickle_url):
+    started = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        rss_collector._download_feed(trickle_url, timeout=5, deadline=started + 0.5)
+    assert time.monotonic() - started < 2
+
+
+def test_fetch_single_feed_reports_timeout(trickle_url):
+    articles, status = rss_collector._fetch_single_feed("느린피드", trickle_url, timeout=0.5)
+    assert articles == []
+    assert status['status'] == 'timeout'
+    assert status['elapsed'] < 2
+
+
+# --- 시장 전체 수집 + 중복 묶기 ---
+RSS_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>t</title>{items}</channel></rss>"""
+RSS_ITEM = "<item><title>{title}</title><link>{link}</link><description>{summary}</description><pubDate>{published}</pubDate></item>"
+
+WIRE_TITLE = "[속보] 코스피 2,700선 회복 외국인 순매수 전환"
+WIRE_SUMMARY = "외국인과 기관의 동반 순매수에 힘입어 코스피가 장중 2,700선을 회복했다"
+
+FEEDS = {
+    # 언론사마다 발행 시각 형식이 다름 (RFC822 / 오프셋 없는 KST 문자열)
+    "/hankyung": [
+        dict(title=WIRE_TITLE, link="https://h/1", summary=WIRE_SUMMARY, published="Mon, 06 Jan 2025 09:30:00 +0900"),
+        dict(title="반도체 수출 3개월 연속 증가", link="https://h/2", summary="반도체 수출이 늘었다",
+             published="Mon, 06 Jan 2025 08:00:00 +0900"),
+    ],
+    "/newspim": [
+        dict(title=WIRE_TITLE, link="https://n/1", summary=WIRE_SUMMARY + " (홍길동 기자)", published="2025-01-06 09:10:00"),
+    ],
+}
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        body = RSS_TEMPLATE.format(items="".join(RSS_ITEM.format(**item) for item in FEEDS[self.path]))
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def korea_feeds(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setitem(rss_collector.SOURCES, "KOREA", {"한국경제": base + "/hankyung", "뉴스핌": base + "/newspim"})
+    yield
+    server.shutdown()
+    server.server_close()
+
+
+def test_market_wide_fetch_with_dedup(korea_feeds):
+    df = rss_collector.fetch_rss_feeds("KOREA", dedup=True)
+    assert len(df) == 2
+    wire = df[df['cluster_size'] == 2].iloc[0]
+    # 가장 먼저 게시된 뉴스핌(09:10 KST) 기사가 대표
+    assert wire['source'] == "뉴스핌"
+    assert wire['published'] == pd.Timestamp("2025-01-06 09:10:00", tz="Asia/Seoul")
+
+
+def test_cluster_parses_raw_published_strings():
+    df = pd.DataFrame([dict(item, source="한국경제") for item in FEEDS["/hankyung"]]
+                      + [dict(item, source="뉴스핌") for item in FEEDS["/newspim"]])
+    clustered = rss_collector.cluster_near_duplicates(df)
+    canonical = clustered[clustered['is_canonical'] & (clustered['cluster_size'] == 2)]
+    assert canonical['link'].tolist() == ["https://n/1"]
+
+
+def test_simhash_distance():
+    a = rss_collector.simhash(rss_collector._normalize_for_dedup(WIRE_TITLE, WIRE_SUMMARY))
+    b = rss_collector.simhash(rss_collector._normalize_for_dedup(WIRE_TITLE.replace("[속보] ", ""), WIRE_SUMMARY + " (홍길동 기자)"))
+    c = rss_collector.simhash(rss_collector._normalize_for_dedup("반도체 수출 3개월 연속 증가", "반도체 수출이 늘었다"))
+    assert a == b
+    assert bin(a ^ c).count('1') > rss_collector.SIMHASH_MAX_DISTANCE
+
+
+# --- 발행 시각 정규화 ---
+def kst(text):
+    return pd.Timestamp(text, tz="Asia/Seoul")
+
+
+def normalize(raw, source=None):
+    return rss_collector.normalize_published(raw, source)
+
+
+def test_normalize_published_formats():
+    raw = pd.Series(["Mon, 06 Jan 2025 09:30:00 +0900", "Mon, 06 Jan 2025 00:30:00 GMT",
+                     "2025-01-06T00:30:00Z", "2025-01-06 09:30:00 KST", "", None, "not a date"])
+    assert normalize(raw).tolist()[:4] == [kst("2025-01-06 09:30")] * 4
+    assert normalize(raw).iloc[4:].isna().all()
+
+
+def test_normalize_published_naive_time_uses_source_timezone():
+    raw = pd.Series(["2025-01-06 00:30:00"])
+    assert normalize(raw, "뉴스핌").iloc[0] == kst("2025-01-06 00:30")
+    assert normalize(raw, "Investing").iloc[0] == kst("2025-01-06 09:30")
+
+
+def test_normalize_published_by_source_keeps_rows_without_source():
+    df = pd.DataFrame({'source': ["Investing", None, "뉴스핌"],
+                       'published': ["2025-01-06 00:30:00", "Mon, 06 Jan 2025 09:30:00 +0900", "2025-01-06 09:30:00"]})
+    assert rss_collector.normalize_published_by_source(df).tolist() == [kst("2025-01-06 09:30")] * 3
+
+
+@pytest.mark.parametrize("parser", ["feedparser", "missing", "broken"])
+def test_normalize_published_fallback_without_feedparser_parser(monkeypatch, parser):
+    # 알려진 형식이 아닌 값은 feedparser 날짜 파서로, 그 파서가 없거나 실패하면 pandas 로 읽음
+    def broken(value):
+        raise RuntimeError("changed internals")
+    if parser != "feedparser":
+        monkeypatch.setattr(rss_collector, "_feedparser_parse_date", None if parser == "missing" else broken)
+    raw = pd.Series(["06 Jan 2025 09:30:00 +0900", "January 6, 2025 00:30 UTC", "not a date"])
+    result = normalize(raw)
+    assert result.tolist()[:2] == [kst("2025-01-06 09:30")] * 2
+    assert pd.isna(result.iloc[2])
+
+
+# --- 네이버 검색 ---
+def test_naver_items_with_missing_fields(monkeypatch):
+    monkeypatch.setenv("NAVER_ID", "id")
+    monkeypatch.setenv("NAVER_SECRET", "secret")
+    items = [
+        {'title': "<b>증시</b> 마감", 'link': "https://n/1", 'description': "요약",
+         'pubDate': "Mon, 06 Jan 2025 15:40:00 +0900"},
+        {'title': "날짜 없는 기사", 'link': "https://n/2"},
+        {'description': "링크 없는 기사"},
+    ]
+    monkeypatch.setattr(rss_collector, "_fetch_naver_page", lambda *args: items)
+    df = rss_collector.fetch_naver_news("증시", use_cache=False)
+    assert df['link'].tolist() == ["https://n/1", "https://n/2"]
+    assert df['title'].tolist() == ["증시 마감", "날짜 없는 기사"]
+    assert df.loc[0, 'published'] == kst("2025-01-06 15:40")
+    assert pd.isna(df.loc[1, 'published']) and df.loc[1, 'summary'] == ""
+
+
+# --- 피드 파싱 ---
+RSS2 = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>t</title>
+<item><title>코스피 상승</title><link>https://a/1</link><guid>g-1</guid>
+<pubDate>Mon, 06 Jan 2025 09:00:00 +0900</pubDate><description>&lt;b&gt;요약&lt;/b&gt;</description></item>
+<item><title>날짜만 dc</title><link>https://a/2</link><dc:date>2025-01-06T00:10:00Z</dc:date></item>
+</channel></rss>"""
+
+ATOM = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>
+<entry><title>Stocks rally</title><link rel="self" href="https://a/self"/><link href="https://a/3"/>
+<id>tag:a,3</id><updated>2025-01-06T00:30:00Z</updated><summary>Fed</summary></entry>
+</feed>"""
+
+RDF = """<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel rdf:about="https://a/"><title>t</title><link>https://a/</link><description>d</description></channel>
+<item rdf:about="https://a/4"><title>RDF 기사</title><link>https://a/4</link>
+<dc:date>2025-01-06T09:40:00+09:00</dc:date><description>요약</description></item>
+</rdf:RDF>"""
+
+
+@pytest.fixture
+def fallback_count():
+    before = len(perf_metrics.samples("feedparser_fallback"))
+    return lambda: len(perf_metrics.samples("feedparser_fallback")) - before
+
+
+def test_parse_rss2(fallback_count):
+    articles = rss_collector._parse_feed_articles(RSS2.encode("utf-8"))
+    assert [(a['title'], a['link'], a['guid']) for a in articles] == [
+        ("코스피 상승", "https://a/1", "g-1"), ("날짜만 dc", "https://a/2", None)]
+    assert articles[0]['published'] == "Mon, 06 Jan 2025 09:00:00 +0900"
+    assert articles[0]['summary'] == "<b>요약</b>"
+    assert articles[1]['published'] == "2025-01-06T00:10:00Z" and articles[1]['summary'] == "No Summary"
+    assert fallback_count() == 0
+
+
+def test_parse_atom(fallback_count):
+    [article] = rss_collector._parse_feed_articles(ATOM.encode("utf-8"))
+    assert article == {'title': "Stocks rally", 'link': "https://a/3", 'published': "2025-01-06T00:30:00Z",
+                       'summary': "Fed", 'guid': "tag:a,3"}
+    assert fallback_count() == 0
+
+
+def test_parse_euc_kr_falls_back_to_feedparser(fallback_count):
+    content = RSS2.replace('encoding="UTF-8"', 'encoding="EUC-KR"').encode("euc-kr")
+    articles = rss_collector._parse_feed_articles(content)
+    assert [a['title'] for a in articles] == ["코스피 상승", "날짜만 dc"]
+    assert fallback_count() == 1
+
+
+def test_stream_parser_errors_on_euc_kr_are_caught(monkeypatch, fallback_count):
+    # 선언을 못 읽어도 expat 의 인코딩 오류(ValueError)는 feedparser 로 넘어감
+    monkeypatch.setattr(rss_collector, "_XML_ENCODING_RE", re.compile(rb"(?!)"))
+    content = RSS2.replace('encoding="UTF-8"', 'encoding="EUC-KR"').encode("euc-kr")
+    assert [a['title'] for a in rss_collector._parse_feed_articles(content)] == ["코스피 상승", "날짜만 dc"]
+    assert fallback_count() == 1
+
+
+def test_parse_rdf_falls_back_to_feedparser(fallback_count):
+    [article] = rss_collector._parse_feed_articles(RDF.encode("utf-8"))
+    assert (article['title'], article['link']) == ("RDF 기사", "https://a/4")
+    assert article['published'] == "2025-01-06T09:40:00+09:00"
+    assert fallback_count() == 1
+
+
+# --- 조건부 요청 (ETag / Last-Modified) ---
+class _ConditionalHandler(BaseHTTPRequestHandler):
+    """etag 가 일치하면 304, 아니면 현재 items 로 200 을 보내고 받은 요청 헤더를 기록"""
+    etag = '"v1"'
+    last_modified = "Mon, 06 Jan 2025 00:00:00 GMT"
+    items = FEEDS["/hankyung"]
+    received = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        type(self).received.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = RSS_TEMPLATE.format(items="".join(RSS_ITEM.format(**item) for item in self.items)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Last-Modified", self.last_modified)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def conditional_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(rss_collector, "FEED_CACHE_DIR", str(tmp_path / "feed_cache"))
+    monkeypatch.setattr(_ConditionalHandler, "received", [])
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ConditionalHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/feed"
+    server.shutdown()
+    server.server_close()
+
+
+def test_not_modified_returns_cached_articles_without_parsing(conditional_url, monkeypatch):
+    first, status = rss_collector._fetch_single_feed("한국경제", conditional_url)
+    assert status['status'] == 'ok' and not status['not_modified']
+    assert "If-None-Match" not in _ConditionalHandler.received[0]
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("304 응답은 파싱하지 않아야 함")
+    monkeypatch.setattr(rss_collector, "_parse_feed_articles", no_parse)
+    again, status = rss_collector._fetch_single_feed("한국경제", conditional_url)
+
+    sent = _ConditionalHandler.received[1]
+    assert sent["If-None-Match"] == '"v1"'
+    assert sent["If-Modified-Since"] == "Mon, 06 Jan 2025 00:00:00 GMT"
+    assert status['status'] == 'ok' and status['not_modified']
+    assert again == first
+
+
+def test_changed_feed_rewrites_cache(conditional_url, monkeypatch):
+    rss_collector._fetch_single_feed("한국경제", conditional_url)
+    assert rss_collector._load_feed_cache(conditional_url)['etag'] == '"v1"'
+
+    monkeypatch.setattr(_ConditionalHandler, "etag", '"v2"')
+    monkeypatch.setattr(_ConditionalHandler, "items", FEEDS["/newspim"])
+    articles, status = rss_collector._fetch_single_feed("한국경제", conditional_url)
+
+    assert not status['not_modified']
+    assert [a['link'] for a in articles] == ["https://n/1"]
+    cached = rss_collector._load_feed_cache(conditional_url)
+    assert cached['etag'] == '"v2"'
+    assert [a['link'] for a in cached['articles']] == ["https://n/1"]
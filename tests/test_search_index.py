@@ -0,0 +1,40 @@
+# tests/test_search_index.py
+import pytest
+
+import database_manager
+from database_manager import upsert_articles
+from search_index import index_pending, search_articles, tokenize, min_match_for
+
+
+@pytest.fixture
+def indexed(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_manager, "DB_PATH", str(tmp_path / "news.sqlite"))
+    articles = [
+        ("삼성전자 3분기 실적 발표", "반도체 부문 영업이익 증가"),
+        ("반도체 업황 전망", "메모리 가격 반등 기대"),
+        ("삼성 바이오 신약 승인", "전자 결재 시스템 도입"),
+        ("외국인 순매수 반도체 전망 밝아", "코스피 외국인 순매수 지속"),
+    ]
+    upsert_articles([{'title': t, 'summary': s, 'link': f"https://a/{i}", 'published': f"2026-10-16 09:0{i}:00"}
+                     for i, (t, s) in enumerate(articles)], market="KOREA", source="한국경제")
+    index_pending()
+
+
+def _titles(query):
+    return set(search_articles(query)['title'])
+
+
+def test_short_query_requires_every_term(indexed):
+    # '삼성' 과 '전자' 가 따로 있는 기사는 '삼성전자' 검색에 나오지 않음
+    assert _titles("삼성전자") == {"삼성전자 3분기 실적 발표"}
+
+
+def test_long_query_counts_terms_missing_from_index(indexed):
+    # 색인에 없는 토큰이 많아도 최소 일치 수는 검색어 전체 토큰 수 기준
+    assert _titles("반도체 전망 목표주가 상향 리포트 발간") == set()
+    assert _titles("외국인 순매수 반도체 전망") == {"외국인 순매수 반도체 전망 밝아"}
+
+
+def test_min_match_rule():
+    assert [min_match_for(n) for n in (1, 2, 3, 4, 10)] == [1, 2, 3, 3, 6]
+    assert tokenize("Fed 금리인하") == ["fed", "금리", "리인", "인하"]
@@ -0,0 +1,197 @@
+# tests/test_user_repository.py
+import pandas as pd
+import pytest
+
+import user_repository
+from sheets_backend import LocalSheetBackend
+from user_repository import ConcurrentEditError, SheetWriteError, UserRepository, USER_COLUMNS
+
+
+def make_users(*names):
+    return pd.DataFrame([{col: "" for col in USER_COLUMNS} | {'username': n, 'role': 'user'} for n in names])
+
+
+@pytest.fixture
+def backend():
+    return LocalSheetBackend(tables={"Users": make_users("alice", "bob")})
+
+
+@pytest.fixture
+def repo(backend):
+    # 뒤에서 도는 기록 스레드가 끼어들지 않도록 간격을 길게 두고 flush() 를 직접 호출
+    return UserRepository(backend, flush_interval=3600)
+
+
+def sheet(backend):
+    return backend.read("Users").set_index('username')
+
+
+# --- 기록 대기열 합치기 ---
+def test_enqueue_merges_updates(repo):
+    repo.update("alice", role="admin")
+    repo.update("alice", last_login="2025-01-01")
+    assert dict(repo._pending) == {"alice": {'op': 'update', 'attempts': 0,
+                                             'values': {'role': 'admin', 'last_login': '2025-01-01'}}}
+
+
+def test_enqueue_delete_of_unwritten_append_is_noop(repo, backend):
+    repo.create({'username': "carol"})
+    repo.delete("carol")
+    assert not repo._pending
+    assert repo.flush() == []
+    assert "carol" not in sheet(backend).index
+
+
+def test_enqueue_recreate_after_delete_overwrites_row(repo, backend):
+    repo.delete("bob")
+    repo.create({'username': "bob", 'role': "admin"})
+    assert repo._pending["bob"]['op'] == 'update'
+    repo.flush()
+    assert sheet(backend).loc["bob", 'role'] == "admin"
+    assert len(sheet(backend)) == 2
+
+
+# --- 실패한 기록 ---
+class FlakyBackend(LocalSheetBackend):
+    def __init__(self, failures, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.calls = 0
+
+    def update_row(self, worksheet, key_col, key, values):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("sheets unavailable")
+        super().update_row(worksheet, key_col, key, values)
+
+
+def test_failed_write_is_retried_then_written():
+    backend = FlakyBackend(2, tables={"Users": make_users("alice")})
+    repo = UserRepository(backend, flush_interval=3600)
+    repo.update("alice", role="admin")
+    assert repo.flush() == ["alice"]
+    assert repo._pending["alice"]['attempts'] == 1
+    assert repo.flush() == ["alice"]
+    assert repo.flush() == []
+    assert not repo._pending
+    assert sheet(backend).loc["alice", 'role'] == "admin"
+
+
+def test_failed_write_is_dropped_after_retry_limit(monkeypatch):
+    monkeypatch.setattr(user_repository, "FLUSH_RETRY_LIMIT", 3)
+    backend = FlakyBackend(100, tables={"Users": make_users("alice")})
+    repo = UserRepository(backend, flush_interval=3600)
+    repo.update("alice", role="admin")
+    for _ in range(3):
+        repo.flush()
+    assert backend.calls == 3
+    assert not repo._pending
+
+
+def test_retry_delay_backs_off(repo, monkeypatch):
+    repo.flush_interval = 2
+    monkeypatch.setattr(user_repository, "FLUSH_BACKOFF_MAX", 10)
+    assert repo._retry_delay() == 2
+    repo._pending["alice"] = {'op': 'update', 'values': {}, 'attempts': 2}
+    assert repo._retry_delay() == 8
+    repo._pending["alice"]['attempts'] = 4
+    assert repo._retry_delay() == 10
+
+
+def test_update_of_row_deleted_on_sheet_is_dropped(repo, backend):
+    assert repo.exists("bob")
+    backend.write_all("Users", make_users("alice"))
+    repo.update("bob", role="admin")
+    assert repo.flush() == ["bob"]
+    assert not repo._pending
+
+
+# --- 시트에서 직접 고친 내용 다시 읽기 ---
+def test_ttl_reload_touches_only_changed_rows(backend):
+    repo = UserRepository(backend, flush_interval=3600, read_ttl=0)
+    _, base = repo.snapshot()
+    edited = make_users("alice", "bob", "dave")
+    edited.loc[edited['username'] == "bob", 'role'] = "admin"
+    backend.write_all("Users", edited)
+
+    assert repo.get("bob")['role'] == "admin"
+    assert repo.exists("dave")
+    assert repo.row_version("alice") <= base
+    assert repo.row_version("bob") > base
+
+
+def test_ttl_reload_waits_for_pending_writes(backend):
+    repo = UserRepository(backend, flush_interval=3600, read_ttl=0)
+    repo.update("alice", role="admin")
+    # 아직 시트에 기록하지 않은 변경이 다시 읽기로 사라지지 않음
+    assert repo.get("alice")['role'] == "admin"
+    repo.flush()
+    assert repo.get("alice")['role'] == "admin"
+
+
+# --- 관리자 일괄 수정 ---
+def test_apply_diff_rejects_rows_changed_since_snapshot(repo, backend):
+    _, base = repo.snapshot()
+    repo.update("bob", role="admin")          # 다른 곳에서 먼저 수정
+    with pytest.raises(ConcurrentEditError) as e:
+        repo.apply_diff({'updated': {'alice': {'role': 'admin'}, 'bob': {'role': 'user'}}}, base)
+    assert e.value.usernames == ["bob"]
+    assert repo.get("alice")['role'] == "user"   # 아무것도 적용하지 않음
+
+
+def test_apply_diff_rejects_existing_username(repo):
+    _, base = repo.snapshot()
+    with pytest.raises(ConcurrentEditError):
+        repo.apply_diff({'added': [{'username': "alice"}]}, base)
+    # 같은 변경에서 지운 아이디는 다시 추가할 수 있음
+    repo.apply_diff({'deleted': ["alice"], 'added': [{'username': "alice", 'role': "admin"}]}, base)
+    assert repo.get("alice")['role'] == "admin"
+
+
+def test_apply_diff_writes_to_sheet(repo, backend):
+    _, base = repo.snapshot()
+    repo.apply_diff({'updated': {'alice': {'role': 'admin'}}, 'deleted': ["bob"],
+                     'added': [{'username': "carol", 'role': "user"}]}, base)
+    assert sheet(backend)['role'].to_dict() == {"alice": "admin", "carol": "user"}
+
+
+def test_apply_diff_reports_sheet_write_failure():
+    backend = FlakyBackend(100, tables={"Users": make_users("alice", "bob")})
+    repo = UserRepository(backend, flush_interval=3600)
+    _, base = repo.snapshot()
+    with pytest.raises(SheetWriteError) as e:
+        repo.apply_diff({'updated': {'alice': {'role': 'admin'}}, 'deleted': ["bob"]}, base)
+    assert list(e.value.errors) == ["alice"]
+    assert "sheets unavailable" in e.value.errors["alice"]
+
+
+# --- 자동 로그인 토큰 ---
+def test_login_replaces_token_and_logout_clears_it(repo):
+    repo.update("alice", session_token="t1")
+    assert repo.find_by_token("t1")['username'] == "alice"
+
+    # 다시 로그인하면 이전 토큰은 더 이상 통하지 않음
+    repo.update("alice", session_token="t2")
+    assert repo.find_by_token("t1") is None
+    assert repo.find_by_token("t2")['username'] == "alice"
+
+    # 로그아웃
+    repo.update("alice", session_token="")
+    assert repo.find_by_token("t2") is None
+    assert repo.find_by_token("") is None
+
+
+def test_token_index_is_rebuilt_on_reload(repo, backend):
+    repo.update("alice", session_token="t1")
+    repo.flush()
+
+    # 시트에서 직접 토큰을 바꾼 경우: reload 전까지는 메모리 인덱스 그대로, reload 후 새 값으로
+    edited = backend.read("Users")
+    edited.loc[edited['username'] == "alice", 'session_token'] = ""
+    edited.loc[edited['username'] == "bob", 'session_token'] = "t9"
+    backend.write_all("Users", edited)
+    assert repo.find_by_token("t1")['username'] == "alice"
+
+    repo.reload()
+    assert repo.find_by_token("t1") is None
+    assert repo.find_by_token("t9")['username'] == "bob"
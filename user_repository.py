@@ -0,0 +1,330 @@
+# user_repository.py
+# Users 시트 접근 계층
+# - 프로세스 안에 사용자 표를 한 번만 읽어 두고(username 인덱스) 모든 세션이 공유
+# - 변경은 캐시에 바로 반영하고, 시트에는 행 단위 작업으로 모아서 뒤에서 기록(write-behind)
+# - 변경마다 버전을 올려 두고, 관리자 화면의 일괄 수정은 불러온 시점 이후 바뀐 행이 있으면 거절
+# - 시트에서 직접 고친 내용은 read_ttl 마다 다시 읽어 반영 (기록 대기 중인 변경이 있으면 미룸)
+# - 실패한 기록은 점점 긴 간격으로 몇 번만 다시 시도하고, 시트에서 행이 사라진 경우처럼 다시 해도 안 되는 작업은 버림
+import time
+import atexit
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+USER_COLUMNS = ['username', 'hashed_password', 'openai_api_key', 'gemini_api_key',
+                'session_token', 'created_at', 'role', 'last_login']
+
+FLUSH_RETRY_LIMIT = 5        # 한 작업을 시트에 기록하려고 시도하는 최대 횟수
+FLUSH_BACKOFF_MAX = 60.0     # 다시 시도 간격의 상한(초). 간격은 flush_interval 부터 2배씩 늘어남
+
+
+def _is_retryable(error):
+    """다시 시도해도 소용없는 오류(시트에서 행이 사라짐 등)는 False"""
+    return not isinstance(error, KeyError)
+
+
+class ConcurrentEditError(Exception):
+    """불러온 뒤 다른 곳에서 먼저 수정된 사용자가 있어 변경을 적용하지 않음"""
+    def __init__(self, usernames):
+        super().__init__(f"다른 곳에서 먼저 수정된 사용자가 있습니다: {', '.join(usernames)}")
+        self.usernames = usernames
+
+
+class SheetWriteError(Exception):
+    """캐시에는 반영했지만 시트 기록에 실패한 사용자가 있음 (errors: username -> 오류 메시지)"""
+    def __init__(self, errors):
+        super().__init__("시트에 기록하지 못한 사용자가 있습니다: "
+                         + ", ".join(f"{u} ({e})" for u, e in errors.items()))
+        self.errors = errors
+
+
+class UserRepository:
+    def __init__(self, backend, worksheet="Users", flush_interval=2.0, read_ttl=300):
+        self.backend = backend
+        self.worksheet = worksheet
+        self.flush_interval = flush_interval
+        self.read_ttl = read_ttl
+        self._df = None
+        self._loaded_at = 0.0
+        self._token_index = {}     # session_token -> username (자동 로그인용)
+        self._version = 0          # 변경마다 1씩 증가
+        self._row_versions = {}    # username -> 마지막으로 바뀐 버전
+        self._loaded_version = 0   # 시트에서 표 전체를 다시 읽은 버전
+        self._lock = threading.RLock()
+        # username -> {'op': 'append'|'update'|'delete', 'values': {...}, 'attempts': 실패 횟수}
+        self._pending = OrderedDict()
+        self._write_errors = {}    # username -> 마지막 기록 실패 메시지 (기록에 성공하면 지움)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer = threading.Thread(target=self._writer_loop, name="user-write-behind", daemon=True)
+        self._writer.start()
+        atexit.register(self.flush)
+
+    # --- 캐시 ---
+    def _load(self):
+        if self._df is not None and (time.monotonic() - self._loaded_at < self.read_ttl
+                                     or self._pending or self._flush_lock.locked()):
+            # 기록 대기/진행 중인 변경이 있으면 시트가 아직 옛 값이라 다시 읽지 않음
+            return self._df
+        try:
+            df = self.backend.read(self.worksheet)
+        except Exception as e:
+            print(f"⚠️ Users 시트 읽기 실패: {e}")
+            if self._df is not None:
+                self._loaded_at = time.monotonic()
+                return self._df
+            df = pd.DataFrame(columns=USER_COLUMNS)
+        for col in USER_COLUMNS:
+            if col not in df.columns:
+                df[col] = 'user' if col == 'role' else ""
+        df = df.astype(object).where(df.notna(), "")
+        df['username'] = df['username'].astype(str)
+        df = df[df['username'] != ""].set_index('username', drop=False)
+        df.index.name = None
+
+        if self._df is None:
+            # 처음 읽은(또는 reload 한) 표는 모든 행이 바뀐 것으로 간주
+            self._version += 1
+            self._loaded_version = self._version
+            self._row_versions = {}
+        else:
+            # 주기적으로 다시 읽을 때는 실제로 달라진 행만 버전을 올림 (관리자 화면 편집이 불필요하게 거절되지 않도록)
+            for username in self._changed_rows(self._df, df):
+                self._touch(username)
+        self._df = df
+        self._loaded_at = time.monotonic()
+        self._token_index = {str(token): username
+                             for username, token in zip(df['username'], df['session_token'])
+                             if token}
+        return self._df
+
+    @staticmethod
+    def _changed_rows(old, new):
+        """두 표 사이에 추가/삭제/수정된 username 목록"""
+        changed = set(old.index).symmetric_difference(new.index)
+        columns = sorted(set(old.columns) | set(new.columns))
+        common = old.index.intersection(new.index)
+        old_rows = old.reindex(index=common, columns=columns).fillna("").astype(str)
+        new_rows = new.reindex(index=common, columns=columns).fillna("").astype(str)
+        changed.update(common[(old_rows != new_rows).any(axis=1)])
+        return sorted(changed)
+
+    def _touch(self, username):
+        self._version += 1
+        self._row_versions[username] = self._version
+
+    def row_version(self, username):
+        return max(self._row_versions.get(username, 0), self._loaded_version)
+
+    def _set_token(self, username, token):
+        """토큰 인덱스 갱신: 이전 토큰은 무효화하고 새 토큰만 등록"""
+        old = self._df.at[username, 'session_token'] if username in self._df.index else ""
+        if old and self._token_index.get(str(old)) == username:
+            del self._token_index[str(old)]
+        if token:
+            self._token_index[str(token)] = username
+
+    def reload(self):
+        """시트를 다시 읽도록 캐시를 비움 (아직 기록 안 된 변경은 먼저 기록)"""
+        self.flush()
+        with self._lock:
+            self._df = None
+
+    def all(self):
+        with self._lock:
+            return self._load().reset_index(drop=True).copy()
+
+    def snapshot(self):
+        """(표 복사본, 버전) - apply_diff 의 기준 시점으로 사용"""
+        with self._lock:
+            df = self._load().reset_index(drop=True).copy()
+            return df, self._version
+
+    def get(self, username):
+        with self._lock:
+            df = self._load()
+            if username not in df.index:
+                return None
+            return df.loc[username].to_dict()
+
+    def find_by_token(self, token):
+        """세션 토큰으로 사용자 조회 (메모리 인덱스, 시트 접근 없음)"""
+        if not token:
+            return None
+        with self._lock:
+            self._load()
+            username = self._token_index.get(str(token))
+            return self.get(username) if username else None
+
+    def exists(self, username):
+        with self._lock:
+            return username in self._load().index
+
+    # --- 변경 (캐시에 즉시 반영 + 기록 대기열) ---
+    def create(self, row):
+        username = row['username']
+        with self._lock:
+            df = self._load()
+            if username in df.index:
+                raise ValueError(f"이미 존재하는 아이디입니다: {username}")
+            full = {col: row.get(col, "") for col in USER_COLUMNS}
+            full.update(row)
+            for col in full:
+                if col not in df.columns:
+                    df[col] = ""
+            df.loc[username] = pd.Series(full)
+            if full.get('session_token'):
+                self._set_token(username, full['session_token'])
+            self._touch(username)
+            self._enqueue(username, 'append', full)
+
+    def update(self, username, **values):
+        with self._lock:
+            df = self._load()
+            if username not in df.index:
+                raise KeyError(f"존재하지 않는 사용자입니다: {username}")
+            if 'session_token' in values:
+                self._set_token(username, values['session_token'])
+            for col, value in values.items():
+                if col not in df.columns:
+                    df[col] = ""
+                df.at[username, col] = value
+            self._touch(username)
+            self._enqueue(username, 'update', values)
+
+    def delete(self, username):
+        with self._lock:
+            df = self._load()
+            if username in df.index:
+                self._set_token(username, "")
+                self._df = df.drop(index=username)
+                self._touch(username)
+                self._enqueue(username, 'delete', {})
+
+    def apply_diff(self, diff, base_version):
+        """
+        관리자 화면의 변경분만 적용합니다.
+        diff: {'updated': {username: {col: value}}, 'added': [row dict], 'deleted': [username]}
+        base_version 이후 수정/삭제된 행을 건드리거나 이미 있는 아이디를 추가하면 ConcurrentEditError 를 발생시키고 아무것도 적용하지 않습니다.
+        시트 기록까지 기다리며, 변경한 사용자 중 기록에 실패한 사용자가 있으면 SheetWriteError 를 발생시킵니다.
+        """
+        with self._lock:
+            df = self._load()
+            conflicts = [u for u in [*diff.get('updated', {}), *diff.get('deleted', [])]
+                         if self.row_version(u) > base_version or u not in df.index]
+            deleted = set(diff.get('deleted', []))
+            conflicts += [row['username'] for row in diff.get('added', [])
+                          if row['username'] in df.index and row['username'] not in deleted]
+            if conflicts:
+                raise ConcurrentEditError(conflicts)
+
+            for username, values in diff.get('updated', {}).items():
+                self.update(username, **values)
+            for username in diff.get('deleted', []):
+                self.delete(username)
+            for row in diff.get('added', []):
+                self.create(row)
+        # 관리자에게 결과를 바로 알려 주도록 시트 기록까지 기다림
+        # (기록 스레드가 먼저 가져가 기록한 변경의 실패도 함께 확인)
+        self.flush()
+        usernames = [*diff.get('updated', {}), *diff.get('deleted', []), *(r['username'] for r in diff.get('added', []))]
+        with self._lock:
+            errors = {u: self._write_errors[u] for u in usernames if u in self._write_errors}
+        if errors:
+            raise SheetWriteError(errors)
+
+    def _enqueue(self, username, op, values):
+        prev = self._pending.get(username)
+        if prev is None:
+            self._pending[username] = {'op': op, 'values': dict(values), 'attempts': 0}
+        elif op == 'update':
+            # 아직 기록 전인 추가/수정에는 값만 합친다
+            if prev['op'] == 'delete':
+                self._pending[username] = {'op': 'update', 'values': dict(values), 'attempts': 0}
+            else:
+                prev['values'].update(values)
+        elif op == 'delete':
+            if prev['op'] == 'append':
+                del self._pending[username]   # 시트에 쓰기도 전에 삭제됨
+            else:
+                self._pending[username] = {'op': 'delete', 'values': {}, 'attempts': 0}
+        else:  # append
+            if prev['op'] == 'delete':
+                # 삭제 후 재가입: 남아 있는 시트 행을 새 값으로 덮어쓴다
+                self._pending[username] = {'op': 'update', 'values': dict(values), 'attempts': 0}
+            else:
+                self._pending[username] = {'op': 'append', 'values': dict(values), 'attempts': 0}
+        self._wake.set()
+
+    # --- 시트 기록 ---
+    def flush(self):
+        """
+        대기 중인 변경을 시트에 기록하고 기록하지 못한 username 목록을 반환합니다.
+        실패한 작업은 FLUSH_RETRY_LIMIT 번까지 다음 기록 때 다시 시도하고, 다시 해도 안 되는 작업은 버립니다.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, OrderedDict()
+            if not batch:
+                return []
+
+            failed = OrderedDict()
+            errors = {}
+            def fail(username, pending, error):
+                errors[username] = str(error)
+                attempts = pending.get('attempts', 0) + 1
+                if not _is_retryable(error) or attempts >= FLUSH_RETRY_LIMIT:
+                    print(f"⚠️ Users 시트 기록 포기 [{username}] ({attempts}회): {error}")
+                    return
+                failed[username] = dict(pending, attempts=attempts)
+
+            appends = [(u, p) for u, p in batch.items() if p['op'] == 'append']
+            if appends:
+                try:
+                    self.backend.append_rows(self.worksheet, [p['values'] for _, p in appends])
+                except Exception as e:
+                    print(f"⚠️ Users 시트 추가 실패: {e}")
+                    for username, pending in appends:
+                        fail(username, pending, e)
+            for username, pending in batch.items():
+                try:
+                    if pending['op'] == 'update':
+                        self.backend.update_row(self.worksheet, 'username', username, pending['values'])
+                    elif pending['op'] == 'delete':
+                        self.backend.delete_row(self.worksheet, 'username', username)
+                except KeyError:
+                    if pending['op'] != 'delete':
+                        print(f"⚠️ Users 시트에 [{username}] 행이 없어 수정을 버립니다.")
+                        errors[username] = "시트에 행이 없음"
+                    # 지우려던 행이 이미 없으면 삭제는 끝난 것
+                except Exception as e:
+                    print(f"⚠️ Users 시트 기록 실패 [{username}]: {e}")
+                    fail(username, pending, e)
+
+            with self._lock:
+                for username in batch:
+                    if username in errors:
+                        self._write_errors[username] = errors[username]
+                    else:
+                        self._write_errors.pop(username, None)
+                if failed:
+                    # 실패분 뒤에 그 사이 새로 들어온 변경을 다시 합친다
+                    newer, self._pending = self._pending, failed
+                    for username, pending in newer.items():
+                        self._enqueue(username, pending['op'], pending['values'])
+                    self._wake.set()
+            return list(errors)
+
+    def _retry_delay(self):
+        """다음 기록까지 기다릴 시간: 실패가 쌓인 작업이 있으면 2배씩 늘림"""
+        with self._lock:
+            attempts = max((p.get('attempts', 0) for p in self._pending.values()), default=0)
+        return min(self.flush_interval * (2 ** attempts), max(FLUSH_BACKOFF_MAX, self.flush_interval))
+
+    def _writer_loop(self):
+        while True:
+            self._wake.wait()
+            # 짧은 시간 동안 들어오는 변경을 모아서 한 번에 기록 (실패가 이어지면 간격을 늘림)
+            time.sleep(self._retry_delay())
+            self._wake.clear()
+            self.flush()